@@ -0,0 +1 @@
+"""Lapisan data bersama Dashboard GBST (dipakai main.py dan semua halaman)."""
@@ -0,0 +1,137 @@
+"""Tabel agregat per (site, perusahaan, tahun, bulan) untuk metrik dan delta antar periode.
+
+Dibangun sekali per versi data dari Timbulan, Program (long) dan
+Ketidaksesuaian. Metrik ringkasan halaman (total timbulan, man power unik,
+program per kategori, jumlah laporan) untuk pilihan filter apa pun, termasuk
+tahun sebelumnya, beberapa tahun sekaligus atau periode A vs periode B, cukup
+dijumlahkan dari tabel kecil ini (``totals``) tanpa memfilter ulang baris mentah.
+
+Timbulan dan man power tercatat per tahun, jadi barisnya ber-``bulan`` 0 dan
+tidak ikut filter bulan; nilai program dan jumlah laporan per bulan (1-12).
+Man power unik mengikuti aturan SNI bersama ``gbst.manpower.unique``: satu nilai
+(baris terakhir) per site-perusahaan-tahun. Kunci kosong (NaN) tetap disimpan supaya
+pilihan kosong ("tidak difilter") sama dengan menjumlah semua baris.
+"""
+import numpy as np
+import pandas as pd
+
+from gbst import manpower
+
+KEYS = ["site", "perusahaan", "tahun", "bulan"]
+
+# kolom nilai program per kategori: "program:Program Pengelolaan", ...
+PROGRAM_PREFIX = "program:"
+
+
+def _group(df: pd.DataFrame, **aggs) -> pd.DataFrame:
+    return df.groupby(KEYS, observed=True, dropna=False).agg(**aggs)
+
+
+def _keys(df: pd.DataFrame, bulan) -> pd.DataFrame:
+    out = pd.DataFrame({"site": df["site"], "perusahaan": df["perusahaan"],
+                        "tahun": pd.array(df["tahun"], dtype="Int16")}, index=df.index)
+    out["bulan"] = pd.array(np.full(len(df), bulan) if np.isscalar(bulan) else bulan, dtype="Int8")
+    return out
+
+
+def period_table(timbulan: pd.DataFrame, program_long: pd.DataFrame = None,
+                 ketidaksesuaian: pd.DataFrame = None, value: str = "value") -> pd.DataFrame:
+    """Tabel agregat (index ``KEYS``) dari frame kanonik; frame tanpa kolom kunci dilewati."""
+    parts = []
+    need = {"site", "perusahaan", "tahun"}
+
+    if timbulan is not None and need <= set(timbulan.columns):
+        t = _keys(timbulan, 0)
+        t["timbulan"] = timbulan["timbulan"] if "timbulan" in timbulan.columns else 0.0
+        t["data_input_total"] = (pd.to_numeric(timbulan["data_input_total"], errors="coerce")
+                                 if "data_input_total" in timbulan.columns else 0.0)
+        t["baris_timbulan"] = 1
+        parts.append(_group(t, timbulan=("timbulan", "sum"), data_input_total=("data_input_total", "sum"),
+                            baris_timbulan=("baris_timbulan", "sum")))
+        if "man_power" in timbulan.columns:
+            mp = manpower.unique(t[KEYS].assign(man_power=timbulan["man_power"]),
+                                 ["site", "perusahaan", "tahun"])
+            parts.append(_group(mp, man_power=("man_power", "sum")))
+
+    if (program_long is not None and need | {"bulan", "kategori", value} <= set(program_long.columns)):
+        bulan = program_long["bulan"]
+        if isinstance(bulan.dtype, pd.CategoricalDtype):     # nama bulan (gbst.periods) -> 1-12
+            codes = bulan.cat.codes.to_numpy()
+            bulan = pd.array(np.where(codes >= 0, codes + 1, 0), dtype="Int8")
+            bulan[codes < 0] = pd.NA
+        p = _keys(program_long, bulan)
+        p["kategori"] = program_long["kategori"]
+        p["nilai"] = program_long[value].fillna(0)
+        p = p[p["kategori"].notna()]
+        wide = (p.groupby(KEYS + ["kategori"], observed=True, dropna=False)["nilai"].sum()
+                 .unstack("kategori", fill_value=0))
+        wide.columns = [f"{PROGRAM_PREFIX}{c}" for c in wide.columns]
+        wide["baris_program"] = p.groupby(KEYS, observed=True, dropna=False).size()
+        parts.append(wide)
+
+    if ketidaksesuaian is not None and need | {"bulan"} <= set(ketidaksesuaian.columns):
+        k = _keys(ketidaksesuaian, ketidaksesuaian["bulan"])
+        k["laporan"] = 1
+        # valid = status_temuan huruf kecil "valid" (tanpa strip); tanpa kolom status
+        # semua laporan dihitung valid, sama dengan filter Overview semula
+        if "status_temuan" in ketidaksesuaian.columns:
+            status = ketidaksesuaian["status_temuan"].astype("string").str.lower()
+            k["laporan_valid"] = (status == "valid").fillna(False).astype(int)
+        else:
+            k["laporan_valid"] = 1
+        parts.append(_group(k, laporan=("laporan", "sum"), laporan_valid=("laporan_valid", "sum")))
+
+    if not parts:
+        return pd.DataFrame(index=pd.MultiIndex.from_tuples([], names=KEYS))
+    table = pd.concat(parts)
+    table = table.groupby(level=KEYS, observed=True, dropna=False).sum(min_count=1).fillna(0)
+    return table
+
+
+def _mask(table: pd.DataFrame, site=None, perusahaan=None, tahun=None, bulan=None) -> np.ndarray:
+    keep = np.ones(len(table), dtype=bool)
+    for level, selected in (("site", site), ("perusahaan", perusahaan), ("tahun", tahun)):
+        if selected:
+            keep &= table.index.get_level_values(level).isin(list(selected))
+    if bulan:
+        b = table.index.get_level_values("bulan").fillna(-1)
+        keep &= np.asarray((b == 0) | b.isin(list(bulan)), dtype=bool)    # baris tahunan tidak ikut filter bulan
+    return keep
+
+
+def totals(table: pd.DataFrame, site=None, perusahaan=None, tahun=None, bulan=None) -> pd.Series:
+    """Jumlah semua ukuran untuk pilihan filter (pilihan kosong = tidak difilter).
+
+    ``bulan`` berupa nomor 1-12. Selain kolom tabel, hasil memuat ``jumlah_unit``
+    (pasangan site-perusahaan yang punya baris Timbulan).
+    """
+    sel = table[_mask(table, site, perusahaan, tahun, bulan)]
+    out = sel.sum(numeric_only=True)
+    if "baris_timbulan" in sel.columns:
+        units = sel[sel["baris_timbulan"] > 0].index.droplevel(["tahun", "bulan"]).unique()
+        out["jumlah_unit"] = len(units)
+    return out
+
+
+def previous_period(tahun) -> list:
+    """Tahun pembanding: pilihan digeser sepanjang rentangnya, tepat sebelum tahun terkecil.
+
+    Pilihan tidak bersambung tetap tidak bersambung ({2022, 2025} -> [2018, 2021]).
+    """
+    tahun = sorted({int(t) for t in tahun})
+    if not tahun:
+        return []
+    span = tahun[-1] - tahun[0] + 1
+    return [t - span for t in tahun]
+
+
+def period_label(tahun) -> str:
+    """"2024", rentang "2022–2025" bila bersambung, selain itu daftar "2018, 2021"."""
+    tahun = sorted({int(t) for t in tahun})
+    if not tahun:
+        return "-"
+    if len(tahun) == 1:
+        return str(tahun[0])
+    if tahun[-1] - tahun[0] + 1 == len(tahun):
+        return f"{tahun[0]}–{tahun[-1]}"
+    return ", ".join(map(str, tahun))
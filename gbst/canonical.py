@@ -0,0 +1,37 @@
+"""Lapisan dataset kanonik: satu frame bernama seragam per sheet per versi data.
+
+Tipe kolom (angka, tanggal, kategori) sudah diurus ``gbst.schema`` saat parse
+dan kolom turunan per baris oleh ``gbst.sheets.DERIVE``; lapisan ini menyeragamkan
+nama kolom. Nama kanonik: strip, huruf kecil, spasi dan "/" menjadi "_"
+(mis. "Man Power" -> "man_power", "Site / Lokasi Kerja" -> "site___lokasi_kerja").
+
+Frame kanonik dibuat sekali per versi data untuk seluruh proses (lewat
+``gbst.datasets.PageData``, yang juga mengodekan kolom dimensi dengan
+``gbst.dimensions``), jadi rerun halaman tidak lagi menormalisasi apa pun. Untuk
+kode lama tersedia tampilan kompatibel ``"raw"`` di ``STYLES`` (nama header dan
+label teks asli).
+"""
+import pandas as pd
+
+
+def canonical_name(name) -> str:
+    return str(name).strip().lower().replace(" ", "_").replace("/", "_")
+
+
+def _renamed(df: pd.DataFrame, fn) -> pd.DataFrame:
+    # rename dangkal: dengan Copy-on-Write (pandas 3) data kolom tetap dibagi dengan frame asal
+    return df.rename(columns={c: fn(c) for c in df.columns})
+
+
+def canonical(df: pd.DataFrame) -> pd.DataFrame:
+    """Frame dengan nama kolom kanonik."""
+    return _renamed(df, canonical_name)
+
+
+def raw(df: pd.DataFrame) -> pd.DataFrame:
+    """Tampilan kompatibel dengan nama header asli sheet."""
+    return df
+
+
+# gaya nama kolom yang bisa diminta halaman lewat PageData(columns=...)
+STYLES = {"canonical": canonical, "raw": raw}
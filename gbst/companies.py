@@ -0,0 +1,116 @@
+"""Resolver kode perusahaan untuk join antar sheet (Timbulan, Program, Koordinat_UTM).
+
+Aturan dasar sama dengan ``company_to_code`` lama: huruf besar, buang selain A-Z
+dan spasi, ambil kata terakhir ("PT Pamapersada Nusantara" -> "NUSANTARA").
+Nama yang salah ditebak aturan itu bisa dipetakan manual lewat file override
+(``GBST_COMPANY_OVERRIDES``, CSV ``perusahaan,company_code``).
+
+Aturan dijalankan sekali per nama unik dan hasilnya di-memo; ``resolve`` memetakan
+kolom lewat kode per label (``gbst.dimensions.relabel``) dan mengembalikan
+categorical ``company_code`` dengan dtype milik modul ini (semua kode yang sudah
+di-resolve), jadi merge ``["site", "company_code"]`` antar sheet berjalan di atas
+kunci integer tanpa tokenisasi ulang per baris. Kode turunan ini sengaja tidak
+dicatat di tabel dimensi bersama, supaya nama baru tidak mengodekan ulang frame
+kanonik. Tabel lookup hasil resolusi ditulis ke
+``<GBST_SNAPSHOT_DIR>/company_codes.csv`` setiap ada nama baru, sebagai bahan
+memeriksa kode dan menyusun override.
+"""
+import os
+import re
+import threading
+
+import pandas as pd
+
+from gbst import dimensions, snapshot
+from gbst.schema import key
+
+OVERRIDES_PATH = os.environ.get(
+    "GBST_COMPANY_OVERRIDES",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "company_overrides.csv"),
+)
+LOOKUP_PATH = os.path.join(snapshot.SNAPSHOT_DIR, "company_codes.csv")
+
+_NON_ALPHA = re.compile(r"[^A-Z ]")
+
+_lock = threading.Lock()
+_memo = {}          # nama perusahaan -> (kode, sumber)
+_dtype = None       # CategoricalDtype semua kode di _memo (urut abjad)
+_overrides = None   # key(nama) -> kode
+
+
+def rule_code(name) -> str:
+    """Kode dari aturan kata terakhir (tanpa override)."""
+    tokens = _NON_ALPHA.sub("", str(name).upper()).split()
+    return tokens[-1] if tokens else ""
+
+
+def _load_overrides() -> dict:
+    global _overrides
+    if _overrides is None:
+        try:
+            df = pd.read_csv(OVERRIDES_PATH, dtype=str).dropna()
+            _overrides = {key(n): c.strip().upper() for n, c in zip(df["perusahaan"], df["company_code"])}
+        except (OSError, KeyError, pd.errors.EmptyDataError):
+            _overrides = {}
+    return _overrides
+
+
+def company_code(name) -> str:
+    """Kode perusahaan untuk satu nama (override dulu, lalu aturan); di-memo."""
+    hit = _memo.get(name)
+    if hit is None:
+        override = _load_overrides().get(key(name))
+        hit = (override, "override") if override else (rule_code(name), "aturan")
+        with _lock:
+            _memo[name] = hit
+    return hit[0]
+
+
+def codes_dtype() -> pd.CategoricalDtype:
+    """Dtype ``company_code`` bersama: semua kode yang sudah di-resolve."""
+    global _dtype
+    with _lock:
+        codes = sorted({c for c, _ in _memo.values()})
+        if _dtype is None or len(_dtype.categories) != len(codes):
+            _dtype = pd.CategoricalDtype(pd.Index(codes, dtype=object))
+        return _dtype
+
+
+def resolve(s: pd.Series) -> pd.Series:
+    """Kolom nama perusahaan -> categorical ``company_code`` (kunci integer bersama)."""
+    known = len(_memo)
+    out = dimensions.relabel(s, company_code)
+    if len(_memo) != known:
+        _persist()
+    return out.astype(codes_dtype())
+
+
+def lookup_table() -> pd.DataFrame:
+    """``perusahaan, company_code, key, sumber`` untuk semua nama yang sudah di-resolve."""
+    with _lock:
+        items = sorted(_memo.items(), key=lambda kv: str(kv[0]))
+    dt = codes_dtype()
+    df = pd.DataFrame([(n, c, src) for n, (c, src) in items], columns=["perusahaan", "company_code", "sumber"])
+    df.insert(2, "key", dt.categories.get_indexer(pd.Index(df["company_code"], dtype=object)))
+    return df
+
+
+def _persist():
+    if not snapshot.ENABLED or snapshot.FROZEN:
+        return
+    try:
+        os.makedirs(snapshot.SNAPSHOT_DIR, exist_ok=True)
+        tmp = LOOKUP_PATH + ".tmp"
+        lookup_table().to_csv(tmp, index=False)
+        os.replace(tmp, LOOKUP_PATH)
+    except OSError:
+        pass
+
+
+def reload_overrides():
+    """Baca ulang file override dan lupakan memo (mis. setelah file diedit)."""
+    global _overrides, _dtype
+    with _lock:
+        _overrides = None
+        _memo.clear()
+        _dtype = None
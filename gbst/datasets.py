@@ -0,0 +1,226 @@
+"""Deklarasi dataset per halaman: sheet baru dimuat saat pertama kali diakses.
+
+Setiap halaman menyebut sekali di atas sheet yang dipakainya::
+
+    data = PageData(["Timbulan", "Program"], on_error=st.error)
+    df_timbulan = data["Timbulan"]      # nama kolom kanonik (gbst.canonical)
+
+Sheet yang tidak pernah diakses tidak diunduh maupun di-parse. Mengakses sheet
+yang tidak dideklarasikan adalah ``KeyError`` supaya daftar di atas tetap jujur.
+Halaman yang memakai semua sheet-nya sejak awal memanggil ``prefetch()`` agar
+sheet yang belum di cache diunduh paralel, bukan satu per satu.
+
+Frame kanonik (atau tampilan kompatibel ``columns="raw"``) disimpan sekali
+per proses per versi data (cache bersama). Kecuali tampilan ``"raw"``, kolom
+dimensi (site, perusahaan, jenis, ...) dikodekan ke tabel dimensi bersama
+(``gbst.dimensions``). Sesi hanya memegang salinan dangkal
+(Copy-on-Write pandas 3; salinan penuh di pandas 2) dan id versinya, jadi penonton tambahan hampir tidak menambah
+memori; ``memory_report`` menunjukkan byte per sheet dan byte privat per sesi.
+"""
+import threading
+import weakref
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from gbst import canonical, dimensions
+from gbst.sheets import cache_key, cached_frames, data_version, load_sheets, session_copy
+
+# (kunci cache, fungsi tampilan) -> ((versi, versi dimensi kolomnya), frame); frame bersama, jangan diubah
+_shared = {}
+_shared_lock = threading.Lock()
+
+# id sesi Streamlit -> frame yang sedang dipegang sesi itu (referensi lemah)
+_sessions = {}
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx()
+    return None if ctx is None else ctx.session_id
+
+
+def _fn_key(fn) -> tuple:
+    # halaman Streamlit semuanya bermodul "__main__" -> bedakan lewat nama file
+    code = getattr(fn, "__code__", None)
+    return getattr(code, "co_filename", None), getattr(fn, "__qualname__", repr(fn))
+
+
+def _build(raw: pd.DataFrame, view) -> pd.DataFrame:
+    df = view(raw)
+    return df if view is canonical.raw else dimensions.encode_frame(df)
+
+
+def _normalized(key: str, version: str, raw: pd.DataFrame, view) -> pd.DataFrame:
+    skey = (key, _fn_key(view))
+    # label baru di dimensi yang dipakai frame ini -> kodekan ulang agar dtype tetap
+    # seragam dengan sheet lain; label baru di dimensi lain tidak menyentuhnya
+    current = (version, dimensions.versions(dimensions.dimension_columns(raw).values()))
+    with _shared_lock:
+        hit = _shared.get(skey)
+        if hit is not None and hit[0] == current:
+            return hit[1]
+    df = _build(raw, view)
+    with _shared_lock:
+        _shared[skey] = ((version, dimensions.frame_versions(df)), df)
+    return df
+
+
+def _track(df: pd.DataFrame):
+    sid = _session_id()
+    if sid is not None:
+        _sessions.setdefault(sid, weakref.WeakValueDictionary())[id(df)] = df
+
+
+class PageData(Mapping):
+    """Peta ``{sheet: DataFrame}`` yang dimaterialisasi saat diakses.
+
+    ``queries`` opsional ``{sheet: Query}`` untuk sheet yang cukup diambil sebagian.
+    ``columns`` memilih gaya nama kolom (``gbst.canonical.STYLES``): default
+    ``"canonical"``; ``"raw"`` untuk halaman yang masih memakai nama lama.
+    ``on_error`` dipanggil dengan pesan untuk tiap sheet yang gagal dimuat
+    (mis. ``st.error``); sheet gagal berisi DataFrame kosong.
+    """
+
+    def __init__(self, sheet_names, queries: dict = None, columns: str = "canonical", on_error=None):
+        self.names = list(sheet_names)
+        self.queries = dict(queries or {})
+        self.view = canonical.STYLES[columns]
+        self.on_error = on_error
+        self.errors = {}
+        self._frames = {}
+        self._versions = {}
+
+    def __getitem__(self, sheet: str) -> pd.DataFrame:
+        if sheet not in self.names:
+            raise KeyError(f"sheet {sheet!r} tidak dideklarasikan di halaman ini")
+        if sheet not in self._frames:
+            self._materialize([sheet])
+        return self._frames[sheet]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def loaded(self) -> list:
+        """Sheet yang sudah dimuat, berurutan sesuai deklarasi."""
+        return [s for s in self.names if s in self._frames]
+
+    def versions(self) -> dict:
+        """Versi tiap sheet yang sudah dimuat (yang cukup disimpan di session_state).
+
+        Untuk frame yang dikodekan, versi = ``(versi data, versi dimensi kolomnya)``,
+        jadi kunci cache turunan (``gbst.filters``, ``gbst.results``) ikut berganti
+        hanya bila dimensi yang dipakai sheet itu bertambah.
+        """
+        return {s: self._versions.get(s) for s in self.loaded}
+
+    def prefetch(self, sheet_names=None) -> "PageData":
+        """Muat beberapa sheet yang dideklarasikan sekaligus (paralel)."""
+        names = self.names if sheet_names is None else list(sheet_names)
+        unknown = [s for s in names if s not in self.names]
+        if unknown:
+            raise KeyError(f"sheet {unknown} tidak dideklarasikan di halaman ini")
+        self._materialize([s for s in names if s not in self._frames])
+        return self
+
+    def _materialize(self, names: list):
+        if not names:
+            return
+        queries = {s: self.queries[s] for s in names if s in self.queries}
+        before = {s: data_version(s, queries.get(s)) for s in names}
+        frames, errors = load_sheets(names, queries=queries)
+        if self.view is not canonical.raw:
+            # catat label semua sheet dulu supaya semuanya dikodekan dengan dtype yang sama
+            for sheet, df in frames.items():
+                dimensions.observe_frame(df, token=(cache_key(sheet, queries.get(sheet)),
+                                                    data_version(sheet, queries.get(sheet))))
+        for sheet, df in frames.items():
+            version = data_version(sheet, queries.get(sheet))
+            if self.view is not canonical.raw:
+                # versi berubah di tengah jalan (refresh background) -> jangan dibagi
+                changed = before[sheet] is not None and before[sheet] != version
+                if sheet in errors or version is None or changed:
+                    df = _build(df, self.view)
+                else:
+                    df = session_copy(_normalized(cache_key(sheet, queries.get(sheet)), version, df,
+                                                  self.view))
+            self._frames[sheet] = df
+            if version is not None and self.view is not canonical.raw:
+                version = (version, dimensions.frame_versions(df))
+            self._versions[sheet] = version
+            _track(df)
+        for sheet, e in errors.items():
+            self.errors[sheet] = e
+            if self.on_error is not None:
+                self.on_error(f"Gagal load sheet {sheet}: {e}")
+
+
+# ===============================
+# LAPORAN MEMORI
+# ===============================
+def _bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _buffer_id(s: pd.Series) -> int:
+    """Identitas buffer data kolom; sama untuk salinan dangkal yang belum diubah."""
+    arr = s.array
+    for attr in ("_ndarray", "_data", "_pa_array"):
+        buf = getattr(arr, attr, None)
+        if buf is not None:
+            break
+    else:
+        buf = arr
+    while isinstance(buf, np.ndarray) and buf.base is not None:
+        buf = buf.base
+    return id(buf)
+
+
+def memory_report() -> tuple:
+    """``(per_sheet, per_sesi)`` dalam byte.
+
+    ``per_sheet``: frame bersama di cache (mentah dan tampilan nama kolom; kolom
+    non-dimensi tampilan dibagi dengan frame mentah, kolom dimensi berupa kode).
+    ``per_sesi``: total byte frame yang dirujuk sesi dan byte privatnya, yaitu
+    kolom yang tidak berbagi buffer dengan frame bersama (hasil modifikasi sesi).
+    """
+    shared = [(key, "mentah", version, df) for key, (df, version) in cached_frames().items()]
+    with _shared_lock:
+        shared += [(key, f"tampilan {fk[1]}", version[0], df)
+                   for (key, fk), (version, df) in sorted(_shared.items(), key=lambda kv: kv[0][0])]
+
+    per_sheet = pd.DataFrame(
+        [{"sheet": key, "layer": layer, "version": version, "rows": len(df), "bytes": _bytes(df)}
+         for key, layer, version, df in shared],
+        columns=["sheet", "layer", "version", "rows", "bytes"],
+    )
+
+    shared_ids = set()
+    for _, _, _, df in shared:
+        for i in range(df.shape[1]):
+            shared_ids.add(_buffer_id(df.iloc[:, i]))
+
+    rows = []
+    for sid, frames in list(_sessions.items()):
+        frames = list(frames.values())
+        if not frames:
+            _sessions.pop(sid, None)
+            continue
+        private = 0
+        for df in frames:
+            for i in range(df.shape[1]):
+                col = df.iloc[:, i]
+                if _buffer_id(col) not in shared_ids:
+                    private += int(col.memory_usage(deep=True, index=False))
+        rows.append({"session": sid[:8], "frames": len(frames),
+                     "referenced_bytes": sum(_bytes(df) for df in frames), "private_bytes": private})
+    per_session = pd.DataFrame(rows, columns=["session", "frames", "referenced_bytes", "private_bytes"])
+    return per_sheet, per_session
@@ -0,0 +1,55 @@
+"""Sinkron inkremental untuk sheet append-only (mis. log laporan Ketidaksesuaian).
+
+Sheet seperti ini hanya bertambah di bawah, jadi refresh cukup meminta ekornya lewat
+``tq`` ``offset``. Permintaan dimulai satu baris lebih awal (baris jangkar = baris
+terakhir yang sudah dimiliki): bila header berubah, jangkar tidak cocok, atau sheet
+memendek, berarti ada perubahan di luar pola append dan sheet diunduh penuh lagi.
+Editan di tengah tabel tidak terlihat dari ekor, karena itu sinkron penuh juga
+dipaksa setiap ``FULL_EVERY`` delta.
+
+State sinkron (jumlah baris, header, jangkar) disimpan bersama snapshot sehingga
+proses baru bisa langsung lanjut dengan delta.
+"""
+import csv
+import io
+import os
+
+from gbst.gviz import Query
+
+FULL_EVERY = int(os.environ.get("GBST_DELTA_FULL_EVERY", "24"))
+
+
+def _rows(raw: bytes) -> list:
+    return list(csv.reader(io.StringIO(raw.decode("utf-8"))))
+
+
+def state_from_raw(raw: bytes) -> dict:
+    """State awal dari export CSV penuh sebuah sheet."""
+    rows = _rows(raw)
+    return {
+        "header": rows[0] if rows else [],
+        "anchor": rows[-1] if len(rows) > 1 else None,
+        "rows": max(len(rows) - 1, 0),
+        "deltas": 0,
+    }
+
+
+def tail_query(state: dict):
+    """Query ekor mulai dari baris jangkar, atau None bila harus sinkron penuh."""
+    if not state or state.get("anchor") is None or state.get("deltas", 0) >= FULL_EVERY:
+        return None
+    return Query(offset=state["rows"] - 1)
+
+
+def read_tail(raw: bytes, state: dict):
+    """Validasi hasil ``tail_query``.
+
+    Mengembalikan ``(jumlah_baris_baru, state_baru)``, atau None bila ekor tidak
+    menyambung dengan data yang dimiliki (harus sinkron penuh).
+    """
+    rows = _rows(raw)
+    if len(rows) < 2 or rows[0] != state["header"] or rows[1] != state["anchor"]:
+        return None
+    n_new = len(rows) - 2
+    return n_new, dict(state, anchor=rows[-1], rows=state["rows"] + n_new,
+                       deltas=state.get("deltas", 0) + 1)
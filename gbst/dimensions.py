@@ -0,0 +1,158 @@
+"""Tabel dimensi bersama: kunci integer untuk site, perusahaan, jenis, kategori, status.
+
+Setiap dimensi menyimpan daftar label unik dari semua sheet (urut abjad) sebagai
+satu ``CategoricalDtype``. Frame kanonik (``gbst.canonical``) menyimpan kolom
+dimensi sebagai categorical dengan dtype itu: data per baris hanya kode integer
+(kunci surrogate), label teks disimpan sekali di tabel dimensi dan baru
+"di-join" saat ditampilkan. Karena dtype-nya sama di semua sheet, ``isin``,
+``groupby(observed=True)`` dan ``merge`` antar sheet (mis. Timbulan x Program
+pada ``site``) bekerja di atas kode integer.
+
+Dimensi hanya bertambah, jadi versi satu dimensi cukup jumlah labelnya
+(``version``). Label baru hanya menaikkan versi dimensi itu: frame kanonik yang
+memakai dimensi tersebut dikodekan ulang (lihat ``gbst.datasets``) supaya tetap
+ber-dtype sama, frame lain dan cache hasilnya tidak tersentuh. Kunci cache
+memakai ``frame_versions`` (versi dimensi kolom frame itu saja). Kode satu label
+bisa berubah antar versi, jadi jangan simpan kode mentah di luar frame.
+
+Transformasi label (title-case, alias ejaan, ...) memakai ``relabel``, yang
+menjalankan fungsi sekali per label unik, bukan per baris. Label turunan/tampilan
+hasil ``relabel`` menjadi kategori lokal dan tidak masuk tabel dimensi bersama.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from gbst.canonical import canonical_name
+
+# nama kanonik kolom sheet yang dikodekan sebagai dimensi
+DIMENSIONS = {
+    "site", "perusahaan", "jenis_timbulan", "jenis_sampah", "sub_jenis_sampah", "kategori",
+    "status_temuan", "kategori_subketidaksesuaian", "sub_ketidaksesuaian",
+}
+
+_lock = threading.Lock()
+_dtypes = {}          # nama dimensi -> CategoricalDtype (label urut abjad)
+_observed = set()     # token (kunci cache, versi) frame yang labelnya sudah dicatat
+
+
+def dtype(name: str) -> pd.CategoricalDtype:
+    return _dtypes.get(name) or pd.CategoricalDtype(pd.Index([], dtype=object))
+
+
+def version(name: str) -> int:
+    """Versi dimensi ``name``: jumlah labelnya (naik hanya bila dimensi ini bertambah)."""
+    return len(dtype(name).categories)
+
+
+def versions(names) -> tuple:
+    """``((dimensi, versi), ...)`` terurut untuk dimensi ``names`` di tabel saat ini."""
+    return tuple((name, version(name)) for name in sorted(set(names)))
+
+
+def _is_label(v) -> bool:
+    return isinstance(v, str) or not pd.isna(v)
+
+
+def observe(name: str, labels) -> pd.CategoricalDtype:
+    """Tambahkan label ke dimensi ``name``; kembalikan dtype terbaru."""
+    labels = {v for v in labels if _is_label(v)}
+    with _lock:
+        current = _dtypes.get(name)
+        known = set() if current is None else set(current.categories)
+        if current is None or not labels <= known:
+            cats = sorted(known | labels, key=str)
+            _dtypes[name] = pd.CategoricalDtype(pd.Index(cats, dtype=object))
+        return _dtypes[name]
+
+
+def dimension_columns(df: pd.DataFrame) -> dict:
+    """``{kolom: nama dimensi}`` untuk kolom ``df`` yang termasuk ``DIMENSIONS``."""
+    out = {}
+    for c in df.columns:
+        name = canonical_name(c)
+        if name in DIMENSIONS:
+            out[c] = name
+    return out
+
+
+def frame_versions(df: pd.DataFrame) -> tuple:
+    """``((dimensi, versi), ...)`` untuk kolom dimensi ``df`` yang sudah dikodekan.
+
+    Versi dibaca dari dtype kolomnya (jumlah label), jadi tetap benar walau tabel
+    dimensi bertambah setelah frame dikodekan.
+    """
+    out = {}
+    for c, name in dimension_columns(df).items():
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            out[name] = len(df[c].dtype.categories)
+    return tuple(sorted(out.items()))
+
+
+def observe_frame(df: pd.DataFrame, token=None):
+    """Catat label semua kolom dimensi ``df``; ``token`` mencegah scan ulang frame yang sama."""
+    if token is not None and token in _observed:
+        return
+    for c, name in dimension_columns(df).items():
+        observe(name, df[c].dropna().unique())
+    if token is not None:
+        _observed.add(token)
+
+
+def encode(name: str, s: pd.Series) -> pd.Series:
+    """Kolom label -> categorical ber-dtype dimensi ``name``."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        observe(name, s.cat.categories)
+    else:
+        observe(name, s.dropna().unique())
+    return s.astype(dtype(name))
+
+
+def encode_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Salinan dangkal ``df`` dengan semua kolom dimensi dikodekan."""
+    cols = dimension_columns(df)
+    if not cols:
+        return df
+    observe_frame(df)
+    df = df.copy(deep=False)
+    for c, name in cols.items():
+        if df[c].dtype != dtype(name):
+            df[c] = df[c].astype(dtype(name))
+    return df
+
+
+def relabel(s: pd.Series, fn, dimension: str = None, na=None) -> pd.Series:
+    """``fn`` diterapkan per label unik lalu disebar ke baris lewat kode.
+
+    ``na`` (bila diisi) dipakai sebagai label masukan untuk baris kosong; selain
+    itu baris kosong tetap kosong. Hasil ``fn`` yang kosong (None/NaN) menjadi NaN.
+    Tanpa ``dimension`` hasilnya categorical lokal (label hasil saja) bila ``s``
+    categorical, selain itu teks biasa; tabel dimensi bersama tidak berubah. Dengan
+    ``dimension`` hasilnya categorical dimensi itu (label baru ikut dicatat).
+    """
+    codes, uniques = pd.factorize(s)
+    labels = [fn(v) for v in uniques]
+    labels.append(fn(na) if na is not None else None)     # kode -1 = baris kosong
+    labels = np.asarray(labels, dtype=object)
+
+    if dimension is not None:
+        dt = observe(dimension, labels)
+    elif isinstance(s.dtype, pd.CategoricalDtype):
+        dt = pd.CategoricalDtype(pd.Index(sorted({v for v in labels if _is_label(v)}, key=str), dtype=object))
+    else:
+        return pd.Series(labels[codes], index=s.index, name=s.name)
+    label_codes = dt.categories.get_indexer(pd.Index(labels, dtype=object))
+    return pd.Series(pd.Categorical.from_codes(label_codes[codes], dtype=dt), index=s.index, name=s.name)
+
+
+def table(name: str = None) -> pd.DataFrame:
+    """Tabel dimensi ``dimension, key, label`` (semua dimensi bila ``name`` None)."""
+    with _lock:
+        items = sorted(_dtypes.items()) if name is None else [(name, dtype(name))]
+    frames = [pd.DataFrame({"dimension": n, "key": np.arange(len(dt.categories), dtype="int32"),
+                            "label": dt.categories})
+              for n, dt in items]
+    if not frames:
+        return pd.DataFrame(columns=["dimension", "key", "label"])
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,74 @@
+"""Model filter global: site, perusahaan, tahun, bulan yang dibagi semua halaman.
+
+Pilihan disimpan sekali per sesi di ``st.session_state`` (bukan di state widget,
+yang dibuang Streamlit setiap pindah halaman) dan dicerminkan ke query params
+URL (``?site=BMO&site=LMO&tahun=2025``), jadi pilihan terbawa saat berpindah
+halaman dan tautan dashboard bisa dibagikan apa adanya.
+
+Per filter: ``None`` berarti semua opsi (tidak disebut di URL), list berarti
+nilai yang dipilih. Tiap halaman mencocokkan pilihan dengan opsi datanya sendiri
+(``resolve``); nilai yang tidak ada di halaman itu tidak hilang dari model, jadi
+halaman survei dengan daftar site berbeda tidak menimpa pilihan halaman lain.
+Bulan disimpan sebagai nama ("Januari"); halaman yang memfilter nomor bulan
+memetakannya sendiri. Nilai dibandingkan sebagai teks karena URL hanya membawa
+teks.
+"""
+import streamlit as st
+
+FIELDS = ("site", "perusahaan", "tahun", "bulan")
+
+_STATE_KEY = "gbst:filter"
+
+
+def _from_query() -> dict:
+    out = {}
+    for field in FIELDS:
+        values = st.query_params.get_all(field)
+        # "?site=" (satu nilai kosong) = pilihan kosong; tidak disebut = semua
+        out[field] = [v for v in values if v != ""] if values else None
+    return out
+
+
+def _to_query(selection: dict):
+    for field in FIELDS:
+        selected = selection.get(field)
+        wanted = None if selected is None else [str(v) for v in selected] or [""]
+        if wanted is None:
+            if field in st.query_params:
+                del st.query_params[field]
+        elif st.query_params.get_all(field) != wanted:
+            st.query_params[field] = wanted
+
+
+def current() -> dict:
+    """``{filter: list | None}`` sesi ini; saat sesi baru dibaca dari URL."""
+    selection = st.session_state.get(_STATE_KEY)
+    if selection is None:
+        selection = _from_query()
+        st.session_state[_STATE_KEY] = selection
+    return dict(selection)
+
+
+def sync_url():
+    """Tulis pilihan sesi ke URL (query params hilang saat berpindah halaman)."""
+    _to_query(current())
+
+
+def update(**selections):
+    """Ganti pilihan beberapa filter (``None`` = semua) dan perbarui URL."""
+    selection = current()
+    for field, selected in selections.items():
+        if field not in FIELDS:
+            raise KeyError(f"filter global {field!r} tidak dikenal")
+        selection[field] = None if selected is None else list(selected)
+    st.session_state[_STATE_KEY] = selection
+    _to_query(selection)
+
+
+def resolve(field: str, options) -> list:
+    """Pilihan ``field`` dicocokkan dengan ``options`` halaman ini (urut sesuai opsi)."""
+    selected = current().get(field)
+    if selected is None:
+        return list(options)
+    wanted = {str(v) for v in selected}
+    return [o for o in options if str(o) in wanted]
@@ -0,0 +1,148 @@
+"""Mesin filter sidebar berbasis bitmap per nilai.
+
+Untuk setiap frame dan kolom filter (site, perusahaan, tahun, bulan, ...),
+``FilterIndex`` menyimpan satu bitmap (bit per baris, ``np.packbits``) per nilai
+unik, dibangun sekali per versi data. Kombinasi pilihan sidebar dijawab dengan
+OR bitmap nilai terpilih per kolom lalu AND antar kolom, tanpa ``isin`` dan
+tanpa ``df.copy()`` di depan; hanya baris yang lolos yang diambil. Hasil
+``apply`` juga di-memo per kombinasi pilihan (``gbst.results``), jadi kembali ke
+kombinasi yang pernah dipakai tidak menghitung apa pun.
+
+Semantik sama dengan pola lama ``if sel: d = d[d[col].isin(sel)]``: pilihan
+kosong/None berarti kolom itu tidak difilter, kolom yang tidak ada di frame
+diabaikan, dan baris kosong (NaN) tidak lolos bila kolomnya difilter.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from gbst import dimensions, results
+from gbst.sheets import session_copy
+
+_lock = threading.Lock()
+_indexes = {}   # nama frame -> (kunci, FilterIndex)
+
+
+class FilterIndex:
+    """Bitmap per nilai untuk kolom ``columns`` dari ``df`` (kolom yang tidak ada dilewati)."""
+
+    def __init__(self, df: pd.DataFrame, columns):
+        self.n = len(df)
+        self.nbytes = (self.n + 7) // 8
+        self.values = {}    # kolom -> pd.Index nilai unik
+        self.bitmaps = {}   # kolom -> uint8[k, nbytes]
+        self.valid = {}     # kolom -> uint8[nbytes], baris yang nilainya tidak kosong
+        for c in columns:
+            if c not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[c])
+            self.values[c] = pd.Index(uniques)
+            self.bitmaps[c] = self._bitmaps(codes, len(uniques))
+            self.valid[c] = np.packbits(codes >= 0)
+
+    def _bitmaps(self, codes: np.ndarray, k: int) -> np.ndarray:
+        # set bit baris langsung di bitmap kodenya (tanpa matriks boolean k x n)
+        out = np.zeros((k, self.nbytes), dtype=np.uint8)
+        rows = np.flatnonzero(codes >= 0)
+        np.bitwise_or.at(out.reshape(-1), codes[rows].astype(np.int64) * self.nbytes + (rows >> 3),
+                         (0x80 >> (rows & 7)).astype(np.uint8))
+        return out
+
+    @property
+    def columns(self) -> list:
+        return list(self.values)
+
+    def _positions(self, c: str, selected) -> np.ndarray:
+        pos = self.values[c].get_indexer(pd.Index(list(selected)))
+        return np.unique(pos[pos >= 0])
+
+    def _column_mask(self, c: str, selected) -> np.ndarray:
+        k = len(self.values[c])
+        pos = self._positions(c, selected)
+        if len(pos) == k:
+            return self.valid[c]
+        if len(pos) == 0:
+            return np.zeros(self.nbytes, dtype=np.uint8)
+        if len(pos) * 2 > k:
+            # lebih murah: semua baris valid dikurangi nilai yang tidak dipilih
+            rest = np.setdiff1d(np.arange(k), pos)
+            return self.valid[c] & ~np.bitwise_or.reduce(self.bitmaps[c][rest], axis=0)
+        return np.bitwise_or.reduce(self.bitmaps[c][pos], axis=0)
+
+    def mask(self, **selections):
+        """Bitmap gabungan (packed), atau None bila tidak ada kolom yang difilter."""
+        out = None
+        for c, selected in selections.items():
+            if selected is None or len(selected) == 0 or c not in self.values:
+                continue
+            m = self._column_mask(c, selected)
+            out = m if out is None else out & m
+        return out
+
+    def selection_key(self, **selections) -> dict:
+        """Bentuk kanonik pilihan: hanya nilai yang ada di frame, "semua"/"tidak ada"
+        diringkas. Pilihan yang menghasilkan baris sama mendapat kunci sama, dari
+        halaman mana pun opsi multiselect-nya berasal."""
+        out = {}
+        for c, selected in selections.items():
+            if selected is None or len(selected) == 0 or c not in self.values:
+                continue
+            pos = self._positions(c, selected)
+            if len(pos) == len(self.values[c]):
+                out[c] = "*semua*"
+            elif len(pos) == 0:
+                out[c] = "*tidak ada*"
+            else:
+                out[c] = [int(p) for p in pos]
+        return out
+
+    def positions(self, **selections):
+        """Posisi baris yang lolos, atau None bila semua baris lolos."""
+        m = self.mask(**selections)
+        if m is None:
+            return None
+        keep = np.unpackbits(m, count=self.n).astype(bool)
+        return None if keep.all() else np.flatnonzero(keep)
+
+    def apply(self, df: pd.DataFrame, **selections) -> pd.DataFrame:
+        """Baris ``df`` yang lolos filter; tanpa filter efektif hanya salinan dangkal."""
+        pos = self.positions(**selections)
+        return session_copy(df) if pos is None else df.iloc[pos]
+
+
+def index(name: str, df: pd.DataFrame, version, columns) -> FilterIndex:
+    """``FilterIndex`` frame ``name``; dibangun ulang bila versi data, versi dimensi
+    kolom frame, susunan kolom atau panjangnya berubah, atau ada kolom baru yang
+    diminta (kolom lama tetap ikut).
+
+    ``version`` None (versi data tidak diketahui) berarti indeks tidak disimpan.
+    """
+    columns = list(columns)
+    key = (version, dimensions.frame_versions(df), tuple(df.columns), len(df))
+    if version is not None:
+        with _lock:
+            hit = _indexes.get(name)
+        if hit is not None and hit[0] == key:
+            missing = [c for c in columns if c in df.columns and c not in hit[1].values]
+            if not missing:
+                return hit[1]
+            columns = hit[1].columns + missing
+    idx = FilterIndex(df, columns)
+    if version is not None:
+        with _lock:
+            _indexes[name] = (key, idx)
+    return idx
+
+
+def apply(name: str, df: pd.DataFrame, version, **selections) -> pd.DataFrame:
+    """Filter ``df`` dengan pilihan ``{kolom: nilai terpilih}`` memakai indeks bitmap ``name``.
+
+    Hasil di-cache per ``(name, version, pilihan kanonik)`` (LRU bersama
+    ``gbst.results``), jadi halaman berikutnya yang memfilter frame yang sama dengan
+    pilihan global yang sama memakai hasil yang sudah ada. Susunan kolom ikut di
+    kunci karena halaman boleh menambah kolom sebelum memfilter.
+    """
+    idx = index(name, df, version, selections)
+    return results.memo(f"filter:{name}", version, lambda: idx.apply(df, **selections),
+                        _columns=hash(tuple(df.columns)), **idx.selection_key(**selections))
@@ -0,0 +1,157 @@
+"""Parsing koordinat massal: kolom easting/northing campuran UTM 50N dan derajat desimal.
+
+Sheet CCTV menulis koordinat sebagai teks, sebagian derajat desimal
+("117.52°E", "-1.23°N"), sebagian UTM zona 50N (meter). ``parse_coords``
+membersihkan akhiran dengan operasi string tervektorisasi, mengelompokkan baris
+dengan mask (derajat: ``e <= 180`` dan ``n <= 90``; UTM: keduanya > 100000) dan
+memproyeksikan semua baris UTM dalam satu panggilan array, bukan ``apply`` +
+``transformer.transform`` per baris. Baris yang tidak masuk keduanya jadi NaN.
+
+Titik CCTV dan Koordinat_UTM hampir tidak pernah berubah, jadi hasil proyeksi
+disimpan di geocache on-disk (``GBST_GEOCACHE``, default ``.gbst_geocache.json``;
+``0`` = hanya di memori) dengan kunci ``(CRS, easting, northing)`` mentah. Hanya
+titik yang belum ada di cache yang diproyeksikan; inventaris yang tidak berubah
+cukup di-lookup. Transformer dibuat sekali per proses per CRS dan dipakai
+bergantian di bawah lock (objek pyproj tidak aman dipakai paralel).
+"""
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from pyproj import Transformer
+
+SOURCE_CRS = "EPSG:32650"   # UTM 50N
+TARGET_CRS = "EPSG:4326"    # WGS84 (lon, lat)
+
+# batas nilai UTM (meter) yang dianggap valid, sama dengan parser lama
+UTM_MIN = 100000
+
+GEOCACHE_PATH = os.environ.get("GBST_GEOCACHE", ".gbst_geocache.json")
+GEOCACHE_ENABLED = GEOCACHE_PATH not in ("", "0")
+
+_transform_lock = threading.Lock()
+_transformers = {}
+
+_cache_lock = threading.Lock()
+_cache = None           # {(crs, easting, northing): (lon, lat)}, dimuat saat dipakai pertama
+_stats = {"hits": 0, "misses": 0, "writes": 0}
+
+
+def transformer(crs: str = SOURCE_CRS) -> Transformer:
+    """Transformer ``crs`` -> WGS84 (``always_xy``), dibuat sekali per proses."""
+    with _transform_lock:
+        if crs not in _transformers:
+            _transformers[crs] = Transformer.from_crs(crs, TARGET_CRS, always_xy=True)
+        return _transformers[crs]
+
+
+def _read_geocache() -> dict:
+    try:
+        with open(GEOCACHE_PATH, encoding="utf-8") as f:
+            rows = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(rows, list):
+        return {}
+    return {(crs, float(e), float(n)): (float(lon), float(lat))
+            for crs, e, n, lon, lat in (r for r in rows if isinstance(r, list) and len(r) == 5)}
+
+
+def _write_geocache(cache: dict):
+    rows = [[crs, e, n, lon, lat] for (crs, e, n), (lon, lat) in cache.items()]
+    tmp = f"{GEOCACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(rows, f)
+        os.replace(tmp, GEOCACHE_PATH)
+    except OSError:
+        pass            # cache disk hanya optimasi; gagal tulis = proyeksi ulang nanti
+    else:
+        _stats["writes"] += 1
+
+
+def _geocache() -> dict:
+    global _cache
+    if _cache is None:
+        _cache = _read_geocache() if GEOCACHE_ENABLED else {}
+    return _cache
+
+
+def geocache_stats() -> pd.DataFrame:
+    """Satu baris statistik geocache untuk panel debug."""
+    with _cache_lock:
+        entries = len(_cache) if _cache is not None else 0
+        return pd.DataFrame([{**_stats, "entries": entries,
+                              "path": GEOCACHE_PATH if GEOCACHE_ENABLED else "-"}])
+
+
+def to_number(values, suffix: str) -> np.ndarray:
+    """Teks koordinat -> float64; akhiran ``°E``/``E`` (atau N) dibuang, sisanya NaN bila bukan angka."""
+    s = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return s.to_numpy(dtype="float64", na_value=np.nan)
+    s = s.astype("string").str.replace(f"°{suffix}", "", regex=False).str.replace(suffix, "", regex=False)
+    return pd.to_numeric(s.str.strip(), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _project(e: np.ndarray, n: np.ndarray, crs: str):
+    t = transformer(crs)
+    with _transform_lock:
+        lon, lat = t.transform(e, n)
+    return np.asarray(lon, dtype="float64"), np.asarray(lat, dtype="float64")
+
+
+def utm_to_wgs84(easting, northing, crs: str = SOURCE_CRS):
+    """Array easting/northing ``crs`` -> (lon, lat) float64; hanya titik baru yang diproyeksikan."""
+    e = np.asarray(easting, dtype="float64")
+    n = np.asarray(northing, dtype="float64")
+    lon = np.full(len(e), np.nan)
+    lat = np.full(len(e), np.nan)
+    valid = ~(np.isnan(e) | np.isnan(n))
+    keys = [(crs, x, y) for x, y in zip(e[valid].tolist(), n[valid].tolist())]
+    if not keys:
+        return lon, lat
+
+    with _cache_lock:
+        cache = _geocache()
+        found = [cache.get(k) for k in keys]
+        missing = sorted({k for k, v in zip(keys, found) if v is None})
+        _stats["hits"] += len(keys) - sum(v is None for v in found)
+        _stats["misses"] += len(missing)
+
+    if missing:
+        m_lon, m_lat = _project(np.array([k[1] for k in missing]), np.array([k[2] for k in missing]), crs)
+        new = dict(zip(missing, zip(m_lon.tolist(), m_lat.tolist())))
+        with _cache_lock:
+            cache = _geocache()
+            cache.update(new)
+            if GEOCACHE_ENABLED:
+                # gabung dengan isi file terbaru (proses lain bisa ikut menulis)
+                merged = {**_read_geocache(), **cache}
+                cache.update(merged)
+                _write_geocache(merged)
+        found = [v if v is not None else new[k] for k, v in zip(keys, found)]
+
+    lon[valid] = [v[0] for v in found]
+    lat[valid] = [v[1] for v in found]
+    return lon, lat
+
+
+def parse_coords(easting, northing, index=None) -> pd.DataFrame:
+    """Frame ``lon``/``lat`` (float64) untuk kolom easting/northing campuran derajat/UTM."""
+    if index is None:
+        index = getattr(easting, "index", None)
+    e = to_number(easting, "E")
+    n = to_number(northing, "N")
+    lon = np.full(len(e), np.nan)
+    lat = np.full(len(e), np.nan)
+
+    degrees = (e <= 180) & (n <= 90)
+    lon[degrees], lat[degrees] = e[degrees], n[degrees]
+
+    utm = ~degrees & (e > UTM_MIN) & (n > UTM_MIN)
+    if utm.any():
+        lon[utm], lat[utm] = utm_to_wgs84(e[utm], n[utm])
+    return pd.DataFrame({"lon": lon, "lat": lat}, index=index)
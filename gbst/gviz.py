@@ -0,0 +1,131 @@
+"""Penyusun query gviz (parameter ``tq``) untuk pushdown kolom dan baris ke Google Sheets.
+
+Bahasa query Google Visualization merujuk kolom dengan huruf (A, B, ...), jadi nama
+header dipetakan dulu ke huruf kolom sesuai posisinya. Bila ada bagian query yang
+tidak bisa dinyatakan (kolom tidak dikenal, nilai bukan teks/angka, teks berisi
+dua jenis tanda kutip) ``to_tq`` mengembalikan None: sheet diunduh penuh lalu
+``apply`` menyaring secara lokal dengan hasil yang sama.
+"""
+import hashlib
+import numbers
+
+import pandas as pd
+
+
+def column_letter(idx: int) -> str:
+    """Posisi kolom (mulai 0) ke huruf gviz: 0 -> A, 25 -> Z, 26 -> AA."""
+    s = ""
+    idx += 1
+    while idx:
+        idx, r = divmod(idx - 1, 26)
+        s = chr(65 + r) + s
+    return s
+
+
+def header_letters(columns) -> dict:
+    return {c: column_letter(i) for i, c in enumerate(columns)}
+
+
+def _literal(value):
+    """Literal gviz untuk satu nilai, atau None bila tidak bisa dinyatakan."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    if isinstance(value, numbers.Real):
+        return None if pd.isna(value) else repr(float(value))
+    if isinstance(value, str):
+        if "'" not in value:
+            return f"'{value}'"
+        if '"' not in value:
+            return f'"{value}"'
+    return None
+
+
+class Query:
+    """Subset satu sheet: kolom (``select``), predikat sama-dengan (``where``), ``offset``/``limit``.
+
+    ``where`` berupa dict ``{kolom: nilai}`` atau ``{kolom: [nilai, ...]}``, mis.
+    ``{"Tahun": 2024, "Site": ["BMO", "LMO"]}``; semua predikat digabung dengan AND.
+    Nama kolom mengikuti header hasil ``pd.read_csv`` (header ganda -> ``Kapasitas.1``).
+    """
+
+    def __init__(self, select=None, where=None, offset=None, limit=None):
+        self.select = list(select) if select is not None else None
+        self.where = {
+            c: list(v) if isinstance(v, (list, tuple, set)) else [v]
+            for c, v in (where or {}).items()
+        }
+        self.offset = offset
+        self.limit = limit
+
+    def key(self) -> str:
+        parts = []
+        if self.select is not None:
+            parts.append("select=" + ",".join(map(str, self.select)))
+        for c, vals in sorted(self.where.items()):
+            parts.append(f"{c}=" + "|".join(map(repr, vals)))
+        if self.offset:
+            parts.append(f"offset={self.offset}")
+        if self.limit is not None:
+            parts.append(f"limit={self.limit}")
+        return ";".join(parts)
+
+    def digest(self) -> str:
+        return hashlib.sha1(self.key().encode("utf-8")).hexdigest()[:8]
+
+    def __repr__(self):
+        return f"Query({self.key()})"
+
+    @property
+    def needs_header(self) -> bool:
+        return self.select is not None or bool(self.where)
+
+    def columns(self, header):
+        """Kolom hasil: urutan ``select`` yang memang ada di header (None = semua kolom)."""
+        if self.select is None:
+            return None
+        header = set(header)
+        return [c for c in self.select if c in header]
+
+    def to_tq(self, header=None):
+        """Teks query gviz untuk ``header`` sheet, atau None bila harus unduh penuh."""
+        letters = header_letters(header) if header is not None else {}
+        clauses = []
+
+        cols = self.columns(letters)
+        if cols is not None:
+            if not cols:
+                return None
+            clauses.append("select " + ", ".join(letters[c] for c in cols))
+
+        conds = []
+        for c, vals in self.where.items():
+            lits = [_literal(v) for v in vals]
+            if c not in letters or not lits or None in lits:
+                return None
+            cond = " or ".join(f"{letters[c]} = {lit}" for lit in lits)
+            conds.append(f"({cond})" if len(lits) > 1 else cond)
+        if conds:
+            clauses.append("where " + " and ".join(conds))
+
+        if self.limit is not None:
+            clauses.append(f"limit {int(self.limit)}")
+        if self.offset:
+            clauses.append(f"offset {int(self.offset)}")
+        return " ".join(clauses)
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Terapkan query ke DataFrame penuh (jalur fallback, hasil sama dengan gviz)."""
+        mask = pd.Series(True, index=df.index)
+        for c, vals in self.where.items():
+            # predikat pada kolom yang tidak ada tidak cocok dengan baris mana pun
+            mask &= df[c].isin(vals) if c in df.columns else False
+        out = df[mask]
+
+        cols = self.columns(df.columns)
+        if cols is not None:
+            out = out[cols]
+        start = self.offset or 0
+        stop = None if self.limit is None else start + self.limit
+        return out.iloc[start:stop].reset_index(drop=True)
@@ -0,0 +1,227 @@
+"""Server HTTP lokal pengganti endpoint gviz Google Sheets (untuk pengujian tanpa internet).
+
+Menyajikan ``<dir>/<sheet>.csv`` dan mengerti subset bahasa query yang disusun
+``gbst.gviz``: ``select A, C``, ``where`` dengan ``= != < > <= >=`` digabung
+``and``/``or``/kurung, ``limit`` dan ``offset``. Contoh::
+
+    python -m gbst.gviz_stub data_csv/ --port 8765
+    GBST_GVIZ_URL=http://127.0.0.1:8765/gviz/tq streamlit run main.py
+
+Setiap permintaan dicatat di ``server.requests`` (sheet, tq, jumlah byte)
+supaya volume transfer per halaman bisa diukur.
+"""
+import argparse
+import csv
+import io
+import logging
+import os
+import re
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gbst.gviz import column_letter
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<num>-?\d+(?:\.\d+)?)|'(?P<sq>[^']*)'|\"(?P<dq>[^\"]*)\""
+    r"|(?P<op><=|>=|!=|<>|=|<|>|\(|\)|,|\*)|(?P<word>[A-Za-z_]\w*))"
+)
+_KEYWORDS = {"select", "where", "and", "or", "not", "limit", "offset"}
+
+log = logging.getLogger(__name__)
+
+
+class QueryError(ValueError):
+    pass
+
+
+def _tokenize(tq: str) -> list:
+    tokens, pos = [], 0
+    tq = tq.strip()
+    while pos < len(tq):
+        m = _TOKEN.match(tq, pos)
+        if m is None or m.end() == pos:
+            raise QueryError(f"token tidak dikenal di posisi {pos}: {tq[pos:pos + 10]!r}")
+        pos = m.end()
+        if m.group("num") is not None:
+            tokens.append(("num", float(m.group("num"))))
+        elif m.group("sq") is not None or m.group("dq") is not None:
+            tokens.append(("str", m.group("sq") if m.group("sq") is not None else m.group("dq")))
+        elif m.group("op") is not None:
+            tokens.append(("op", m.group("op")))
+        elif m.group("word").lower() in _KEYWORDS:
+            tokens.append(("kw", m.group("word").lower()))
+        else:
+            tokens.append(("col", m.group("word").upper()))
+    return tokens
+
+
+def _compare(cell: str, op: str, value) -> bool:
+    if isinstance(value, float):
+        try:
+            cell = float(cell)
+        except ValueError:
+            return False
+    return {
+        "=": cell == value, "!=": cell != value, "<>": cell != value,
+        "<": cell < value, ">": cell > value, "<=": cell <= value, ">=": cell >= value,
+    }[op]
+
+
+class _Parser:
+    def __init__(self, tq: str, letters: dict):
+        self.tokens = _tokenize(tq)
+        self.i = 0
+        self.letters = letters   # huruf kolom -> indeks
+
+    def peek(self):
+        return self.tokens[self.i] if self.i < len(self.tokens) else (None, None)
+
+    def take(self, kind=None, value=None):
+        tok = self.peek()
+        if tok[0] is None or (kind and tok[0] != kind) or (value and tok[1] != value):
+            raise QueryError(f"query tidak valid dekat token ke-{self.i}: {tok[1]!r}")
+        self.i += 1
+        return tok
+
+    def column(self) -> int:
+        letter = self.take("col")[1]
+        if letter not in self.letters:
+            raise QueryError(f"kolom {letter} tidak ada")
+        return self.letters[letter]
+
+    def parse(self) -> dict:
+        q = {"select": None, "where": None, "limit": None, "offset": 0}
+        if self.peek() == ("kw", "select"):
+            self.take()
+            if self.peek() == ("op", "*"):
+                self.take()
+            else:
+                q["select"] = [self.column()]
+                while self.peek() == ("op", ","):
+                    self.take()
+                    q["select"].append(self.column())
+        if self.peek() == ("kw", "where"):
+            self.take()
+            q["where"] = self.expr()
+        for kw in ("limit", "offset"):
+            if self.peek() == ("kw", kw):
+                self.take()
+                q[kw] = int(self.take("num")[1])
+        if self.peek()[0] is not None:
+            raise QueryError(f"sisa query tidak dikenal: {self.peek()[1]!r}")
+        return q
+
+    # expr := term (or term)* ; term := factor (and factor)* ; factor := not? (expr) | COL op literal
+    def expr(self):
+        terms = [self.term()]
+        while self.peek() == ("kw", "or"):
+            self.take()
+            terms.append(self.term())
+        return lambda row: any(t(row) for t in terms)
+
+    def term(self):
+        factors = [self.factor()]
+        while self.peek() == ("kw", "and"):
+            self.take()
+            factors.append(self.factor())
+        return lambda row: all(f(row) for f in factors)
+
+    def factor(self):
+        if self.peek() == ("kw", "not"):
+            self.take()
+            inner = self.factor()
+            return lambda row: not inner(row)
+        if self.peek() == ("op", "("):
+            self.take()
+            inner = self.expr()
+            self.take("op", ")")
+            return inner
+        idx = self.column()
+        op = self.take("op")[1]
+        kind, value = self.take()
+        if kind not in ("num", "str"):
+            raise QueryError(f"literal tidak valid: {value!r}")
+        return lambda row: idx < len(row) and _compare(row[idx], op, value)
+
+
+def run_query(text: str, tq: str = "") -> str:
+    """Jalankan ``tq`` terhadap isi CSV ``text``; hasilnya CSV (semua nilai dikutip, seperti gviz)."""
+    rows = list(csv.reader(io.StringIO(text)))
+    header, body = (rows[0], rows[1:]) if rows else ([], [])
+    q = _Parser(tq, {column_letter(i): i for i in range(len(header))}).parse()
+
+    if q["where"] is not None:
+        body = [r for r in body if q["where"](r)]
+    body = body[q["offset"]:]
+    if q["limit"] is not None:
+        body = body[:q["limit"]]
+    cols = q["select"] if q["select"] is not None else range(len(header))
+
+    out = io.StringIO()
+    w = csv.writer(out, quoting=csv.QUOTE_ALL, lineterminator="\n")
+    w.writerow([header[i] for i in cols])
+    for r in body:
+        w.writerow([r[i] if i < len(r) else "" for i in cols])
+    return out.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        sheet = params.get("sheet", [""])[0]
+        tq = params.get("tq", [""])[0]
+        path = os.path.join(self.server.directory, f"{sheet}.csv")
+        if not sheet or not os.path.isfile(path):
+            return self._reply(404, f"sheet {sheet!r} tidak ditemukan")
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        try:
+            body = run_query(text, tq).encode("utf-8")
+        except QueryError as e:
+            return self._reply(400, str(e))
+        with self.server.lock:
+            self.server.requests.append({"sheet": sheet, "tq": tq, "bytes": len(body)})
+        self._reply(200, body, "text/csv; charset=utf-8")
+
+    def _reply(self, code, body, ctype="text/plain; charset=utf-8"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(directory: str, host: str = "127.0.0.1", port: int = 0):
+    """Jalankan server di thread daemon. Mengembalikan ``(server, url_gviz)``."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.directory = directory
+    server.requests = []
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/gviz/tq"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="folder berisi <sheet>.csv")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    server, url = serve(args.directory, args.host, args.port)
+    log.info("GBST_GVIZ_URL=%s", url)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
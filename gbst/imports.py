@@ -0,0 +1,88 @@
+"""Anggaran waktu impor top-level per halaman.
+
+Library analitik berat (sklearn, scipy, statsmodels, seaborn, matplotlib,
+wordcloud) diimpor di dalam bagian halaman yang membutuhkannya, bukan di atas
+skrip, supaya first paint tidak menunggu impor. Modul ini mengukur impor
+top-level tiap skrip di interpreter baru dan membandingkannya dengan anggaran::
+
+    python -m gbst.imports          # exit 1 bila ada halaman melewati anggaran
+    python -m gbst.imports -v       # tampilkan juga rincian per statement impor
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# anggaran (ms) impor top-level per skrip; skrip lain memakai DEFAULT_BUDGET_MS
+DEFAULT_BUDGET_MS = float(os.environ.get("GBST_IMPORT_BUDGET_MS", "1500"))
+BUDGET_MS = {
+    "main.py": 2500,                     # folium + pyproj untuk peta ringkasan
+    "pages/5_CCTV.py": 2500,             # folium + pyproj
+    "pages/3_Survei.py": 1500,
+    "pages/4_Ketidaksesuaian.py": 1500,
+}
+
+# diukur di proses anak: tiap statement diukur terpisah, urutan sama dengan skrip
+_PROBE = """
+import json, sys, time
+out = []
+for stmt in json.loads(sys.argv[1]):
+    t0 = time.perf_counter()
+    exec(stmt, {})
+    out.append([stmt, (time.perf_counter() - t0) * 1000])
+print(json.dumps(out))
+"""
+
+
+def top_level_imports(path: str) -> list:
+    """Statement ``import``/``from ... import`` yang dijalankan saat skrip dimulai."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def measure(path: str) -> list:
+    """``[(statement, ms)]`` impor top-level skrip, diukur di interpreter baru (cache dingin)."""
+    stmts = top_level_imports(path)
+    res = subprocess.run([sys.executable, "-c", _PROBE, json.dumps(stmts)], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    return [tuple(x) for x in json.loads(res.stdout)]
+
+
+def budget_for(script: str) -> float:
+    return BUDGET_MS.get(script, DEFAULT_BUDGET_MS)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("scripts", nargs="*", help="default: main.py dan pages/*.py")
+    ap.add_argument("-v", "--verbose", action="store_true")
+    args = ap.parse_args(argv)
+
+    scripts = args.scripts or ["main.py"] + sorted(
+        os.path.relpath(p, ROOT) for p in glob.glob(os.path.join(ROOT, "pages", "*.py")))
+    over = 0
+    for script in scripts:
+        try:
+            timings = measure(os.path.join(ROOT, script))
+        except subprocess.CalledProcessError as e:
+            print(f"{script:32s} GAGAL: {e.stderr.strip().splitlines()[-1]}")
+            over += 1
+            continue
+        total, budget = sum(ms for _, ms in timings), budget_for(script)
+        flag = "OK " if total <= budget else "LEBIH"
+        over += total > budget
+        print(f"{script:32s} {total:8.1f} ms / anggaran {budget:.0f} ms  {flag}")
+        if args.verbose:
+            for stmt, ms in sorted(timings, key=lambda x: -x[1]):
+                print(f"    {ms:8.1f} ms  {stmt}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
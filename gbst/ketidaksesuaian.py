@@ -0,0 +1,93 @@
+"""Kolom turunan sheet Ketidaksesuaian yang hanya bergantung pada barisnya sendiri.
+
+Dihitung sekali saat sheet dimuat (dan saat sinkron delta hanya untuk baris baru),
+jadi halaman tinggal memakai dimensi tanggal (``tanggal``, ``tahun``, ``bulan``,
+``period_month``, ``hari``) dan fitur teks deteksi fraud tanpa mengulang parsing
+tanggal dan regex untuk seluruh log tiap rerun. ``tanggallapor`` sendiri sudah
+di-parse sekali oleh skema (``gbst.schema.parse_date``).
+"""
+import re
+
+import pandas as pd
+
+from gbst.canonical import canonical_name
+from gbst.schema import parse_date
+
+# kolom yang ditambahkan ``derive`` (nama sudah kanonik, gbst.canonical)
+DERIVED = ["tanggal", "tahun", "bulan", "period_month", "hari", "desc_clean", "sub_clean",
+           "status_lc", "pelapor_lc", "indikasi_masalah", "repet_score"]
+
+# istilah umum yang sering salah ketik
+_TYPO = {
+    "sampaj": "sampah", "sampag": "sampah", "sm": "sampah",
+    "limba": "limbah", "majung": "majun", "greas": "grease",
+    "trush": "trash", "temapt": "tempat", "temaptnya": "tempatnya",
+    "belom": "belum", "tdk": "tidak", "tkn": "tidak",
+}
+_TYPO_RE = [(re.compile(rf"\b{k}\b"), v) for k, v in _TYPO.items()]
+
+# kata kunci “benar-benar masalah”
+_ISSUE_RE = re.compile(
+    r"penuh|menumpuk|meluap|overflow|tercampur|tidak\s*terpilah|b3|kontaminasi|berceceran|bau|lalat"
+    r"|tidak\s*dibuang|belum\s*(di)?angkut|tidak\s*pada\s*tempatnya|housekeep"
+)
+
+
+def norm_text(s: str) -> str:
+    s = str(s).lower().strip()
+    for pat, v in _TYPO_RE:
+        s = pat.sub(v, s)
+    s = re.sub(r"[^\w\s]", " ", s)   # buang tanda baca
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+
+def has_real_issue(t) -> bool:
+    return bool(_ISSUE_RE.search(str(t).lower()))
+
+
+def repetitive_score(t) -> float:
+    tokens = str(t).split()
+    if len(tokens) < 6:
+        return 0.0
+    # makin tinggi → makin repetitif
+    return 1.0 - len(set(tokens)) / max(len(tokens), 1)
+
+
+def _col(df: pd.DataFrame, name: str):
+    """Kolom mentah yang nama kanoniknya ``name``, atau None."""
+    for c in df.columns:
+        if canonical_name(c) == name:
+            return c
+    return None
+
+
+def derive(df: pd.DataFrame) -> pd.DataFrame:
+    """Tambahkan kolom ``DERIVED``; frame yang sudah lengkap dikembalikan apa adanya."""
+    if df.empty or all(c in df.columns for c in DERIVED):
+        return df
+    df = df.copy()
+
+    tgl = _col(df, "tanggallapor")
+    if tgl is not None:
+        t = parse_date(df[tgl])
+        df["tanggal"] = t.dt.normalize()
+        df["tahun"] = t.dt.year.astype("Int16")
+        df["bulan"] = t.dt.month.astype("Int8")
+        df["period_month"] = t.dt.to_period("M").dt.to_timestamp()
+        df["hari"] = t.dt.weekday.astype("Int8")     # 0 = Senin
+
+    desc, sub = _col(df, "deskripsi"), _col(df, "sub_ketidaksesuaian")
+    stat, user = _col(df, "status_temuan"), _col(df, "pelapor")
+    if desc is not None:
+        df["desc_clean"] = df[desc].fillna("").map(norm_text)
+        df["indikasi_masalah"] = df["desc_clean"].map(has_real_issue)
+    if sub is not None:
+        df["sub_clean"] = df[sub].fillna("").map(norm_text)
+    if desc is not None and sub is not None:
+        df["repet_score"] = (df["desc_clean"] + " " + df["sub_clean"]).map(repetitive_score)
+    if stat is not None:
+        df["status_lc"] = df[stat].astype(str).str.lower().str.strip()
+    if user is not None:
+        df["pelapor_lc"] = df[user].astype(str).str.lower().str.strip()
+    return df
@@ -0,0 +1,94 @@
+"""Kernel agregasi man power unik dan timbulan SNI (kg/hari, kg/hari/orang).
+
+Aturan man power unik dipakai semua halaman: satu nilai per
+site-perusahaan-tahun (baris terakhir, kosong = 0), karena sheet Timbulan
+mengulang man power yang sama di setiap baris jenis timbulan. ``kernel`` menghitung
+timbulan (kg/hari), ``data_input_total`` (kg), man power unik dan kg/hari/orang
+untuk semua grain yang ditampilkan dalam satu groupby atas baris terfilter; grain
+yang lebih kasar dijumlahkan dari hasil kecil itu, bukan dari baris mentah lagi.
+
+Nama kolom bisa nama kanonik (``site``, ``man_power``) atau header asli
+(``"Site"``, ``"Man Power"``); kolom kunci hasil memakai nama yang diberikan,
+kolom ukuran selalu ``timbulan``, ``data_input_total``, ``man_power``,
+``kg_hari_orang``. Untuk grain ber-jenis, man power adalah man power grain
+induknya (tanpa jenis), sama seperti perhitungan SNI per jenis sebelumnya.
+"""
+import numpy as np
+import pandas as pd
+
+# grain -> dimensi; dimensi yang kolomnya tidak ada membuat grain dilewati
+GRAINS = {
+    "site": ("site",),
+    "perusahaan_site": ("perusahaan", "site"),
+    "tahun": ("tahun",),
+    "site_tahun": ("site", "tahun"),
+    "perusahaan_site_tahun": ("perusahaan", "site", "tahun"),
+    "tahun_jenis": ("tahun", "jenis"),
+    "perusahaan_site_tahun_jenis": ("perusahaan", "site", "tahun", "jenis"),
+}
+
+MEASURES = ["timbulan", "data_input_total", "man_power", "kg_hari_orang"]
+
+
+def unique(df: pd.DataFrame, keys, man_power: str = "man_power") -> pd.DataFrame:
+    """Baris terakhir per ``keys`` (site-perusahaan-tahun) dengan man power kosong = 0."""
+    out = df.drop_duplicates(subset=list(keys), keep="last")
+    return out.assign(**{man_power: out[man_power].fillna(0)})
+
+
+def per_orang(timbulan, man_power):
+    """kg/hari/orang; NaN bila man power 0 (tabel menampilkannya kosong)."""
+    timbulan = np.asarray(timbulan, dtype=float)
+    man_power = np.asarray(man_power, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(man_power > 0, timbulan / man_power, np.nan)
+
+
+def kernel(df: pd.DataFrame, site="site", perusahaan="perusahaan", tahun="tahun", jenis=None,
+           timbulan="timbulan", man_power="man_power", data_input_total="data_input_total") -> dict:
+    """``{"total": Series, grain: DataFrame}`` untuk semua ``GRAINS`` yang kolomnya ada.
+
+    ``total`` memuat ukuran untuk seluruh baris plus ``jumlah_unit`` (pasangan
+    site-perusahaan). Kunci kosong (NaN) ikut ``total`` tetapi tidak muncul
+    sebagai baris grain.
+    """
+    names = {"site": site, "perusahaan": perusahaan, "tahun": tahun, "jenis": jenis}
+    names = {dim: col for dim, col in names.items() if col is not None and col in df.columns}
+    unit = [names[d] for d in ("site", "perusahaan", "tahun") if d in names]
+    fine = unit + ([names["jenis"]] if "jenis" in names else [])
+
+    rows = pd.DataFrame({
+        "timbulan": df[timbulan].fillna(0) if timbulan in df.columns else 0.0,
+        "data_input_total": (pd.to_numeric(df[data_input_total], errors="coerce").fillna(0)
+                             if data_input_total in df.columns else 0.0),
+    }, index=df.index)
+    rows[fine] = df[fine]
+
+    # satu-satunya lintasan atas baris: jumlah per grain terhalus + man power unik
+    base = rows.groupby(fine, observed=True, dropna=False)[["timbulan", "data_input_total"]].sum()
+    if man_power in df.columns and unit:
+        mp = unique(df[unit + [man_power]], unit, man_power).rename(columns={man_power: "man_power"})
+    else:
+        mp = pd.DataFrame(columns=unit + ["man_power"])
+
+    out = {"total": pd.Series({
+        "timbulan": float(base["timbulan"].sum()),
+        "data_input_total": float(base["data_input_total"].sum()),
+        "man_power": float(mp["man_power"].sum()),
+        "jumlah_unit": len(mp[[c for c in unit if c != names.get("tahun")]].drop_duplicates()) if unit else 0,
+    })}
+    out["total"]["kg_hari_orang"] = float(per_orang(out["total"]["timbulan"], out["total"]["man_power"]))
+
+    for grain, dims in GRAINS.items():
+        if not set(dims) <= set(names):
+            continue
+        cols = [names[d] for d in dims]
+        parent = [c for c in cols if c != names.get("jenis")]
+        sums = base.groupby(level=cols, observed=True).sum().reset_index()
+        mp_parent = (mp.groupby(parent, observed=True)["man_power"].sum()
+                     .rename("man_power").reset_index())
+        table = sums.merge(mp_parent, on=parent, how="left")
+        table["man_power"] = table["man_power"].fillna(0)
+        table["kg_hari_orang"] = per_orang(table["timbulan"], table["man_power"])
+        out[grain] = table[cols + MEASURES]
+    return out
@@ -0,0 +1,96 @@
+"""Layer titik folium yang tetap ringan saat inventaris CCTV membesar.
+
+Satu ``folium.Marker`` per baris berarti satu objek Python dan satu blok HTML/JS
+per titik; di atas beberapa ribu titik browser tersendat. ``add_points``
+memakai marker ikon biasa selama jumlah titik <= ``CLUSTER_THRESHOLD``
+(``GBST_MAP_CLUSTER_THRESHOLD``, default 500), di atasnya otomatis satu layer
+``FastMarkerCluster``: data titik dikirim sebagai satu array, warna per
+perusahaan ikut di data, dan popup baru dirangkai saat titik diklik.
+
+Peta dirender sekali ke HTML (``html``) dan di-cache halaman lewat
+``gbst.results`` per versi data x pilihan filter x layer, lalu ditampilkan dengan
+``components.html``: pan/zoom tidak menjalankan ulang skrip, dan berpindah layer
+bolak-balik langsung dijawab dari cache.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import folium
+from folium.plugins import FastMarkerCluster
+
+CLUSTER_THRESHOLD = int(os.environ.get("GBST_MAP_CLUSTER_THRESHOLD", "500"))
+
+# warna ikon folium.Icon (urutan sama dengan peta lama) dan padanan hex untuk layer cluster
+COLORS = {
+    "red": "#d63e2a", "blue": "#38aadd", "green": "#72b026", "purple": "#d252b9",
+    "orange": "#f69730", "darkred": "#a23336", "lightred": "#ff8e7f", "beige": "#ffcb92",
+    "darkblue": "#0067a3", "darkgreen": "#728224", "cadetblue": "#436978",
+    "darkpurple": "#5b396b", "white": "#fbfbfb", "pink": "#ff91ea", "lightblue": "#8adaff",
+    "lightgreen": "#bbf970", "gray": "#575757", "black": "#303030", "lightgray": "#a3a3a3",
+}
+COLOR_LIST = list(COLORS)
+
+# dipanggil Leaflet per baris data: [lat, lon, warna, tooltip, popup]
+_CLUSTER_CALLBACK = """\
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]),
+        {radius: 7, color: row[2], fillColor: row[2], fillOpacity: 0.85, weight: 1});
+    if (row[3]) { marker.bindTooltip(row[3]); }
+    marker.bindPopup(function () { return row[4]; });
+    return marker;
+};
+"""
+
+
+def color_map(values) -> dict:
+    """Warna ikon per nilai (mis. perusahaan), berputar di ``COLOR_LIST`` menurut urutan abjad."""
+    uniq = sorted(pd.Series(values).dropna().unique().tolist())
+    return {v: COLOR_LIST[i % len(COLOR_LIST)] for i, v in enumerate(uniq)}
+
+
+def text(df: pd.DataFrame, column: str) -> pd.Series:
+    """Kolom sebagai teks untuk popup/tooltip (kosong bila kolom/nilai tidak ada)."""
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype="string")
+    return df[column].astype("string").fillna("")
+
+
+def add_points(fmap, lat, lon, popup, tooltip, color="blue", icon="info-sign",
+               threshold: int = None) -> str:
+    """Tambah titik ke ``fmap``; kembalikan mode yang dipakai (``"marker"``/``"cluster"``).
+
+    ``popup``, ``tooltip`` dan ``color`` (nama di ``COLORS``) boleh skalar atau
+    sejajar dengan ``lat``/``lon``.
+    """
+    lat = np.asarray(lat, dtype="float64")
+    lon = np.asarray(lon, dtype="float64")
+    n = len(lat)
+    popup, tooltip, color = (_column(v, n) for v in (popup, tooltip, color))
+    threshold = CLUSTER_THRESHOLD if threshold is None else threshold
+
+    if n <= threshold:
+        for la, lo, p, t, c in zip(lat.tolist(), lon.tolist(), popup, tooltip, color):
+            folium.Marker(location=[la, lo], popup=p, tooltip=t or None,
+                          icon=folium.Icon(color=c, icon=icon, prefix="fa")).add_to(fmap)
+        return "marker"
+
+    rows = [[la, lo, COLORS.get(c, c), t, p]
+            for la, lo, p, t, c in zip(lat.tolist(), lon.tolist(), popup, tooltip, color)]
+    FastMarkerCluster(data=rows, callback=_CLUSTER_CALLBACK).add_to(fmap)
+    return "cluster"
+
+
+def html(fmap) -> str:
+    """Dokumen HTML lengkap peta, untuk di-cache dan ditampilkan sebagai komponen statis.
+
+    ``st_folium`` mengirim state peta ke Python setiap pan/zoom sehingga seluruh
+    halaman dijalankan ulang; peta sebagai HTML statis hanya berinteraksi di browser.
+    """
+    return fmap.get_root().render()
+
+
+def _column(value, n: int) -> list:
+    if isinstance(value, (pd.Series, np.ndarray, list, tuple)):
+        return [str(v) for v in value]
+    return [value] * n
@@ -0,0 +1,81 @@
+"""Reshape wide -> long kolom periode bulanan sheet Program.
+
+Header bulanan sheet Program berbentuk "Januari 2024" (nama asli) atau
+"januari_2024" (nama kanonik, ``gbst.canonical``). Tiap nama kolom di-parse sekali ke tabel
+lookup (``period_columns``), lalu tahun/bulan/periode ditempel ke frame long
+lewat pemetaan posisi kolom (``np.repeat``), bukan ``.apply`` per baris.
+
+Frame hasil ``to_long`` ringkas: nama kolom periode dan bulan berupa
+categorical, tahun ``int16``. Kolom non-periode (site, perusahaan, kategori, ...)
+dibiarkan bertipe asli karena halaman mengelompokkan data dengan kolom itu.
+"""
+import functools
+import re
+
+import numpy as np
+import pandas as pd
+
+BULAN = ["Januari", "Februari", "Maret", "April", "Mei", "Juni",
+         "Juli", "Agustus", "September", "Oktober", "November", "Desember"]
+BULAN_NO = {b: i + 1 for i, b in enumerate(BULAN)}
+BULAN_DTYPE = pd.CategoricalDtype(BULAN, ordered=True)
+
+_PERIOD_RE = re.compile(r"^\s*(" + "|".join(BULAN) + r")[ _](\d{4})\s*$", re.I)
+
+
+@functools.lru_cache(maxsize=None)
+def parse_period(name):
+    """``(tahun, no_bulan)`` dari nama kolom periode, atau None bila bukan kolom periode."""
+    m = _PERIOD_RE.match(str(name))
+    if m is None:
+        return None
+    return int(m.group(2)), BULAN_NO[m.group(1).capitalize()]
+
+
+def period_columns(columns) -> pd.DataFrame:
+    """Lookup kolom periode sesuai urutan header.
+
+    Index = nama kolom asli; kolom ``tahun`` (int16), ``bulan_no`` (int8),
+    ``bulan`` (categorical nama bulan) dan ``periode`` (tanggal 1 bulan itu).
+    """
+    rows = [(c, *p) for c in columns for p in [parse_period(c)] if p is not None]
+    lookup = pd.DataFrame(rows, columns=["kolom", "tahun", "bulan_no"]).set_index("kolom")
+    lookup["tahun"] = lookup["tahun"].astype("int16")
+    lookup["bulan_no"] = lookup["bulan_no"].astype("int8")
+    lookup["bulan"] = pd.Categorical.from_codes(lookup["bulan_no"].to_numpy() - 1, dtype=BULAN_DTYPE)
+    lookup["periode"] = pd.to_datetime(
+        pd.DataFrame({"year": lookup["tahun"], "month": lookup["bulan_no"], "day": 1})
+    )
+    return lookup
+
+
+def to_long(df: pd.DataFrame, var_name: str = "bulan_tahun", value_name: str = "value",
+            tahun: str = "tahun", bulan: str = "bulan", periode: str = "periode",
+            lookup: pd.DataFrame = None):
+    """Frame long (urutan baris sama dengan ``DataFrame.melt``), atau None tanpa kolom periode.
+
+    Nama kolom hasil mengikuti gaya halaman pemanggil; ``bulan``/``periode``
+    None berarti kolom itu tidak dibuat.
+    """
+    lookup = period_columns(df.columns) if lookup is None else lookup
+    if lookup.empty:
+        return None
+    n, k = len(df), len(lookup)
+    period_cols = list(lookup.index)
+    ids = [c for c in df.columns if c not in lookup.index]
+
+    values = df[period_cols]
+    if not all(pd.api.types.is_numeric_dtype(t) for t in values.dtypes):
+        values = values.apply(pd.to_numeric, errors="coerce")
+
+    # baris ke-i frame long = baris (i % n) frame wide, kolom periode ke-(i // n)
+    pos = np.repeat(np.arange(k), n)
+    out = df[ids].take(np.tile(np.arange(n), k)).reset_index(drop=True)
+    out[var_name] = pd.Categorical.from_codes(pos, categories=pd.Index(period_cols, dtype=object))
+    out[value_name] = values.to_numpy(dtype="float64").ravel(order="F")
+    out[tahun] = lookup["tahun"].to_numpy()[pos]
+    if bulan is not None:
+        out[bulan] = pd.Categorical.from_codes(lookup["bulan_no"].to_numpy()[pos] - 1, dtype=BULAN_DTYPE)
+    if periode is not None:
+        out[periode] = lookup["periode"].to_numpy()[pos]
+    return out
@@ -0,0 +1,84 @@
+"""Preset filter sidebar yang bisa dibagi ("Semua site 2025", "BMO only", ...).
+
+Preset bawaan ada di file JSON yang ikut repo (``GBST_FILTER_PRESETS``, default
+``filter_presets.json`` di root repo) dan hanya dibaca. Preset yang disimpan
+pengguna ditulis ke file terpisah yang tidak di-commit (``GBST_USER_PRESETS``,
+default ``<GBST_SNAPSHOT_DIR>/filter_presets.json``); ``load`` menggabungkan
+keduanya, preset pengguna menimpa preset bawaan bernama sama. Keduanya berbentuk
+``{nama: {filter: [nilai, ...]}}``.
+Filter yang tidak disebut di preset berarti semua opsi terpilih, jadi
+``{"tahun": [2025]}`` cukup untuk "semua site 2025". Nilai yang tidak ada di opsi
+data saat ini (site yang belum punya baris, tahun yang belum ada) diabaikan.
+"""
+import json
+import os
+import threading
+
+from gbst import snapshot
+
+PRESETS_PATH = os.environ.get(
+    "GBST_FILTER_PRESETS",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "filter_presets.json"),
+)
+USER_PRESETS_PATH = os.environ.get(
+    "GBST_USER_PRESETS", os.path.join(snapshot.SNAPSHOT_DIR, "filter_presets.json"),
+)
+
+_lock = threading.Lock()
+
+
+def _read(path: str) -> dict:
+    # file tidak ada/rusak = tidak ada preset
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {str(name): spec for name, spec in data.items() if isinstance(spec, dict)}
+
+
+def load() -> dict:
+    """``{nama: {filter: [nilai]}}``: preset bawaan ditimpa preset pengguna."""
+    return {**_read(PRESETS_PATH), **_read(USER_PRESETS_PATH)}
+
+
+def save(name: str, selections: dict, options: dict) -> dict:
+    """Tambah/ganti preset pengguna ``name`` dari pilihan saat ini; kembalikan semua preset.
+
+    Filter yang semua opsinya terpilih tidak ditulis, supaya preset tetap berlaku
+    ketika data mendapat site/tahun baru.
+    """
+    spec = {}
+    for field, selected in selections.items():
+        if set(selected) != set(options.get(field, [])):
+            spec[field] = [_plain(v) for v in selected]
+    with _lock:
+        user = _read(USER_PRESETS_PATH)
+        user[name] = spec
+        folder = os.path.dirname(USER_PRESETS_PATH)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp = USER_PRESETS_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(user, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, USER_PRESETS_PATH)
+    return load()
+
+
+def resolve(spec: dict, options: dict) -> dict:
+    """Pilihan per filter dari preset ``spec`` terhadap ``{filter: opsi}`` data saat ini."""
+    out = {}
+    for field, opts in options.items():
+        if field not in spec:
+            out[field] = list(opts)
+            continue
+        wanted = {str(v) for v in spec[field] or []}
+        out[field] = [o for o in opts if str(o) in wanted]
+    return out
+
+
+def _plain(v):
+    # angka numpy (mis. tahun int16) -> tipe Python supaya bisa ditulis ke JSON
+    return v.item() if hasattr(v, "item") else v
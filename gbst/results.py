@@ -0,0 +1,217 @@
+"""Cache hasil per kombinasi filter: frame terfilter dan agregat turunannya.
+
+Pengguna berpindah-pindah di antara beberapa kombinasi site/perusahaan/tahun/bulan
+yang sama; tanpa cache setiap rerun menghitung ulang semua frame terfilter dan
+agregatnya. ``memo`` menyimpan hasil per kunci
+``(bagian, versi data, pilihan filter yang dinormalisasi)`` sehingga kembali ke
+kombinasi yang pernah dipakai langsung dijawab dari memori, untuk semua sesi.
+
+Pilihan dinormalisasi sebelum jadi kunci: urutan nilai di multiselect tidak
+berpengaruh, dan ``None``/list kosong sama-sama berarti "tidak difilter".
+Versi dari ``PageData.versions()`` sudah memuat versi dimensi kolom sheet itu
+(``gbst.dimensions.frame_versions``), jadi hasil hanya dihitung ulang bila
+dimensi yang dipakai sheet tersebut bertambah. Versi ``None`` (versi data tidak diketahui) berarti
+hasil tidak disimpan.
+
+Cache dibatasi jumlah entri (``GBST_RESULT_CACHE_ENTRIES``) dan total byte
+(``GBST_RESULT_CACHE_MB``); entri yang paling lama tidak dipakai dibuang lebih
+dulu (LRU), begitu juga entri versi lama bagian yang sama. Hasil yang disimpan
+dibagi semua sesi: frame dikembalikan lewat ``sheets.session_copy`` (dangkal
+dengan Copy-on-Write pandas 3, penuh di pandas 2), jadi perubahan oleh halaman
+tidak mengotori cache. ``stats`` dipakai panel debug.
+"""
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from gbst.sheets import session_copy
+
+MAX_ENTRIES = int(os.environ.get("GBST_RESULT_CACHE_ENTRIES", "512"))
+MAX_BYTES = int(float(os.environ.get("GBST_RESULT_CACHE_MB", "256")) * 1024 * 1024)
+
+
+def _normalize(value):
+    if value is None or isinstance(value, (str, bytes, bool, int, float)):
+        return value
+    try:
+        values = list(value)
+    except TypeError:
+        return value
+    if not values:
+        return None
+    return tuple(sorted(set(values), key=lambda v: (type(v).__name__, str(v))))
+
+
+def selection_key(selections: dict) -> tuple:
+    """Kunci pilihan filter: urut per nama, nilai diurutkan, kosong -> None."""
+    return tuple(sorted((name, _normalize(v)) for name, v in selections.items()))
+
+
+def sizeof(value) -> int:
+    """Perkiraan byte hasil (frame/Series memakai ``memory_usage(deep=True)``)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+def _share(value):
+    # hasil bersama -> salinan dangkal per pemanggil supaya aman diubah
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return session_copy(value)
+    if isinstance(value, tuple):
+        return tuple(_share(v) for v in value)
+    if isinstance(value, list):
+        return [_share(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _share(v) for k, v in value.items()}
+    return value
+
+
+def _cacheable(version) -> bool:
+    if version is None:
+        return False
+    if isinstance(version, tuple):
+        return all(v is not None for v in version)
+    return True
+
+
+class ResultCache:
+    """LRU ``(bagian, versi, pilihan) -> hasil`` dengan batas entri dan byte."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # kunci -> (hasil, byte, durasi hitung detik)
+        self._latest = {}               # bagian -> versi terakhir yang disimpan
+        self._stats = {}                # bagian -> dict hit/miss/...
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _section_stats(self, section: str) -> dict:
+        return self._stats.setdefault(section, {
+            "hits": 0, "misses": 0, "bypass": 0, "evictions": 0,
+            "compute_s": 0.0, "saved_s": 0.0,
+        })
+
+    def get(self, section: str, version, fn, **selections):
+        """Hasil ``fn()`` untuk kombinasi ini, dari cache bila pernah dihitung."""
+        if not _cacheable(version):
+            with self._lock:
+                self._section_stats(section)["bypass"] += 1
+            return fn()
+
+        key = (section, version, selection_key(selections))
+        with self._lock:
+            hit = self._entries.get(key)
+            stats = self._section_stats(section)
+            if hit is not None:
+                self._entries.move_to_end(key)
+                stats["hits"] += 1
+                stats["saved_s"] += hit[2]
+                return _share(hit[0])
+            stats["misses"] += 1
+
+        t0 = time.perf_counter()
+        value = fn()
+        elapsed = time.perf_counter() - t0
+        size = sizeof(value)
+
+        with self._lock:
+            stats = self._section_stats(section)
+            stats["compute_s"] += elapsed
+            if self._latest.get(section) != version:
+                # versi data baru -> entri versi lama bagian ini tidak akan diminta lagi
+                self._drop(lambda k: k[0] == section and k[1] != version, stats)
+                self._latest[section] = version
+            if size <= self.max_bytes:
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self._bytes -= old[1]
+                self._entries[key] = (value, size, elapsed)
+                self._bytes += size
+                self._evict()
+        return _share(value)
+
+    def _drop(self, predicate, stats: dict):
+        for k in [k for k in self._entries if predicate(k)]:
+            self._bytes -= self._entries.pop(k)[1]
+            stats["evictions"] += 1
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._section_stats(key[0])["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self._bytes = 0
+
+    def stats(self) -> pd.DataFrame:
+        with self._lock:
+            held = {}
+            for (section, _, _), (_, size, _) in self._entries.items():
+                n, b = held.get(section, (0, 0))
+                held[section] = (n + 1, b + size)
+            rows = []
+            for section, s in sorted(self._stats.items()):
+                lookups = s["hits"] + s["misses"]
+                entries, nbytes = held.get(section, (0, 0))
+                rows.append({
+                    "section": section,
+                    "hits": s["hits"],
+                    "misses": s["misses"],
+                    "hit_rate": round(s["hits"] / lookups * 100, 1) if lookups else None,
+                    "bypass": s["bypass"],
+                    "evictions": s["evictions"],
+                    "entries": entries,
+                    "bytes": nbytes,
+                    "compute_ms": round(s["compute_s"] * 1000, 1),
+                    "saved_ms": round(s["saved_s"] * 1000, 1),
+                })
+        return pd.DataFrame(rows, columns=["section", "hits", "misses", "hit_rate", "bypass", "evictions",
+                                           "entries", "bytes", "compute_ms", "saved_ms"])
+
+    def usage(self) -> dict:
+        """Ringkasan isi cache: jumlah entri dan byte terhadap batasnya."""
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries,
+                    "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+_cache = ResultCache()
+
+
+def memo(section: str, version, fn, **selections):
+    """``fn()`` di-cache per ``(section, version, pilihan filter)``.
+
+    ``section`` menamai bagian halaman (mis. ``"main:manpower"``); ``version``
+    adalah versi data sheet sumbernya (tuple untuk beberapa sheet). Semua input
+    ``fn`` yang berubah-ubah harus ikut di ``selections``.
+    """
+    return _cache.get(section, version, fn, **selections)
+
+
+def stats() -> pd.DataFrame:
+    """Hit/miss, hit rate (%), eviction, entri dan byte per bagian."""
+    return _cache.stats()
+
+
+def usage() -> dict:
+    return _cache.usage()
+
+
+def clear():
+    _cache.clear()
@@ -0,0 +1,193 @@
+"""Registry skema per sheet: kolom yang dibaca, tipe, konvensi desimal dan kolom kategori.
+
+Export CSV gviz dibaca sekali dengan ``dtype=str`` (tanpa inferensi tipe per kolom)
+dan hanya kolom yang dideklarasikan (``usecols``); kolom angka lalu di-parse satu
+kali dengan ``parse_number`` yang mengerti koma desimal ("1,5", "1.234,5").
+Halaman jadi tidak perlu lagi ``pd.to_numeric(...str.replace(",", "."))`` berulang.
+
+Nama kolom dicocokkan lewat ``key`` (huruf kecil, tanpa spasi/tanda baca), jadi
+"Man Power", "man_power" dan "Man power" dianggap kolom yang sama.
+Kolom ``categorical`` dibaca sebagai teks yang sudah di-strip; daftar ini juga
+menandai dimensi (site, perusahaan, jenis, ...) untuk filter dan groupby.
+Kolom ``dates`` di-parse sekali ke datetime dengan ``parse_date`` (format eksplisit
+dulu, inferensi ``dayfirst`` hanya untuk sisa yang tidak cocok).
+"""
+import io
+import re
+
+import pandas as pd
+
+# naikkan bila deklarasi berubah supaya snapshot bertipe lama tidak dipakai
+VERSION = 3
+
+# kolom bulanan Program: "Januari 2024" / "januari_2024"
+PERIOD_PATTERN = (r"^(januari|februari|maret|april|mei|juni|juli|agustus|september|"
+                  r"oktober|november|desember)[ _]\d{4}$")
+
+
+def key(name) -> str:
+    return re.sub(r"[^0-9a-z]+", "", str(name).lower())
+
+
+def parse_number(s: pd.Series, decimal: str = ",") -> pd.Series:
+    """Teks angka -> float64.
+
+    Bila ada dua jenis pemisah, yang terakhir adalah desimal ("1.234,5", "1,234.5").
+    Satu pemisah tunggal dianggap desimal bila berupa titik (format angka asli gviz)
+    atau sama dengan ``decimal``; pemisah yang muncul berulang adalah ribuan.
+    """
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype("float64")
+    s = s.astype("string").str.replace(r"\s", "", regex=True)
+    last_comma, last_dot = s.str.rfind(","), s.str.rfind(".")
+    n_comma, n_dot = s.str.count(","), s.str.count(r"\.")
+    comma_dec = ((last_comma > last_dot) & n_comma.eq(1)
+                 & (n_dot.gt(0) | (decimal == ","))).fillna(False)
+    dot_dec = ((last_dot > last_comma) & n_dot.eq(1)).fillna(False)
+
+    out = s.str.replace(r"[.,]", "", regex=True)
+    out = out.mask(dot_dec, s.str.replace(",", "", regex=False))
+    out = out.mask(comma_dec, s.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    return pd.to_numeric(out, errors="coerce").astype("float64")
+
+
+# format tanggal export gviz (hari lebih dulu); dicoba berurutan sebelum inferensi
+DATE_FORMATS = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y", "%d/%m/%Y %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d")
+
+
+def parse_date(s: pd.Series, formats=DATE_FORMATS) -> pd.Series:
+    """Teks tanggal -> datetime64.
+
+    Format pertama dicoba ke seluruh kolom (jalur cepat); format lain hanya ke
+    baris yang belum ter-parse, dan sisa terakhir (format campuran) baru di-parse
+    dengan inferensi ``dayfirst=True``.
+    """
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    out = pd.to_datetime(s, format=formats[0], errors="coerce")
+    rest = s[out.isna() & s.notna()]
+    if rest.empty:
+        return out
+    rest = rest.str.strip()
+    rest = rest[rest.ne("")]
+    for fmt in [*formats, None]:
+        if rest.empty:
+            break
+        if fmt is None:
+            parsed = pd.to_datetime(rest, dayfirst=True, errors="coerce")
+        else:
+            parsed = pd.to_datetime(rest, format=fmt, errors="coerce")
+        ok = parsed.notna()
+        out[parsed.index[ok]] = parsed[ok]
+        rest = rest[~ok]
+    return out
+
+
+class Schema:
+    """Deklarasi satu sheet.
+
+    ``columns`` None berarti semua kolom dibaca; selain itu hanya kolom tersebut
+    ditambah kolom yang cocok ``numeric_pattern`` (mis. kolom bulanan Program).
+    Kolom yang tidak disebut di ``numeric``/``integer`` tetap teks.
+    """
+
+    def __init__(self, columns=None, numeric=(), integer=(), categorical=(), dates=(),
+                 numeric_pattern=None, decimal=","):
+        self.columns = None if columns is None else {key(c) for c in columns}
+        self.numeric = {key(c) for c in numeric}
+        self.integer = {key(c) for c in integer}
+        self.categorical = {key(c) for c in categorical}
+        self.dates = {key(c) for c in dates}
+        self.numeric_pattern = re.compile(numeric_pattern, re.I) if numeric_pattern else None
+        self.decimal = decimal
+
+    def _is_pattern(self, name) -> bool:
+        return self.numeric_pattern is not None and bool(self.numeric_pattern.match(str(name).strip()))
+
+    def keeps(self, name) -> bool:
+        return self.columns is None or key(name) in self.columns or self._is_pattern(name)
+
+    def kind(self, name) -> str:
+        k = key(name)
+        if k in self.integer:
+            return "integer"
+        if k in self.numeric or self._is_pattern(name):
+            return "numeric"
+        if k in self.dates:
+            return "date"
+        return "category" if k in self.categorical else "text"
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Konversi tipe kolom hasil ``read_csv(dtype=str)`` sesuai deklarasi."""
+        for c in df.columns:
+            kind = self.kind(c)
+            if kind == "numeric":
+                df[c] = parse_number(df[c], self.decimal)
+            elif kind == "integer":
+                df[c] = parse_number(df[c], self.decimal).round().astype("Int32")
+            elif kind == "date":
+                df[c] = parse_date(df[c])
+            elif kind == "category":
+                df[c] = df[c].str.strip()
+        return df
+
+
+SCHEMAS = {
+    "Timbulan": Schema(
+        columns=["Site", "Perusahaan", "Tahun", "jenis_timbulan", "jenis_sampah",
+                 "Timbulan", "Man Power", "data_input_total", "Kapasitas", "Kapasitas.1"],
+        numeric=["Timbulan", "Man Power", "data_input_total", "Kapasitas", "Kapasitas.1"],
+        integer=["Tahun"],
+        categorical=["Site", "Perusahaan", "jenis_timbulan", "jenis_sampah"],
+    ),
+    "Program": Schema(
+        columns=["Site", "Perusahaan", "Tahun", "Nama program", "Kategori", "jenis_sampah",
+                 "sub_jenis_sampah", "Total_calc"],
+        numeric=["Total_calc"],
+        integer=["Tahun"],
+        categorical=["Site", "Perusahaan", "Kategori", "jenis_sampah", "sub_jenis_sampah"],
+        numeric_pattern=PERIOD_PATTERN,
+    ),
+    "Ketidaksesuaian": Schema(
+        categorical=["Site", "Perusahaan", "status_temuan", "kategori_subketidaksesuaian",
+                     "Sub Ketidaksesuaian"],
+        dates=["TanggalLapor"],
+    ),
+    "Survei_Online": Schema(
+        numeric=["2. Seberapa optimal program GBST berjalan selama ini di perusahaan Anda?"],
+    ),
+    "Survei_Offline": Schema(
+        numeric=["2. Seberapa optimal program GBST berjalan selama ini di perusahaan Anda?"],
+    ),
+    "CCTV": Schema(
+        # easting/northing campuran UTM dan derajat ("117.5°E") -> tetap teks
+        columns=["easting", "northing", "perusahaan", "site", "nama_titik_penaatan_ts", "coverage_cctv"],
+        categorical=["perusahaan", "site"],
+    ),
+    "Koordinat_UTM": Schema(
+        columns=["x", "y", "site", "company"],
+        numeric=["x", "y"],
+        categorical=["site", "company"],
+    ),
+    "Jml_CCTV": Schema(
+        columns=["Site", "Perusahaan", "Coverage 24jam", "Coverage non 24jam", "Tidak tercover",
+                 "Total CCTV"],
+        integer=["Coverage 24jam", "Coverage non 24jam", "Tidak tercover", "Total CCTV"],
+        categorical=["Site", "Perusahaan"],
+    ),
+    "Level_Jabatan": Schema(),
+}
+
+
+def read_csv(raw: bytes, sheet: str = None, prune: bool = True) -> pd.DataFrame:
+    """Parse export CSV gviz sesuai skema ``sheet``; sheet tanpa skema pakai inferensi pandas.
+
+    ``prune=False`` membaca semua kolom (dipakai untuk hasil query ``tq`` yang
+    kolomnya sudah dipilih halaman).
+    """
+    schema = SCHEMAS.get(sheet)
+    if schema is None:
+        return pd.read_csv(io.BytesIO(raw))
+    usecols = schema.keeps if prune and schema.columns is not None else None
+    df = pd.read_csv(io.BytesIO(raw), dtype=str, usecols=usecols)
+    return schema.apply(df)
@@ -0,0 +1,565 @@
+"""Loader Google Sheets GBST dengan cache se-proses (TTL + invalidasi eksplisit).
+
+Semua halaman memuat sheet lewat ``load_sheets`` (biasanya melalui deklarasi
+``gbst.datasets.PageData``) sehingga rerun Streamlit cukup membaca dictionary
+di memori, bukan mengunduh ulang tiap sheet.
+Saat cold start, sheet dilayani dari snapshot Parquet lokal (``gbst.snapshot``)
+lalu disegarkan dari Google di background.
+
+Data yang sudah lewat TTL tidak ditunggu ulang: rerun langsung memakai versi
+terakhir yang berhasil dimuat sementara versi baru diunduh di background
+(stale-while-revalidate). Thread ``Refresher`` menjaga cache tetap hangat dengan
+menyegarkan sheet secara berkala, jadi latensi halaman tidak bergantung pada
+kecepatan Google Sheets. Umur data ditampilkan di sidebar (``gbst.ui``).
+
+Halaman yang hanya butuh sebagian kolom/baris memberi ``gbst.gviz.Query`` per sheet;
+subset itu diminta langsung lewat parameter ``tq`` gviz dan di-cache terpisah.
+
+Sheet append-only (``APPEND_ONLY``) disegarkan dengan sinkron delta (``gbst.delta``):
+hanya baris baru yang diunduh, di-parse dan diturunkan kolomnya lalu ditempel ke
+frame yang sudah di cache.
+"""
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from gbst import delta, ketidaksesuaian, schema, snapshot
+from gbst.gviz import Query
+
+# ===============================
+# KONFIGURASI
+# ===============================
+SHEET_URL = "https://docs.google.com/spreadsheets/d/1cw3xMomuMOaprs8mkmj_qnib-Zp_9n68rYMgiRZZqBE/edit?usp=sharing"
+SHEET_ID = SHEET_URL.split("/")[5]
+
+# semua sheet yang dipakai main.py dan pages/*
+SHEET_NAMES = [
+    "Timbulan", "Program", "Ketidaksesuaian", "Survei_Online", "Survei_Offline",
+    "CCTV", "Koordinat_UTM", "Jml_CCTV", "Level_Jabatan",
+]
+
+# TTL cache dalam detik (bisa diubah lewat env GBST_CACHE_TTL atau configure())
+DEFAULT_TTL = float(os.environ.get("GBST_CACHE_TTL", "600"))
+
+# batas waktu per sheet (detik) dan jumlah worker unduh paralel
+FETCH_TIMEOUT = float(os.environ.get("GBST_FETCH_TIMEOUT", "30"))
+FETCH_WORKERS = int(os.environ.get("GBST_FETCH_WORKERS", "8"))
+
+# interval refresher background (detik); 0 = mati, sheet hanya disegarkan saat diakses
+REFRESH_INTERVAL = float(os.environ.get("GBST_REFRESH_INTERVAL", "300"))
+
+# GBST_SWR=0 -> data kedaluwarsa ditunggu sampai unduhan baru selesai (perilaku lama)
+STALE_WHILE_REVALIDATE = os.environ.get("GBST_SWR", "1") != "0"
+
+
+# endpoint gviz; bisa diarahkan ke server lokal (python -m gbst.gviz_stub) lewat env
+GVIZ_URL = os.environ.get("GBST_GVIZ_URL", f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/gviz/tq")
+
+# log yang hanya bertambah di bawah -> cukup sinkron ekornya
+APPEND_ONLY = {"Ketidaksesuaian"}
+
+# kolom turunan per baris, dihitung sekali saat sheet (atau baris barunya) dimuat
+DERIVE = {"Ketidaksesuaian": ketidaksesuaian.derive}
+
+# query header saja, untuk memetakan nama kolom ke huruf kolom gviz
+HEADER = Query(limit=0)
+
+# Copy-on-Write selalu aktif di pandas 3: sesi cukup memegang salinan dangkal frame
+# bersama, kolom disalin hanya bila sesi itu mengubahnya. requirements.txt mematok
+# pandas>=3; jalur pandas 2 (opsi CoW tidak dinyalakan global) hanya cadangan dan
+# menyalin penuh, jadi memori per sesi kembali O(frame).
+_PANDAS_MAJOR = int(pd.__version__.split(".")[0])
+COPY_ON_WRITE = _PANDAS_MAJOR >= 3
+
+
+def gviz_url(sheet: str, tq: str = None) -> str:
+    url = f"{GVIZ_URL}?tqx=out:csv&sheet={urllib.parse.quote(sheet)}"
+    if tq:
+        url += f"&tq={urllib.parse.quote(tq)}"
+    return url
+
+
+def fetch_raw(sheet: str, tq: str = None, timeout: float = FETCH_TIMEOUT) -> bytes:
+    """Unduh export CSV gviz satu sheet (atau hasil query ``tq``) apa adanya."""
+    with urllib.request.urlopen(gviz_url(sheet, tq), timeout=timeout) as resp:
+        return resp.read()
+
+
+def parse_csv(raw: bytes, sheet: str = None, prune: bool = True) -> pd.DataFrame:
+    """Parse CSV sesuai skema sheet (``gbst.schema``): tipe kolom dan kolom yang dibaca."""
+    return schema.read_csv(raw, sheet, prune=prune)
+
+
+def derive(sheet: str, df: pd.DataFrame) -> pd.DataFrame:
+    fn = DERIVE.get(sheet)
+    return df if fn is None else fn(df)
+
+
+def fetch_sheet(sheet: str, query: Query = None, timeout: float = FETCH_TIMEOUT) -> tuple:
+    """Unduh + parse satu sheet (atau subsetnya). Mengembalikan ``(DataFrame, versi_data)``."""
+    if query is None:
+        raw = fetch_raw(sheet, timeout=timeout)
+        return derive(sheet, parse_csv(raw, sheet)), snapshot.data_version(raw)
+
+    # sheet penuh sudah ada di memori -> subset cukup diambil lokal; kecuali header:
+    # frame penuh sudah dipangkas skema, huruf kolom gviz harus dari header asli
+    full = None if query.key() == HEADER.key() else _cache.cached(sheet)
+    header = None
+    if full is None and query.needs_header:
+        header = sheet_columns(sheet)
+    tq = None if full is not None else query.to_tq(header)
+
+    if tq is None:
+        # query tidak bisa dinyatakan di gviz: pakai sheet penuh lalu saring lokal
+        if full is None:
+            full = _cache.get(sheet)
+        return query.apply(full), _cache.version(sheet)
+
+    raw = fetch_raw(sheet, tq, timeout=timeout)
+    df = parse_csv(raw, sheet, prune=False)
+    # gviz memberi label header asli; samakan dengan nama versi pandas (mis. "Kapasitas.1")
+    cols = query.columns(header) if header is not None else None
+    if cols is not None and len(cols) == df.shape[1]:
+        df.columns = cols
+    return df, snapshot.data_version(raw)
+
+
+def fetch_append(sheet: str, base=None, state: dict = None, timeout: float = FETCH_TIMEOUT) -> tuple:
+    """Sinkron sheet append-only dari frame ``base`` (versi, state delta) yang sudah dimiliki.
+
+    ``base`` berupa ``(DataFrame, versi)`` atau None. Mengembalikan
+    ``(DataFrame, versi, state, jumlah_baris_baru)``; jumlah None berarti sheet
+    diunduh penuh. Versi delta = hash versi lama + ekor yang diunduh.
+    """
+    query = delta.tail_query(state) if base is not None else None
+    if query is not None:
+        raw = fetch_raw(sheet, query.to_tq(), timeout=timeout)
+        res = delta.read_tail(raw, state)
+        if res is not None:
+            n_new, state = res
+            df, version = base
+            if n_new:
+                # baris pertama hasil query adalah jangkar yang sudah ada di ``df``
+                tail = derive(sheet, parse_csv(raw, sheet).iloc[1:].reset_index(drop=True))
+                df = pd.concat([df, tail], ignore_index=True)
+                version = snapshot.data_version(version.encode("utf-8") + raw)
+            return df, version, state, n_new
+
+    raw = fetch_raw(sheet, timeout=timeout)
+    df = derive(sheet, parse_csv(raw, sheet))
+    return df, snapshot.data_version(raw), delta.state_from_raw(raw), None
+
+
+def session_copy(df: pd.DataFrame) -> pd.DataFrame:
+    """Salinan untuk satu sesi: dangkal (berbagi data) bila Copy-on-Write aktif, selain itu penuh."""
+    return df.copy(deep=not COPY_ON_WRITE)
+
+
+def cache_key(sheet: str, query: Query = None) -> str:
+    """Kunci cache/snapshot: nama sheet, ditambah hash query bila berupa subset."""
+    return sheet if query is None else f"{sheet}@{query.digest()}"
+
+
+# ===============================
+# CACHE SE-PROSES
+# ===============================
+class SheetCache:
+    """Cache DataFrame per nama sheet, berlaku untuk semua sesi di proses ini."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, loader=fetch_sheet):
+        self.ttl = ttl
+        self.loader = loader
+        self.use_snapshot = snapshot.ENABLED
+        self.stale_while_revalidate = STALE_WHILE_REVALIDATE
+        self._frames = {}        # kunci -> (DataFrame, waktu load, versi, sumber)
+        self._stats = {}         # kunci -> dict hit/miss/timing
+        self._lock = threading.Lock()
+        self._sheet_locks = {}   # satu lock per sheet agar tidak double download
+        self._seen = set()       # sheet yang sudah pernah dimuat di proses ini
+        self._delta = {}         # kunci -> state sinkron delta (sheet append-only)
+        self._origin = {}        # kunci -> (sheet, query), untuk refresh di background
+        self._refreshing = set() # kunci yang sedang diunduh ulang di background
+
+    def _stat(self, sheet: str) -> dict:
+        return self._stats.setdefault(sheet, {
+            "hits": 0, "stale_hits": 0, "misses": 0, "loads": 0,
+            "last_load_s": None, "total_load_s": 0.0, "loaded_at": None, "fetched_at": None,
+            "version": None, "source": None, "error": None, "delta_rows": None,
+        })
+
+    def _fresh(self, sheet: str):
+        entry = self._frames.get(sheet)
+        if entry is None:
+            return None
+        df, loaded_at = entry[0], entry[1]
+        if self.ttl is not None and time.time() - loaded_at > self.ttl:
+            return None
+        return df
+
+    def _store(self, sheet: str, df: pd.DataFrame, version: str, source: str, elapsed: float,
+               delta_rows: int = None, fetched_at: float = None):
+        """Simpan frame; ``fetched_at`` = kapan data diambil dari Google (default sekarang)."""
+        with self._lock:
+            self._frames[sheet] = (df, time.time(), version, source)
+            self._seen.add(sheet)
+            st_ = self._stat(sheet)
+            st_["loads"] += 1
+            st_["last_load_s"] = elapsed
+            st_["total_load_s"] += elapsed
+            st_["loaded_at"] = time.time()
+            st_["fetched_at"] = fetched_at or st_["loaded_at"]
+            st_["version"] = version
+            st_["source"] = source
+            st_["error"] = None
+            st_["delta_rows"] = delta_rows
+
+    def _sheet_lock(self, sheet: str) -> threading.Lock:
+        with self._lock:
+            return self._sheet_locks.setdefault(sheet, threading.Lock())
+
+    def cached(self, sheet: str, query: Query = None, stale: bool = False):
+        """DataFrame yang masih segar (dihitung sebagai hit), atau None.
+
+        ``stale=True``: frame yang sudah lewat TTL tetap dikembalikan dan versi
+        barunya diunduh di background (stale-while-revalidate).
+        """
+        key = cache_key(sheet, query)
+        revalidate = False
+        with self._lock:
+            df = self._fresh(key)
+            if df is not None:
+                self._stat(key)["hits"] += 1
+            elif stale and key in self._frames:
+                df = self._frames[key][0]
+                self._stat(key)["stale_hits"] += 1
+                revalidate = True
+        if revalidate:
+            self.revalidate(sheet, query)
+        return df
+
+    def get(self, sheet: str, query: Query = None) -> pd.DataFrame:
+        df = self.cached(sheet, query, stale=self.stale_while_revalidate)
+        if df is not None:
+            return df
+
+        key = cache_key(sheet, query)
+        with self._sheet_lock(key):
+            # sesi lain mungkin sudah memuatnya selama kita menunggu lock
+            with self._lock:
+                df = self._fresh(key)
+                if df is not None:
+                    self._stat(key)["hits"] += 1
+                    return df
+                self._stat(key)["misses"] += 1
+                self._origin[key] = (sheet, query)
+                cold = key not in self._seen
+
+            # cold start: layani snapshot lokal dulu, segarkan di background
+            if cold and self.use_snapshot:
+                t0 = time.perf_counter()
+                snap = snapshot.read_latest(key)
+                if snap is not None and snap[1].get("schema") != schema.VERSION:
+                    snap = None   # snapshot ditulis dengan skema/tipe lama
+                if snap is not None:
+                    df, meta = snap
+                    if query is None:
+                        # snapshot lama mungkin belum punya kolom turunan
+                        df = derive(sheet, df)
+                    self._delta[key] = meta.get("delta")
+                    self._store(key, df, meta["version"], "snapshot", time.perf_counter() - t0,
+                                fetched_at=meta.get("fetched_at"))
+                    self.revalidate(sheet, query)
+                    return df
+
+            if snapshot.FROZEN:
+                raise FileNotFoundError(f"snapshot sheet {key} belum ada (mode beku GBST_FROZEN=1)")
+            return self._load(sheet, query)
+
+    def _load(self, sheet: str, query: Query = None) -> pd.DataFrame:
+        key = cache_key(sheet, query)
+        self._origin[key] = (sheet, query)
+        t0 = time.perf_counter()
+        n_new = None
+        if query is None and sheet in APPEND_ONLY:
+            entry = self._frames.get(key)
+            base = None if entry is None or entry[2] is None else (entry[0], entry[2])
+            df, version, state, n_new = fetch_append(sheet, base, self._delta.get(key))
+            self._delta[key] = state
+        else:
+            df, version = self.loader(sheet, query)
+        source = "google" if n_new is None else "delta"
+        self._store(key, df, version, source, time.perf_counter() - t0, delta_rows=n_new)
+        if self.use_snapshot:
+            try:
+                extra = {"schema": schema.VERSION}
+                if key in self._delta:
+                    extra["delta"] = self._delta[key]
+                snapshot.write(key, version, df, extra=extra)
+            except Exception as e:
+                with self._lock:
+                    self._stat(key)["error"] = f"snapshot: {e}"
+        return df
+
+    def refresh(self, sheet: str, query: Query = None):
+        """Unduh ulang dari Google; bila gagal, data lama tetap dipakai."""
+        key = cache_key(sheet, query)
+        with self._sheet_lock(key):
+            try:
+                self._load(sheet, query)
+            except Exception as e:
+                with self._lock:
+                    self._stat(key)["error"] = str(e)
+
+    def revalidate(self, sheet: str, query: Query = None):
+        """Jadwalkan ``refresh`` di pool unduh tanpa menunggu; satu antrean per kunci."""
+        if snapshot.FROZEN:
+            return
+        key = cache_key(sheet, query)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.refresh(sheet, query)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        _executor.submit(run)
+
+    def refresh_due(self, max_age: float) -> int:
+        """Segarkan di background semua kunci yang dimuat lebih dari ``max_age`` detik lalu."""
+        now = time.time()
+        with self._lock:
+            due = [self._origin[k] for k, entry in self._frames.items()
+                   if k in self._origin and now - entry[1] >= max_age]
+        for sheet, query in due:
+            self.revalidate(sheet, query)
+        return len(due)
+
+    def status(self, keys) -> dict:
+        """Umur data tertua (detik sejak diambil dari Google) di antara ``keys``."""
+        now = time.time()
+        with self._lock:
+            fetched = [self._stats[k]["fetched_at"] for k in keys
+                       if k in self._stats and self._stats[k]["fetched_at"] is not None]
+            refreshing = any(k in self._refreshing for k in keys)
+        age = None if not fetched else now - min(fetched)
+        return {
+            "age_s": age,
+            "refreshing": refreshing,
+            "stale": age is not None and self.ttl is not None and age > self.ttl,
+        }
+
+    def version(self, sheet: str, query: Query = None):
+        entry = self._frames.get(cache_key(sheet, query))
+        return None if entry is None else entry[2]
+
+    def invalidate(self, sheet: str = None):
+        """Buang cache satu sheet (beserta subset query-nya), atau semua sheet bila ``sheet`` kosong."""
+        with self._lock:
+            if sheet is None:
+                self._frames.clear()
+                self._seen.clear()
+                self._delta.clear()
+            else:
+                for key in [k for k in self._frames if k == sheet or k.startswith(f"{sheet}@")]:
+                    self._frames.pop(key)
+                    # state delta menunjuk jangkar frame yang dibuang -> mulai dari unduhan penuh
+                    self._seen.discard(key)
+                    self._delta.pop(key, None)
+
+    def frames(self) -> dict:
+        """``{kunci: (DataFrame, versi)}`` yang sedang dipegang cache (frame bersama, jangan diubah)."""
+        with self._lock:
+            return {k: (e[0], e[2]) for k, e in sorted(self._frames.items())}
+
+    def stats(self) -> pd.DataFrame:
+        now = time.time()
+        with self._lock:
+            rows = [
+                {
+                    "sheet": sheet,
+                    "hits": s["hits"],
+                    "stale_hits": s["stale_hits"],
+                    "misses": s["misses"],
+                    "loads": s["loads"],
+                    "last_load_ms": None if s["last_load_s"] is None else round(s["last_load_s"] * 1000, 1),
+                    "total_load_ms": round(s["total_load_s"] * 1000, 1),
+                    "age_s": None if s["fetched_at"] is None else round(now - s["fetched_at"], 1),
+                    "source": s["source"],
+                    "delta_rows": s["delta_rows"],
+                    "version": s["version"],
+                    "error": s["error"],
+                    "refreshing": sheet in self._refreshing,
+                }
+                for sheet, s in sorted(self._stats.items())
+            ]
+        return pd.DataFrame(rows, columns=["sheet", "hits", "stale_hits", "misses", "loads",
+                                           "last_load_ms", "total_load_ms", "age_s", "source",
+                                           "delta_rows", "version", "error", "refreshing"])
+
+
+_cache = SheetCache()
+
+# pool unduh dibagi semua sesi supaya jumlah koneksi ke Google tetap terbatas
+_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="gbst-fetch")
+
+
+class Refresher(threading.Thread):
+    """Thread daemon yang menyegarkan sheet di cache setiap ``interval`` detik.
+
+    Unduhan sendiri berjalan di ``_executor``; thread ini hanya menjadwalkan,
+    jadi sesi pengguna tidak pernah ikut menunggu Google.
+    """
+
+    def __init__(self, cache: SheetCache, interval: float = REFRESH_INTERVAL):
+        super().__init__(name="gbst-refresher", daemon=True)
+        self.cache = cache
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        # cek lebih rapat dari interval supaya umur data maksimal ~1.25x interval
+        tick = max(self.interval / 4, 1.0)
+        while not self._stopped.wait(tick):
+            try:
+                self.cache.refresh_due(self.interval)
+            except Exception:
+                pass   # refresher tidak boleh mati karena satu putaran gagal
+
+    def stop(self):
+        self._stopped.set()
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def start_refresher(interval: float = REFRESH_INTERVAL):
+    """Jalankan refresher background (sekali per proses). Tidak aktif di mode beku."""
+    global _refresher
+    if snapshot.FROZEN or not interval or interval <= 0:
+        return None
+    with _refresher_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = Refresher(_cache, interval)
+            _refresher.start()
+        return _refresher
+
+
+def stop_refresher():
+    global _refresher
+    with _refresher_lock:
+        if _refresher is not None:
+            _refresher.stop()
+            _refresher = None
+
+
+def configure(ttl: float = None):
+    """Ubah TTL cache proses (None = tidak pernah kedaluwarsa)."""
+    _cache.ttl = ttl
+
+
+def load_sheet(sheet: str, query: Query = None) -> pd.DataFrame:
+    """Ambil satu sheet dari cache; salinan dikembalikan agar halaman bebas memodifikasi."""
+    return session_copy(_cache.get(sheet, query))
+
+
+def sheet_columns(sheet: str) -> list:
+    """Semua nama kolom sheet sesuai ``pd.read_csv``, berurutan (tanpa mengunduh isinya).
+
+    Selalu lewat query ``limit 0`` ke server, tidak pernah dari frame penuh di cache,
+    karena frame itu sudah dipangkas skema dan diberi kolom turunan.
+    """
+    return list(_cache.get(sheet, HEADER).columns)
+
+
+def load_sheets(sheet_names, parallel: bool = True, timeout: float = FETCH_TIMEOUT,
+                use_snapshot: bool = True, queries: dict = None) -> tuple:
+    """Ambil beberapa sheet sekaligus.
+
+    Sheet yang belum ada di cache diunduh bersamaan di pool worker terbatas,
+    jadi cold start kira-kira selama sheet paling lambat, bukan jumlah semuanya.
+    ``timeout`` berlaku per sheet. ``use_snapshot=False`` memaksa unduh dari Google.
+    ``queries`` (opsional) berisi ``{sheet: Query}`` untuk sheet yang cukup diambil sebagian.
+    Sheet yang sudah lewat TTL langsung dikembalikan versi terakhirnya dan
+    disegarkan di background; hanya sheet yang belum pernah dimuat yang ditunggu.
+
+    Mengembalikan ``(all_df, errors)``: sheet yang gagal berisi DataFrame kosong
+    dan pesan errornya ada di ``errors`` untuk ditampilkan halaman.
+    """
+    sheet_names = list(sheet_names)
+    queries = queries or {}
+    all_df, errors = {}, {}
+    start_refresher()
+
+    if not use_snapshot:
+        for sheet in sheet_names:
+            _cache.invalidate(sheet)
+    get = _cache.get if use_snapshot else _cache._load
+
+    pending = {}
+    for sheet in sheet_names:
+        query = queries.get(sheet)
+        df = _cache.cached(sheet, query, stale=use_snapshot and _cache.stale_while_revalidate)
+        if df is not None:
+            all_df[sheet] = session_copy(df)
+        elif parallel:
+            pending[sheet] = _executor.submit(get, sheet, query)
+        else:
+            try:
+                all_df[sheet] = session_copy(get(sheet, query))
+            except Exception as e:
+                errors[sheet] = e
+
+    if pending:
+        # loader sendiri sudah memakai timeout socket; batas ini untuk antrean pool
+        wait(pending.values(), timeout=timeout * max(1, -(-len(pending) // FETCH_WORKERS)))
+        for sheet, fut in pending.items():
+            if not fut.done():
+                errors[sheet] = TimeoutError(f"melebihi batas waktu {timeout:.0f} detik")
+                continue
+            try:
+                all_df[sheet] = session_copy(fut.result())
+            except Exception as e:
+                errors[sheet] = e
+
+    # urutan hasil mengikuti urutan permintaan; sheet gagal -> DataFrame kosong
+    return {sheet: all_df.get(sheet, pd.DataFrame()) for sheet in sheet_names}, errors
+
+
+def data_version(sheet: str, query: Query = None):
+    """Versi data (hash CSV) sheet yang sedang ada di cache, atau None."""
+    return _cache.version(sheet, query)
+
+
+def data_status(sheet_names, queries: dict = None) -> dict:
+    """Umur data tertua sheet-sheet sebuah halaman, untuk penanda di sidebar.
+
+    Mengembalikan ``{"age_s", "refreshing", "stale"}``; ``stale`` berarti umur
+    data melewati TTL (refresh background belum berhasil).
+    """
+    queries = queries or {}
+    return _cache.status([cache_key(s, queries.get(s)) for s in sheet_names])
+
+
+def invalidate(sheet: str = None):
+    _cache.invalidate(sheet)
+
+
+def cached_frames() -> dict:
+    """Frame mentah bersama di cache proses: ``{kunci: (DataFrame, versi)}``."""
+    return _cache.frames()
+
+
+def cache_stats() -> pd.DataFrame:
+    """Statistik per sheet: hit/miss cache, durasi load (ms), sumber dan versi data."""
+    return _cache.stats()
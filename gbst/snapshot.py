@@ -0,0 +1,128 @@
+"""Snapshot kolumnar (Parquet) per sheet, dikunci dengan versi data.
+
+Setiap sheet yang berhasil diunduh disimpan ke ``<GBST_SNAPSHOT_DIR>/<sheet>/<versi>.parquet``
+dengan versi = hash isi CSV. Saat cold start dashboard membaca snapshot terakhir
+(milidetik) lalu menyegarkan dari Google di background.
+
+Mode beku (``GBST_FROZEN=1``) hanya membaca snapshot dan tidak pernah
+menghubungi Google, untuk benchmark dengan dataset yang tetap.
+
+Membuat / menyegarkan snapshot semua sheet::
+
+    python -m gbst.snapshot
+"""
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (engine parquet pandas)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+SNAPSHOT_DIR = os.environ.get("GBST_SNAPSHOT_DIR", ".gbst_snapshots")
+ENABLED = HAS_PYARROW and os.environ.get("GBST_SNAPSHOT", "1") != "0"
+FROZEN = os.environ.get("GBST_FROZEN", "0") == "1"
+KEEP_VERSIONS = 3
+
+
+def data_version(raw: bytes) -> str:
+    """Versi data = 12 karakter awal sha1 dari isi CSV mentah."""
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def _sheet_dir(sheet: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, sheet)
+
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Samakan tipe supaya bisa ditulis ke Parquet (nama kolom str, kolom object seragam)."""
+    df = df.copy()
+    df.columns = df.columns.astype(str)
+    for c in df.columns[df.dtypes == object]:
+        s = df[c]
+        if not s.dropna().map(type).eq(str).all():
+            df[c] = s.where(s.isna(), s.astype(str))
+    return df
+
+
+def write(sheet: str, version: str, df: pd.DataFrame, fetched_at: float = None,
+          extra: dict = None) -> str:
+    """Tulis snapshot secara atomik lalu perbarui penunjuk ``latest.json``.
+
+    ``extra`` (opsional) ikut disimpan di ``latest.json``, mis. state sinkron delta.
+    """
+    d = _sheet_dir(sheet)
+    os.makedirs(d, exist_ok=True)
+    path = os.path.join(d, f"{version}.parquet")
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        normalize(df).to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    meta = {"sheet": sheet, "version": version, "rows": len(df),
+            "fetched_at": fetched_at or time.time(), **(extra or {})}
+    tmp = os.path.join(d, f"latest.json.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(d, "latest.json"))
+    _prune(sheet, keep=version)
+    return path
+
+
+def latest_meta(sheet: str):
+    try:
+        with open(os.path.join(_sheet_dir(sheet), "latest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_latest(sheet: str):
+    """``(DataFrame, meta)`` dari snapshot terakhir, atau None bila belum ada."""
+    meta = latest_meta(sheet)
+    if meta is None:
+        return None
+    try:
+        df = pd.read_parquet(os.path.join(_sheet_dir(sheet), f"{meta['version']}.parquet"))
+    except (OSError, ValueError):
+        return None
+    return df, meta
+
+
+def _prune(sheet: str, keep: str):
+    """Sisakan ``KEEP_VERSIONS`` file versi terbaru."""
+    d = _sheet_dir(sheet)
+    files = sorted(
+        (f for f in os.listdir(d) if f.endswith(".parquet")),
+        key=lambda f: os.path.getmtime(os.path.join(d, f)),
+        reverse=True,
+    )
+    for f in files[KEEP_VERSIONS:]:
+        if f != f"{keep}.parquet":
+            try:
+                os.remove(os.path.join(d, f))
+            except OSError:
+                pass
+
+
+def main():
+    from gbst.sheets import SHEET_NAMES, load_sheets
+
+    if not HAS_PYARROW:
+        raise SystemExit("pyarrow belum terpasang, snapshot tidak bisa ditulis.")
+    _, errors = load_sheets(SHEET_NAMES, use_snapshot=False)
+    for sheet in SHEET_NAMES:
+        meta = latest_meta(sheet)
+        if sheet in errors or meta is None:
+            print(f"{sheet:16s} GAGAL: {errors.get(sheet, 'snapshot tidak tertulis')}")
+        else:
+            print(f"{sheet:16s} versi {meta['version']}  {meta['rows']} baris")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Komponen Streamlit kecil yang dipakai bersama main.py dan semua halaman."""
+import streamlit as st
+
+from gbst import filter_state, presets
+from gbst.sheets import data_status
+
+
+def format_age(seconds: float) -> str:
+    if seconds < 60:
+        return "baru saja"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} menit lalu"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} jam lalu"
+    return f"{int(seconds // 86400)} hari lalu"
+
+
+def sidebar_data_age(sheet_names, queries: dict = None):
+    """Tampilkan umur data sheet halaman ini di sidebar (peringatan bila lewat TTL)."""
+    status = data_status(sheet_names, queries)
+    if status["age_s"] is None:
+        return
+    text = f"🕒 Data Google Sheets diperbarui {format_age(status['age_s'])}"
+    if status["refreshing"]:
+        text += " · sedang memperbarui…"
+    if status["stale"]:
+        st.sidebar.warning(text)
+    else:
+        st.sidebar.caption(text)
+
+
+# ===============================
+# PANEL FILTER SIDEBAR (BATCH)
+# ===============================
+def _widget_key(key: str, field: str) -> str:
+    return f"{key}:{field}"
+
+
+def _applied(key: str, options: dict) -> dict:
+    # filter global dari gbst.filter_state, filter lain milik halaman ``key`` saja
+    local = st.session_state.get(f"{key}:local", {})
+    out = {}
+    for f, opts in options.items():
+        if f in filter_state.FIELDS:
+            out[f] = filter_state.resolve(f, opts)
+        else:
+            selected = local.get(f)
+            out[f] = list(opts) if selected is None else [v for v in selected if v in opts]
+    return out
+
+
+def _store(key: str, options: dict, selections: dict):
+    shown = _applied(key, options)
+    local = dict(st.session_state.get(f"{key}:local", {}))
+    changed = {}
+    for f, selected in selections.items():
+        selected = list(selected)
+        if set(map(str, selected)) == set(map(str, shown[f])):
+            continue    # tidak diubah di halaman ini -> nilai di luar opsi halaman tetap tersimpan
+        value = None if set(selected) == set(options[f]) else selected
+        if f in filter_state.FIELDS:
+            changed[f] = value
+        else:
+            local[f] = value
+    st.session_state[f"{key}:local"] = local
+    if changed:
+        filter_state.update(**changed)
+
+
+def _set_selection(key: str, options: dict, selections: dict):
+    # isi widget dan pilihan yang berlaku sekaligus -> satu rerun
+    _store(key, options, selections)
+    for f, selected in _applied(key, options).items():
+        st.session_state[_widget_key(key, f)] = selected
+
+
+def _submit(key: str, options: dict):
+    _store(key, options, {f: st.session_state[_widget_key(key, f)] for f in options})
+
+
+def _apply_preset(key: str, options: dict):
+    name = st.session_state.get(f"{key}:preset")
+    spec = presets.load().get(name)
+    if spec is not None:
+        _set_selection(key, options, presets.resolve(spec, options))
+    st.session_state[f"{key}:preset"] = None
+
+
+def filter_panel(fields: dict, key: str = "filter") -> dict:
+    """Filter multiselect di sidebar yang baru berlaku setelah tombol "Terapkan".
+
+    ``fields`` = ``{filter: (label, opsi)}``. Mengubah beberapa multiselect tidak
+    memicu rerun per klik; semua pilihan dikirim sekaligus lewat ``st.form``.
+    Filter site/perusahaan/tahun/bulan adalah filter global (``gbst.filter_state``):
+    terbawa ke halaman lain dan ke URL. Filter lain hanya berlaku di halaman ``key``.
+    Preset (``gbst.presets``) dimuat dalam satu langkah. Default: semua opsi.
+    Mengembalikan ``{filter: list terpilih}`` yang sedang berlaku di halaman ini.
+    """
+    options = {f: list(opts) for f, (_, opts) in fields.items()}
+    filter_state.sync_url()
+    applied = _applied(key, options)
+    for f, selected in applied.items():
+        wkey = _widget_key(key, f)
+        # state widget dibuang Streamlit saat pindah halaman -> isi ulang dari pilihan global;
+        # opsi bisa berubah antar versi data -> buang nilai yang sudah tidak ada
+        current = st.session_state.get(wkey, selected)
+        st.session_state[wkey] = [v for v in current if v in options[f]]
+
+    available = presets.load()
+    if available:
+        st.sidebar.selectbox("Preset filter", list(available), index=None, placeholder="Pilih preset…",
+                             key=f"{key}:preset", on_change=_apply_preset, args=(key, options))
+
+    with st.sidebar.form(f"{key}:form"):
+        for f, (label, _) in fields.items():
+            st.multiselect(label, options[f], key=_widget_key(key, f))
+        col_apply, col_reset = st.columns(2)
+        col_apply.form_submit_button("Terapkan", type="primary", use_container_width=True,
+                                     on_click=_submit, args=(key, options))
+        col_reset.form_submit_button("Semua", use_container_width=True,
+                                     on_click=_set_selection, args=(key, options, options))
+    applied = _applied(key, options)
+
+    with st.sidebar.expander("Simpan sebagai preset"):
+        name = st.text_input("Nama preset", key=f"{key}:preset_name")
+        if st.button("Simpan", key=f"{key}:preset_save", disabled=not name.strip()):
+            try:
+                presets.save(name.strip(), applied, options)
+                st.success(f"Preset '{name.strip()}' disimpan.")
+            except OSError as e:
+                st.error(f"Gagal menyimpan preset: {e}")
+    return applied
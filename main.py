@@ -2,10 +2,14 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from pyproj import Transformer
 import folium
-from streamlit_folium import st_folium
-import calendar, re, math
+import streamlit.components.v1 as components
+import calendar, math
+
+from gbst import aggregates, companies, dimensions, filters, geo, maps, periods, results
+from gbst.datasets import PageData, memory_report
+from gbst.sheets import cache_stats, invalidate
+from gbst.ui import filter_panel, sidebar_data_age
 
 # ===============================
 # CONFIG DASHBOARD
@@ -25,71 +29,32 @@ st.markdown(
 # ===============================
 # UTILITIES
 # ===============================
-def norm_cols(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = df.columns.astype(str).str.strip().str.lower().str.replace(" ", "_")
-    return df
-
-def company_to_code(s: pd.Series) -> pd.Series:
-    return (
-        s.astype(str).str.upper().str.replace(r"[^A-Z ]", "", regex=True)
-         .str.split().apply(lambda t: t[-1] if len(t) else "")
-    )
-
 def fmt_num(x: float) -> str:
     """Bulatkan cantik: kalau integer tampil 0 desimal, selain itu 2 desimal."""
     if pd.isna(x): return "0"
     return f"{x:,.0f}" if float(x).is_integer() else f"{x:,.2f}"
 
-# ===============================
-# PARSER KOORDINAT (UTM -> WGS84)
-# ===============================
-transformer = Transformer.from_crs("EPSG:32650", "EPSG:4326", always_xy=True)
-def parse_coord(easting, northing):
-    try:
-        e = float(str(easting).replace("°E","").replace("E","").strip())
-        n = float(str(northing).replace("°N","").replace("N","").strip())
-    except:
-        return None, None
-    if e <= 180 and n <= 90:     # decimal degrees
-        return e, n
-    if e > 100000 and n > 100000:  # UTM
-        lon, lat = transformer.transform(e, n)
-        return lon, lat
-    return None, None
-
 # ===============================
 # LOAD DATA GOOGLE SHEETS
 # ===============================
-sheet_url = "https://docs.google.com/spreadsheets/d/1cw3xMomuMOaprs8mkmj_qnib-Zp_9n68rYMgiRZZqBE/edit?usp=sharing"
-sheet_id = sheet_url.split("/")[5]
 sheet_names = ["Timbulan","Program","Ketidaksesuaian","Survei_Online","Survei_Offline","CCTV","Koordinat_UTM"]
 
-all_df = {}
-for sheet in sheet_names:
-    try:
-        url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet}"
-        df = pd.read_csv(url)
-        all_df[sheet] = df
-    except Exception as e:
-        st.error(f"Gagal load sheet {sheet}: {e}")
-        all_df[sheet] = pd.DataFrame()
-
-# Normalisasi
-df_timbulan      = norm_cols(all_df.get("Timbulan", pd.DataFrame()))
-df_program       = norm_cols(all_df.get("Program", pd.DataFrame()))
-df_ketidaksesuaian = norm_cols(all_df.get("Ketidaksesuaian", pd.DataFrame()))
-df_online        = norm_cols(all_df.get("Survei_Online", pd.DataFrame()))
-df_offline       = norm_cols(all_df.get("Survei_Offline", pd.DataFrame()))
-df_cctv          = norm_cols(all_df.get("CCTV", pd.DataFrame()))
-df_koordinat     = norm_cols(all_df.get("Koordinat_UTM", pd.DataFrame()))
-
-# Simpan di session_state (opsional dipakai halaman lain)
-st.session_state["data"] = {
-    "Timbulan": df_timbulan, "Program": df_program, "Ketidaksesuaian": df_ketidaksesuaian,
-    "Survei_Online": df_online, "Survei_Offline": df_offline,
-    "CCTV": df_cctv, "Koordinat_UTM": df_koordinat
-}
+# dibaca dari cache se-proses (gbst.sheets), bukan download ulang tiap rerun;
+# ringkasan ini memakai semua sheet -> langsung dimuat paralel
+# nama kolom kanonik (gbst.canonical), dihitung sekali per versi data untuk semua sesi
+all_df = PageData(sheet_names, on_error=st.error).prefetch()
+sidebar_data_age(all_df.loaded)
+
+df_timbulan      = all_df["Timbulan"]
+df_program       = all_df["Program"]
+df_ketidaksesuaian = all_df["Ketidaksesuaian"]
+df_online        = all_df["Survei_Online"]
+df_offline       = all_df["Survei_Offline"]
+df_cctv          = all_df["CCTV"]
+df_koordinat     = all_df["Koordinat_UTM"]
+
+# sesi cukup menyimpan versi data; frame-nya dipegang cache bersama
+st.session_state["data_version"] = all_df.versions()
 
 # =============================
 # FILTER SIDEBAR
@@ -97,26 +62,13 @@ st.session_state["data"] = {
 st.sidebar.subheader("Filter Data")
 
 site_list = sorted(df_timbulan["site"].dropna().unique()) if "site" in df_timbulan.columns else []
-site_sel = st.sidebar.multiselect("Pilih Site", site_list, default=site_list)
-
 perusahaan_list = sorted(df_timbulan["perusahaan"].dropna().unique()) if "perusahaan" in df_timbulan.columns else []
-perusahaan_sel = st.sidebar.multiselect("Pilih Perusahaan", perusahaan_list, default=perusahaan_list)
-
-# deteksi kolom bulan_tahun di df_program
-pattern = r"^(januari|februari|maret|april|mei|juni|juli|agustus|september|oktober|november|desember)_\d{4}$"
-bulan_tahun_cols = [c for c in df_program.columns if re.match(pattern, c)]
-
-# reshape wide -> long utk program
-if bulan_tahun_cols:
-    df_prog_long = df_program.melt(
-        id_vars=[c for c in df_program.columns if c not in bulan_tahun_cols],
-        value_vars=bulan_tahun_cols,
-        var_name="bulan_tahun",
-        value_name="Value"
-    )
-    df_prog_long["tahun"] = df_prog_long["bulan_tahun"].apply(lambda x: int(x.split("_")[1]))
-    df_prog_long["bulan"] = df_prog_long["bulan_tahun"].apply(lambda x: x.split("_")[0].capitalize())
-else:
+
+# reshape wide -> long utk program (kolom bulan_tahun dideteksi dari header);
+# sekali per versi data Program, bukan tiap rerun (gbst.results)
+df_prog_long = results.memo("main:program_long", all_df.versions().get("Program"),
+                            lambda: periods.to_long(df_program, value_name="Value", periode=None))
+if df_prog_long is None:
     df_prog_long = df_program.copy()
     df_prog_long["tahun"] = None
     df_prog_long["bulan"] = None
@@ -128,115 +80,77 @@ bulan_map = {"Januari":1,"Februari":2,"Maret":3,"April":4,"Mei":5,"Juni":6,
 tahun_tersedia = sorted(df_prog_long["tahun"].dropna().astype(int).unique().tolist())
 if not tahun_tersedia:
     # fallback: kalau tidak ada, coba dari ketidaksesuaian
-    if "TanggalLapor" in df_ketidaksesuaian.columns:
-        tgl = pd.to_datetime(df_ketidaksesuaian["TanggalLapor"], dayfirst=True, errors="coerce")
-        tahun_tersedia = sorted(tgl.dt.year.dropna().astype(int).unique().tolist())
+    # tahun sudah diturunkan dari tanggallapor saat sheet dimuat (gbst.ketidaksesuaian)
+    if "tahun" in df_ketidaksesuaian.columns:
+        tahun_tersedia = sorted(df_ketidaksesuaian["tahun"].dropna().astype(int).unique().tolist())
 
 bulan_tersedia = list(bulan_map.keys())
-tahun_pilihan = st.sidebar.multiselect("Pilih Tahun:", tahun_tersedia, default=tahun_tersedia)
-bulan_pilihan = st.sidebar.multiselect("Pilih Bulan:", bulan_tersedia, default=bulan_tersedia)
+
+# semua pilihan dikirim sekaligus lewat tombol "Terapkan" (bukan rerun per klik);
+# preset filter (bawaan filter_presets.json + preset pengguna) dimuat dalam satu langkah
+pilihan = filter_panel({
+    "site": ("Pilih Site", site_list),
+    "perusahaan": ("Pilih Perusahaan", perusahaan_list),
+    "tahun": ("Pilih Tahun:", tahun_tersedia),
+    "bulan": ("Pilih Bulan:", bulan_tersedia),
+}, key="main")
+site_sel, perusahaan_sel = pilihan["site"], pilihan["perusahaan"]
+tahun_pilihan, bulan_pilihan = pilihan["tahun"], pilihan["bulan"]
 
 # =============================
 # Helper filter global
 # =============================
-def apply_site_perusahaan_filter(df, site_col="site", perusahaan_col="perusahaan"):
-    d = df.copy()
-    if site_sel and site_col in d.columns:
-        d = d[d[site_col].isin(site_sel)]
-    if perusahaan_sel and perusahaan_col in d.columns:
-        d = d[d[perusahaan_col].isin(perusahaan_sel)]
-    return d
+# bitmap per nilai filter dibangun sekali per versi data (gbst.filters);
+# pilihan kosong = kolom itu tidak difilter, kolom yang tidak ada diabaikan
+data_version = all_df.versions()
+
+def apply_site_perusahaan_filter(sheet, df, **extra):
+    return filters.apply(sheet, df, data_version.get(sheet),
+                         site=site_sel, perusahaan=perusahaan_sel, **extra)
 
 
 def apply_program_filter(df_prog_long, tahun_pilihan, bulan_pilihan):
-    d = df_prog_long.copy()
-    if "tahun" in d.columns and tahun_pilihan:
-        d = d[d["tahun"].isin(tahun_pilihan)]
-    if "bulan" in d.columns and bulan_pilihan:
-        d = d[d["bulan"].isin(bulan_pilihan)]
-    d = apply_site_perusahaan_filter(d)
-    return d
-
-
-def apply_ketidaksesuaian_filter(df_ket, tahun_pilihan, bulan_pilihan):
-    d = df_ket.copy()
-    if "TanggalLapor" in d.columns:
-        d["TanggalLapor"] = pd.to_datetime(
-            d["TanggalLapor"], dayfirst=True, errors="coerce"
-        )
-        d["tahun"] = d["TanggalLapor"].dt.year
-        d["bulan"] = d["TanggalLapor"].dt.month
-        if tahun_pilihan:
-            d = d[d["tahun"].isin(tahun_pilihan)]
-        if bulan_pilihan:
-            bulan_num = [bulan_map[b] for b in bulan_pilihan]
-            d = d[d["bulan"].isin(bulan_num)]
-    if "status_temuan" in d.columns:
-        d = d[d["status_temuan"].str.lower() == "valid"]
-    d = apply_site_perusahaan_filter(d)
-    return d
-
-
-def apply_timbulan_filter(df_timbulan, tahun_pilihan):
-    d = df_timbulan.copy()
-    d = apply_site_perusahaan_filter(d)
-    if "tahun" in d.columns and tahun_pilihan:
-        d["tahun"] = pd.to_numeric(d["tahun"], errors="coerce")
-        d = d[d["tahun"].isin(tahun_pilihan)]
-    return d
-
-
-# === Helper: hitung Man Power unik ===
-def total_manpower_unik(df):
-    if "man_power" not in df.columns:
-        return 0, pd.DataFrame(), 0
-
-    d = df.copy()
-    d["man_power"] = pd.to_numeric(d["man_power"], errors="coerce").fillna(0)
-
-    # Kunci deduplikasi yang BENAR (harus sama dengan perhitungan SNI)
-    keys = ["site", "perusahaan"]
-    if "tahun" in d.columns:
-        keys.append("tahun")
-
-    # TOTAL manpower unik berdasarkan kombinasi site-perusahaan-tahun
-    d_uniq = d.drop_duplicates(subset=keys, keep="last")
-
-    total_mp = d_uniq["man_power"].sum()
-
-    # JUMLAH perusahaan-site unik (abaikan tahun)
-    if {"site", "perusahaan"}.issubset(d.columns):
-        jumlah_unit = (
-            d_uniq[["site", "perusahaan"]]
-            .drop_duplicates()
-            .shape[0]
-        )
-    else:
-        jumlah_unit = 0
-
-    # AGREGASI per site
-    if "site" in d_uniq.columns:
-        mp_site = (
-            d_uniq.groupby("site", as_index=False)["man_power"].sum()
-            .rename(columns={"man_power": "mp_unik"})
-        )
-    else:
-        mp_site = pd.DataFrame()
+    # frame long diturunkan dari sheet Program -> ikut versi Program
+    return filters.apply("Program:long", df_prog_long, data_version.get("Program"),
+                         tahun=tahun_pilihan, bulan=bulan_pilihan,
+                         site=site_sel, perusahaan=perusahaan_sel)
 
-    return total_mp, mp_site, jumlah_unit
+
+# agregat turunan di-cache per kombinasi filter (gbst.results); semua input yang
+# berubah-ubah harus ikut sebagai keyword supaya masuk kunci cache
+def memo(section, sheets, fn, **selection):
+    version = tuple(data_version.get(s) for s in sheets)
+    return results.memo(f"main:{section}", version, fn, **selection)
 
 
 # apply semua filter
-df_timbulan_f   = apply_timbulan_filter(df_timbulan, tahun_pilihan)
 df_prog_f       = apply_program_filter(df_prog_long, tahun_pilihan, bulan_pilihan)
-df_ket_f        = apply_ketidaksesuaian_filter(df_ketidaksesuaian, tahun_pilihan, bulan_pilihan)
-df_online_f     = apply_site_perusahaan_filter(df_online)
-df_offline_f    = apply_site_perusahaan_filter(df_offline)
-df_cctv_f       = apply_site_perusahaan_filter(df_cctv)
-df_koordinat_f  = apply_site_perusahaan_filter(df_koordinat)
+df_online_f     = apply_site_perusahaan_filter("Survei_Online", df_online)
+df_offline_f    = apply_site_perusahaan_filter("Survei_Offline", df_offline)
+df_cctv_f       = apply_site_perusahaan_filter("CCTV", df_cctv)
+df_koordinat_f  = apply_site_perusahaan_filter("Koordinat_UTM", df_koordinat)
 
-# total manpower unik SESUDAH df_timbulan_f ada
-total_mp_unik, mp_site_df, jumlah_unit = total_manpower_unik(df_timbulan_f)
+# =============================
+# AGREGAT PER (site, perusahaan, tahun, bulan)
+# =============================
+# dibangun sekali per versi data (gbst.aggregates); metrik periode terpilih dan
+# periode pembanding cukup dijumlahkan dari tabel ini, bukan memfilter ulang baris
+period_table = memo("period_table", ["Timbulan", "Program", "Ketidaksesuaian"],
+                    lambda: aggregates.period_table(df_timbulan, df_prog_long, df_ketidaksesuaian,
+                                                    value="Value"))
+bulan_no_pilihan = [bulan_map[b] for b in bulan_pilihan]
+
+
+def period_totals(tahun):
+    return aggregates.totals(period_table, site=site_sel, perusahaan=perusahaan_sel,
+                             tahun=tahun, bulan=bulan_no_pilihan)
+
+
+totals_now = period_totals(tahun_pilihan)
+
+# man power unik (satu nilai per site-perusahaan-tahun, sesuai SNI)
+total_mp_unik = totals_now.get("man_power", 0)
+jumlah_unit = totals_now.get("jumlah_unit", 0)
 
 # =============================
 # DAYS PERIOD (ikut filter)
@@ -257,71 +171,52 @@ tab1, tab2 = st.tabs(["Overview", "Data Quality Check"])
 with tab1:
     try:
         # ---------- METRIC DASAR ----------
-        # Timbulan (kg/hari)
-        if "timbulan" in df_timbulan_f.columns:
-            df_timbulan_f["timbulan"] = pd.to_numeric(df_timbulan_f["timbulan"].astype(str).str.replace(",", "."), errors="coerce")
-            total_timbulan_hari = df_timbulan_f["timbulan"].sum()
-            total_timbulan_all  = pd.to_numeric(df_timbulan_f.get("data_input_total", 0), errors="coerce").sum()
-        else:
-            total_timbulan_hari = total_timbulan_all = 0
+        # Timbulan (kg/hari), dari tabel agregat periode terpilih
+        total_timbulan_hari = totals_now.get("timbulan", 0)
+        total_timbulan_all = totals_now.get("data_input_total", 0)
         # ============================
-        # METRIC PEMBANDING (TAHUN SEBELUMNYA)
+        # METRIC PEMBANDING (PERIODE SEBELUMNYA)
         # ============================
-        # Kita pakai logika: jika user pilih 1 tahun, bandingkan dengan tahun sebelumnya.
+        # Periode pembanding = pilihan tahun digeser sepanjang rentangnya, tepat sebelum
+        # tahun terkecil (1 tahun -> tahun sebelumnya); cukup lookup di tabel agregat.
+        # Delta hanya ditampilkan bila periode pembanding punya data (mis. pilihan default
+        # "semua tahun" tidak punya pembanding), bukan dibandingkan terhadap 0.
         prev_total_timbulan_all = None
         prev_total_timbulan_hari = None
         prev_rata_timbulan_per_orang = None
 
-        if len(tahun_pilihan) == 1:
-            current_year = tahun_pilihan[0]
-            prev_year = current_year - 1
-
-            # data timbulan tahun sebelumnya dengan filter site & perusahaan yang sama
-            df_timbulan_prev = apply_timbulan_filter(df_timbulan, [prev_year])
-            if "timbulan" in df_timbulan_prev.columns:
-                df_timbulan_prev["timbulan"] = pd.to_numeric(
-                    df_timbulan_prev["timbulan"].astype(str).str.replace(",", "."),
-                    errors="coerce"
-                )
-                prev_total_timbulan_hari = df_timbulan_prev["timbulan"].sum()
-                prev_total_timbulan_all = pd.to_numeric(
-                    df_timbulan_prev.get("data_input_total", 0),
-                    errors="coerce"
-                ).sum()
-
-                # hitung man power unik tahun sebelumnya (pakai helper yang sama)
-                total_mp_prev, mp_site_prev, jumlah_unit_prev = total_manpower_unik(df_timbulan_prev)
-                prev_rata_timbulan_per_orang = (
-                    prev_total_timbulan_hari / total_mp_prev if total_mp_prev > 0 else None
-                )
+        prev_tahun = aggregates.previous_period(tahun_pilihan)
+        prev_label = aggregates.period_label(prev_tahun)
+        totals_prev = period_totals(prev_tahun) if prev_tahun else None
 
-        # Jumlah program unik (bukan baris melt)
-        if "nama_program" in df_prog_f.columns:
-            jumlah_program = (
-                df_prog_f["nama_program"].astype(str).str.strip().replace({"": None}).dropna().nunique()
+        if totals_prev is not None and totals_prev.get("baris_timbulan", 0) > 0:
+            prev_total_timbulan_hari = totals_prev.get("timbulan", 0)
+            prev_total_timbulan_all = totals_prev.get("data_input_total", 0)
+            total_mp_prev = totals_prev.get("man_power", 0)
+            prev_rata_timbulan_per_orang = (
+                prev_total_timbulan_hari / total_mp_prev if total_mp_prev > 0 else None
             )
-        else:
-            jumlah_program = 0
+
+        # Jumlah program unik (bukan baris melt)
+        def hitung_jumlah_program(df_prog, default):
+            if "nama_program" not in df_prog.columns:
+                return default
+            return df_prog["nama_program"].astype(str).str.strip().replace({"": None}).dropna().nunique()
+
+        jumlah_program = memo(
+            "jumlah_program", ["Program"], lambda: hitung_jumlah_program(df_prog_f, 0),
+            site=site_sel, perusahaan=perusahaan_sel, tahun=tahun_pilihan, bulan=bulan_pilihan,
+        )
 
         # ===============================
         # KETIDAKSESUAIAN (Valid / Total)
         # ===============================
-        # Total laporan (semua status) pakai filter site, perusahaan, tahun, bulan
-        dk_all = apply_site_perusahaan_filter(df_ketidaksesuaian.copy())
-        if "TanggalLapor" in dk_all.columns:
-            dk_all["TanggalLapor"] = pd.to_datetime(dk_all["TanggalLapor"], dayfirst=True, errors="coerce")
-            dk_all["tahun"] = dk_all["TanggalLapor"].dt.year
-            dk_all["bulan"] = dk_all["TanggalLapor"].dt.month
-            if tahun_pilihan:
-                dk_all = dk_all[dk_all["tahun"].isin(tahun_pilihan)]
-            if bulan_pilihan:
-                bulan_num = [bulan_map[b] for b in bulan_pilihan]
-                dk_all = dk_all[dk_all["bulan"].isin(bulan_num)]
-
-        total_reports = len(dk_all)
-
-        # Jumlah valid sudah otomatis ada di df_ket_f
-        total_valid = len(df_ket_f) if not df_ket_f.empty else 0
+        # Total laporan (semua status) dan yang valid: hanya filter site & perusahaan,
+        # sepanjang waktu (termasuk tanggal lapor kosong), sama seperti semula; filter
+        # tahun/bulan memang tidak pernah berlaku untuk metrik ini
+        totals_laporan = aggregates.totals(period_table, site=site_sel, perusahaan=perusahaan_sel)
+        total_reports = int(totals_laporan.get("laporan", 0))
+        total_valid = int(totals_laporan.get("laporan_valid", 0))
 
         # kg/hari/orang (sesuai SNI)
         rata_timbulan_per_orang = (total_timbulan_hari / total_mp_unik) if total_mp_unik > 0 else 0.0
@@ -331,7 +226,7 @@ with tab1:
         # --- Total Timbulan (kg) ---
         if prev_total_timbulan_all is not None:
             delta_total = total_timbulan_all - prev_total_timbulan_all
-            delta_text_total = f"{'+' if delta_total >= 0 else ''}{fmt_num(delta_total)} kg vs {prev_year}"
+            delta_text_total = f"{'+' if delta_total >= 0 else ''}{fmt_num(delta_total)} kg vs {prev_label}"
         else:
             delta_text_total = None
 
@@ -345,7 +240,7 @@ with tab1:
         if prev_total_timbulan_hari is not None:
             # di sini aku pakai selisih total kg/hari nya, bukan dibagi hari lagi
             delta_hari = total_timbulan_hari - prev_total_timbulan_hari
-            delta_text_hari = f"{'+' if delta_hari >= 0 else ''}{fmt_num(delta_hari)} kg/hari vs {prev_year}"
+            delta_text_hari = f"{'+' if delta_hari >= 0 else ''}{fmt_num(delta_hari)} kg/hari vs {prev_label}"
         else:
             delta_text_hari = None
 
@@ -358,7 +253,7 @@ with tab1:
         # --- Rata-rata Timbulan (kg/hari/orang) ---
         if prev_rata_timbulan_per_orang is not None:
             delta_rata_orang = rata_timbulan_per_orang - prev_rata_timbulan_per_orang
-            delta_text_orang = f"{'+' if delta_rata_orang >= 0 else ''}{delta_rata_orang:.3f} kg/hari/orang vs {prev_year}"
+            delta_text_orang = f"{'+' if delta_rata_orang >= 0 else ''}{delta_rata_orang:.3f} kg/hari/orang vs {prev_label}"
         else:
             delta_text_orang = None
 
@@ -369,21 +264,20 @@ with tab1:
         )
 
         # --- Jumlah Program ---
-        # logika: kalau mau, bisa juga bandingkan jumlah program tahun ini vs prev_year
-        if len(tahun_pilihan) == 1:
-            df_prog_prev = apply_program_filter(df_prog_long, [prev_year], bulan_pilihan)
-            if "nama_program" in df_prog_prev.columns:
-                prev_jumlah_program = (
-                    df_prog_prev["nama_program"].astype(str).str.strip().replace({"": None}).dropna().nunique()
-                )
-            else:
-                prev_jumlah_program = None
+        # program unik tidak bisa dijumlahkan antar baris tabel agregat -> dihitung
+        # dari frame terfilter periode pembanding (di-cache per pilihan)
+        if totals_prev is not None and totals_prev.get("baris_program", 0) > 0:
+            prev_jumlah_program = memo(
+                "jumlah_program_prev", ["Program"],
+                lambda: hitung_jumlah_program(apply_program_filter(df_prog_long, prev_tahun, bulan_pilihan), None),
+                site=site_sel, perusahaan=perusahaan_sel, tahun=prev_tahun, bulan=bulan_pilihan,
+            )
         else:
             prev_jumlah_program = None
 
         if prev_jumlah_program is not None:
             delta_prog = jumlah_program - prev_jumlah_program
-            delta_text_prog = f"{'+' if delta_prog >= 0 else ''}{delta_prog} program vs {prev_year}"
+            delta_text_prog = f"{'+' if delta_prog >= 0 else ''}{delta_prog} program vs {prev_label}"
         else:
             delta_text_prog = None
 
@@ -400,20 +294,17 @@ with tab1:
         )
 
         # =====================================================
-        # KARTU (Reduce, Pengolahan, Sisa) — PAKAI df_prog_f (melt) SESUAI FILTER
+        # KARTU (Reduce, Pengolahan, Sisa) — NILAI PROGRAM (melt) SESUAI FILTER
         # =====================================================
-        # Sum per kategori dari kolom Value (angka bulanan), lalu / days_period
-        prog_pengolahan_per_hari = 0.0
-        prog_pengurangan_per_hari = 0.0
-        if not df_prog_f.empty and {"kategori","Value"}.issubset(df_prog_f.columns):
-            df_prog_f["Value"] = pd.to_numeric(df_prog_f["Value"], errors="coerce").fillna(0)
-            prog_pengolahan_per_hari = df_prog_f.loc[df_prog_f["kategori"]=="Program Pengelolaan","Value"].sum() / days_period
-            prog_pengurangan_per_hari = df_prog_f.loc[df_prog_f["kategori"]=="Program Pengurangan","Value"].sum() / days_period
-            # --- tambahkan persentase reduce (tanpa mengubah logika lain) ---
-            persen_pengurangan = (
-                prog_pengurangan_per_hari / total_timbulan_hari * 100
-                if total_timbulan_hari > 0 else 0
-            )
+        # Sum per kategori dari nilai bulanan (tabel agregat), lalu / days_period
+        P = aggregates.PROGRAM_PREFIX
+        prog_pengolahan_per_hari = totals_now.get(f"{P}Program Pengelolaan", 0.0) / days_period
+        prog_pengurangan_per_hari = totals_now.get(f"{P}Program Pengurangan", 0.0) / days_period
+        # --- tambahkan persentase reduce (tanpa mengubah logika lain) ---
+        persen_pengurangan = (
+            prog_pengurangan_per_hari / total_timbulan_hari * 100
+            if total_timbulan_hari > 0 else 0
+        )
 
         sisa_per_hari = max(total_timbulan_hari - prog_pengolahan_per_hari, 0)
         persen_pengolahan = (prog_pengolahan_per_hari/total_timbulan_hari*100) if total_timbulan_hari>0 else 0
@@ -449,18 +340,17 @@ with tab1:
         # =====================================================
         st.subheader("🗺️ Peta Lokasi Site & CCTV")
         filter_map = st.radio("Pilih data:", ["Timbulan + Site", "CCTV", "Keduanya"], horizontal=True)
-        fmap = folium.Map(location=[-2.0,117.0], zoom_start=6)
 
         # --- Site Timbulan ---
-        if not df_timbulan.empty and not df_koordinat.empty and filter_map in ["Timbulan + Site","Keduanya"]:
-            df_timbulan["company_code"] = company_to_code(df_timbulan.get("perusahaan",""))
-            agg_timbulan = df_timbulan.groupby(["site","company_code"], as_index=False).agg(total_timbulan=("timbulan","sum"))
+        def site_map_frame():
+            dt = df_timbulan.assign(company_code=companies.resolve(df_timbulan["perusahaan"]))
+            agg_timbulan = dt.groupby(["site","company_code"], as_index=False, observed=True).agg(total_timbulan=("timbulan","sum"))
 
             if not df_program.empty and "kategori" in df_program.columns:
                 df_pengolahan = df_program[df_program["kategori"]=="Program Pengelolaan"].copy()
                 df_pengolahan["total_calc"] = pd.to_numeric(df_pengolahan.get("total_calc",0), errors="coerce").fillna(0)
-                agg_pengolahan = df_pengolahan.groupby(["site","perusahaan"], as_index=False).agg(total_pengolahan=("total_calc","sum"))
-                agg_pengolahan["company_code"] = company_to_code(agg_pengolahan["perusahaan"])
+                agg_pengolahan = df_pengolahan.groupby(["site","perusahaan"], as_index=False, observed=True).agg(total_pengolahan=("total_calc","sum"))
+                agg_pengolahan["company_code"] = companies.resolve(agg_pengolahan["perusahaan"])
                 agg_pengolahan["sampah_terkelola"] = agg_pengolahan["total_pengolahan"] / days_period
             else:
                 agg_pengolahan = pd.DataFrame(columns=["site","company_code","sampah_terkelola"])
@@ -470,56 +360,57 @@ with tab1:
             agg["sampah_terkelola"] = agg["sampah_terkelola"].fillna(0)
             agg["sampah_tidak_terkelola"] = agg["total_timbulan"] - agg["sampah_terkelola"]
 
-            if {"x","y"}.issubset(df_koordinat.columns):
-                dko = df_koordinat.copy()
-                dko["x"] = pd.to_numeric(dko["x"], errors="coerce")
-                dko["y"] = pd.to_numeric(dko["y"], errors="coerce")
-                dko = dko.dropna(subset=["x","y"])
-                dko["company_code"] = company_to_code(dko.get("company",""))
-                df_map = dko.merge(agg, on=["site","company_code"], how="left")
-                if not df_map.empty:
-                    lon, lat = transformer.transform(df_map["x"].astype(float).values, df_map["y"].astype(float).values)
-                    df_map["lon"], df_map["lat"] = lon, lat
-                    for _, r in df_map.iterrows():
-                        popup_html = (
-                            f"<b>Site:</b> {r.get('site','-')}<br>"
-                            f"<b>Perusahaan:</b> {r.get('company_code','-')}<br>"
-                            f"<b>Total Timbulan:</b> {fmt_num(r.get('total_timbulan',0))} kg<br>"
-                            f"<b>Sampah Terkelola:</b> {fmt_num(r.get('sampah_terkelola',0))} kg<br>"
-                            f"<b>Sampah Tidak Terkelola:</b> {fmt_num(r.get('sampah_tidak_terkelola',0))} kg"
-                        )
-                        folium.Marker(
-                            location=[r["lat"], r["lon"]],
-                            tooltip=f"{r['site']} - {r['company_code']}",
-                            popup=popup_html,
-                            icon=folium.Icon(color="green", icon="trash", prefix="fa"),
-                        ).add_to(fmap)
+            if not {"x","y"}.issubset(df_koordinat.columns):
+                return pd.DataFrame()
+            dko = df_koordinat.dropna(subset=["x","y"])
+            dko["company_code"] = companies.resolve(dko["company"])
+            df_map = dko.merge(agg, on=["site","company_code"], how="left")
+            if not df_map.empty:
+                lon, lat = geo.utm_to_wgs84(df_map["x"], df_map["y"])
+                df_map["lon"], df_map["lat"] = lon, lat
+            return df_map
 
         # --- CCTV ---
-        if not df_cctv.empty and {"easting","northing"}.issubset(df_cctv.columns) and filter_map in ["CCTV","Keduanya"]:
-            dcc = df_cctv.copy()
-            lonlat = dcc.apply(lambda r: pd.Series(parse_coord(r["easting"], r["northing"]), index=["lon","lat"]), axis=1)
-            dcc = pd.concat([dcc, lonlat], axis=1).dropna(subset=["lat","lon"])
-            uniq_comp = sorted(dcc["perusahaan"].dropna().unique().tolist())
-            color_list = ["red","blue","green","purple","orange","darkred","lightred","beige","darkblue","darkgreen",
-                          "cadetblue","darkpurple","white","pink","lightblue","lightgreen","gray","black","lightgray"]
-            def assign_color(val):
-                if not uniq_comp: return "blue"
-                return color_list[uniq_comp.index(val) % len(color_list)]
-            for _, row in dcc.iterrows():
-                popup_text = (
-                    f"<b>{row.get('nama_titik_penaatan_ts','')}</b><br>"
-                    f"{row.get('perusahaan','')} - {row.get('site','')}<br>"
-                    f"Coverage: {row.get('coverage_cctv','')}"
-                )
-                folium.Marker(
-                    location=[float(row["lat"]), float(row["lon"])],
-                    popup=popup_text,
-                    tooltip=row.get("nama_titik_penaatan_ts",""),
-                    icon=folium.Icon(color=assign_color(row.get("perusahaan","")), icon="camera", prefix="fa")
-                ).add_to(fmap)
-
-        st_folium(fmap, height=600, use_container_width=True)
+        def cctv_map_frame():
+            lonlat = geo.parse_coords(df_cctv["easting"], df_cctv["northing"])
+            return pd.concat([df_cctv, lonlat], axis=1).dropna(subset=["lat","lon"])
+
+        def build_map():
+            fmap = folium.Map(location=[-2.0,117.0], zoom_start=6)
+            if not df_timbulan.empty and not df_koordinat.empty and filter_map in ["Timbulan + Site","Keduanya"]:
+                # agregat peta tidak ikut filter sidebar, hanya jumlah hari periode
+                df_map = memo("peta_site", ["Timbulan", "Program", "Koordinat_UTM"], site_map_frame,
+                              days=days_period)
+                if not df_map.empty:
+                    site_txt, code_txt = maps.text(df_map, "site"), maps.text(df_map, "company_code")
+                    popup_html = [
+                        f"<b>Site:</b> {site}<br>"
+                        f"<b>Perusahaan:</b> {code}<br>"
+                        f"<b>Total Timbulan:</b> {fmt_num(tot)} kg<br>"
+                        f"<b>Sampah Terkelola:</b> {fmt_num(kel)} kg<br>"
+                        f"<b>Sampah Tidak Terkelola:</b> {fmt_num(sisa)} kg"
+                        for site, code, tot, kel, sisa in zip(site_txt, code_txt, df_map["total_timbulan"],
+                                                              df_map["sampah_terkelola"], df_map["sampah_tidak_terkelola"])
+                    ]
+                    maps.add_points(fmap, df_map["lat"], df_map["lon"], popup=popup_html,
+                                    tooltip=site_txt + " - " + code_txt, color="green", icon="trash")
+
+            if not df_cctv.empty and {"easting","northing"}.issubset(df_cctv.columns) and filter_map in ["CCTV","Keduanya"]:
+                dcc = memo("peta_cctv", ["CCTV"], cctv_map_frame)
+                # > GBST_MAP_CLUSTER_THRESHOLD titik -> satu layer cluster, bukan marker per baris
+                warna = maps.color_map(dcc["perusahaan"])
+                nama = maps.text(dcc, "nama_titik_penaatan_ts")
+                popup_text = ("<b>" + nama + "</b><br>" + maps.text(dcc, "perusahaan") + " - "
+                              + maps.text(dcc, "site") + "<br>Coverage: " + maps.text(dcc, "coverage_cctv"))
+                maps.add_points(fmap, dcc["lat"], dcc["lon"], popup=popup_text, tooltip=nama,
+                                color=dcc["perusahaan"].map(warna).astype(object).fillna("blue"), icon="camera")
+            return maps.html(fmap)
+
+        # HTML peta di-cache per versi data x layer (+ hari periode); komponen statis,
+        # jadi pan/zoom hanya terjadi di browser dan tidak menjalankan ulang halaman
+        map_html = memo("peta_html", ["Timbulan", "Program", "Koordinat_UTM", "CCTV"], build_map,
+                        layer=filter_map, days=days_period)
+        components.html(map_html, height=600)
 
         # =====================================================
         # GRAFIK TIMBULAN – tidak diubah
@@ -532,7 +423,7 @@ with tab1:
 
             with col1:
                 st.markdown('<p style="text-align:center;font-weight:bold;">🥧 Proporsi Timbulan Berdasarkan Jenis</p>', unsafe_allow_html=True)
-                jenis_sum = df_timbulan.groupby("jenis_timbulan")["timbulan"].sum()
+                jenis_sum = df_timbulan.groupby("jenis_timbulan", observed=True)["timbulan"].sum()
                 fig2 = px.pie(names=jenis_sum.index, values=jenis_sum.values,
                               hole=0.4, color=jenis_sum.index, color_discrete_map=cmap, template="plotly_white")
                 fig2.update_traces(textinfo="percent+label", showlegend=True)
@@ -540,7 +431,7 @@ with tab1:
 
             with col2:
                 st.markdown('<p style="text-align:center;font-weight:bold;">Proporsi Timbulan Per Site</p>', unsafe_allow_html=True)
-                total_site = df_timbulan.groupby(["site","jenis_timbulan"], as_index=False)["timbulan"].sum()
+                total_site = df_timbulan.groupby(["site","jenis_timbulan"], as_index=False, observed=True)["timbulan"].sum()
                 total_site = total_site.sort_values(by=["site","timbulan"], ascending=[True,False])
                 fig1 = px.bar(total_site, y="site", x="timbulan", color="jenis_timbulan",
                               orientation="h", text="timbulan", template="plotly_white",
@@ -557,6 +448,7 @@ with tab1:
             df_valid = df_ketidaksesuaian[df_ketidaksesuaian["status_temuan"].str.lower()=="valid"]
             if not df_valid.empty:
                 prop = df_valid["kategori_subketidaksesuaian"].value_counts()
+                prop = prop[prop > 0]   # categorical: label dimensi tanpa baris ikut terhitung 0
                 fig_ket = px.pie(names=prop.index, values=prop.values, hole=0.4,
                                  color=prop.index, template="plotly_white",
                                  color_discrete_map={"Perilaku":"#347829","Non Perilaku":"#78b00a"})
@@ -604,3 +496,29 @@ with tab2:
     st.subheader("📋 Preview Data Koordinat UTM & CCTV")
     st.dataframe(df_koordinat.head(50) if not df_koordinat.empty else "Data Koordinat kosong.")
     st.dataframe(df_cctv.head(50) if not df_cctv.empty else "Data CCTV kosong.")
+
+    st.subheader("⏱️ Cache Data Google Sheets")
+    st.dataframe(cache_stats(), hide_index=True, use_container_width=True)
+    st.subheader("🧠 Memori Data (byte)")
+    mem_sheet, mem_session = memory_report()
+    st.caption("Frame bersama per sheet (sekali per proses)")
+    st.dataframe(mem_sheet, hide_index=True, use_container_width=True)
+    st.caption("Per sesi: byte yang dirujuk vs byte privat hasil modifikasi sesi")
+    st.dataframe(mem_session, hide_index=True, use_container_width=True)
+    st.subheader("♻️ Cache Hasil Filter")
+    usage = results.usage()
+    st.caption(f"{usage['entries']}/{usage['max_entries']} entri, "
+               f"{usage['bytes'] / 2**20:,.1f}/{usage['max_bytes'] / 2**20:,.0f} MB "
+               "(LRU per bagian x versi data x pilihan filter)")
+    st.dataframe(results.stats(), hide_index=True, use_container_width=True)
+    st.caption("Geocache proyeksi UTM -> WGS84 (titik CCTV & Koordinat_UTM)")
+    st.dataframe(geo.geocache_stats(), hide_index=True, use_container_width=True)
+    with st.expander("Tabel dimensi (kunci integer site/perusahaan/jenis/status)"):
+        st.dataframe(dimensions.table(), hide_index=True, use_container_width=True)
+    with st.expander("Tabel agregat per site/perusahaan/tahun/bulan (metrik & delta periode)"):
+        st.dataframe(period_table.reset_index(), hide_index=True, use_container_width=True)
+    with st.expander("Lookup kode perusahaan (override: company_overrides.csv)"):
+        st.dataframe(companies.lookup_table(), hide_index=True, use_container_width=True)
+    if st.button("🔄 Muat ulang data dari Google Sheets"):
+        invalidate()
+        st.rerun()
@@ -4,45 +4,33 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import calendar
-import re
-import datetime
+
+from gbst import filters, manpower, periods, results
+from gbst.datasets import PageData
+from gbst.ui import filter_panel, sidebar_data_age
 
 # =============================
 # Load Data dari Google Sheets
 # =============================
-sheet_url = "https://docs.google.com/spreadsheets/d/1cw3xMomuMOaprs8mkmj_qnib-Zp_9n68rYMgiRZZqBE/edit?usp=sharing"
-sheet_id = sheet_url.split("/")[5]
-sheet_name = ["Timbulan", "Program", "Survei_Online",
-              "Ketidaksesuaian", "Survei_Offline", "CCTV", "Jml_CCTV"]
-
-all_df = {}
-for sheet in sheet_name:
-    try:
-        url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet}"
-        df = pd.read_csv(url)
-        all_df[sheet] = df
-    except Exception as e:
-        st.error(f"Gagal load sheet {sheet}: {e}")
-        all_df[sheet] = pd.DataFrame()
+# hanya sheet yang dipakai halaman ini; survei & titik CCTV tidak diunduh
+# halaman ini masih memakai nama header asli ("Man Power", "Site") -> tampilan kompatibel
+data = PageData(["Timbulan", "Program", "Ketidaksesuaian", "Jml_CCTV"], columns="raw",
+                on_error=st.error).prefetch()
+sidebar_data_age(data.loaded)
 
 # Ambil sheet utama
-dt_timbulan = all_df.get("Timbulan", pd.DataFrame())
-dt_program = all_df.get("Program", pd.DataFrame())
+dt_timbulan = data["Timbulan"]
+dt_program = data["Program"]
 df_program = dt_program.copy()
-dt_online = all_df.get("Survei_Online", pd.DataFrame())
-df_ketidaksesuaian = all_df.get("Ketidaksesuaian", pd.DataFrame())
-df_cctv = all_df.get("Jml_CCTV", pd.DataFrame())
+df_ketidaksesuaian = data["Ketidaksesuaian"]
+df_cctv = data["Jml_CCTV"]
 
 # Pastikan kolom numeric dasar
 if "Timbulan" in dt_timbulan.columns:
-    dt_timbulan["Timbulan"] = pd.to_numeric(
-        dt_timbulan["Timbulan"], errors="coerce"
-    ).fillna(0)
+    dt_timbulan["Timbulan"] = dt_timbulan["Timbulan"].fillna(0)
 
 if "Total_calc" in dt_program.columns:
-    dt_program["Total_calc"] = pd.to_numeric(
-        dt_program["Total_calc"], errors="coerce"
-    ).fillna(0)
+    dt_program["Total_calc"] = dt_program["Total_calc"].fillna(0)
 
 # =============================
 # FILTER SIDEBAR
@@ -50,59 +38,35 @@ if "Total_calc" in dt_program.columns:
 st.sidebar.subheader("Filter Data")
 
 site_list = sorted(dt_timbulan["Site"].dropna().unique()) if "Site" in dt_timbulan.columns else []
-site_sel = st.sidebar.multiselect("Pilih Site", site_list, default=site_list if site_list else [])
-
 perusahaan_list = sorted(dt_timbulan["Perusahaan"].dropna().unique()) if "Perusahaan" in dt_timbulan.columns else []
-perusahaan_sel = st.sidebar.multiselect("Pilih Perusahaan", perusahaan_list, default=perusahaan_list if perusahaan_list else [])
-
-# ----- Deteksi kolom bulan-tahun di Program -----
-pattern = r"^(Januari|Februari|Maret|April|Mei|Juni|Juli|Agustus|September|Oktober|November|Desember) \d{4}$"
-bulan_tahun_cols = [col for col in df_program.columns if re.match(pattern, str(col))]
-
-if bulan_tahun_cols:
-    df_prog_long = df_program.melt(
-        id_vars=[c for c in df_program.columns if c not in bulan_tahun_cols],
-        value_vars=bulan_tahun_cols,
-        var_name="Bulan-Tahun",
-        value_name="Value"
-    )
-    df_prog_long["Tahun"] = df_prog_long["Bulan-Tahun"].apply(lambda x: int(x.split(" ")[1]))
-    df_prog_long["Bulan"] = df_prog_long["Bulan-Tahun"].apply(lambda x: x.split(" ")[0])
-else:
-    df_prog_long = pd.DataFrame(columns=["Tahun", "Bulan", "Value"])
 
-bulan_map = {
-    "Januari": 1, "Februari": 2, "Maret": 3, "April": 4,
-    "Mei": 5, "Juni": 6, "Juli": 7, "Agustus": 8,
-    "September": 9, "Oktober": 10, "November": 11, "Desember": 12
-}
-
-if not df_prog_long.empty:
-    df_prog_long["Periode"] = df_prog_long.apply(
-        lambda row: datetime.datetime(row["Tahun"], bulan_map[row["Bulan"]], 1),
-        axis=1
-    )
+# ----- Tahun Program: cukup dari header kolom periode ("Januari 2024", ...) -----
+# (halaman ini tidak memakai nilai Program, jadi tidak perlu membentuk frame long)
+tahun_program = (periods.period_columns(df_program.columns)["tahun"].astype(int).unique().tolist()
+                 if not df_program.empty else [])
 
 # ----- Tambah Tahun di Ketidaksesuaian (kalau ada) -----
-if not df_ketidaksesuaian.empty and "TanggalLapor" in df_ketidaksesuaian.columns:
-    df_ketidaksesuaian["TanggalLapor"] = pd.to_datetime(
-        df_ketidaksesuaian["TanggalLapor"], dayfirst=True, errors="coerce"
-    )
-    df_ketidaksesuaian["Tahun"] = df_ketidaksesuaian["TanggalLapor"].dt.year
-    df_ketidaksesuaian["Bulan"] = df_ketidaksesuaian["TanggalLapor"].dt.month
+# (tahun/bulan sudah diturunkan dari TanggalLapor saat sheet dimuat)
+if not df_ketidaksesuaian.empty and "tahun" in df_ketidaksesuaian.columns:
+    df_ketidaksesuaian["Tahun"] = df_ketidaksesuaian["tahun"]
+    df_ketidaksesuaian["Bulan"] = df_ketidaksesuaian["bulan"]
 
 # -------------------------
 # 🔹 FILTER TAHUN
 # -------------------------
-tahun_tersedia = sorted(df_prog_long["Tahun"].dropna().astype(int).unique().tolist()) if "Tahun" in df_prog_long.columns else []
+tahun_tersedia = sorted(tahun_program)
 if "Tahun" in dt_timbulan.columns:
     tahun_tersedia = sorted(
         set(tahun_tersedia) | set(dt_timbulan["Tahun"].dropna().astype(int).unique().tolist())
     )
 
-tahun_pilihan = st.sidebar.multiselect(
-    "Pilih Tahun:", tahun_tersedia, default=tahun_tersedia
-)
+# filter global (gbst.filter_state): pilihan ikut dari/ke halaman lain dan URL
+pilihan = filter_panel({
+    "site": ("Pilih Site", site_list),
+    "perusahaan": ("Pilih Perusahaan", perusahaan_list),
+    "tahun": ("Pilih Tahun:", tahun_tersedia),
+}, key="timbulan")
+site_sel, perusahaan_sel, tahun_pilihan = pilihan["site"], pilihan["perusahaan"], pilihan["tahun"]
 
 # Untuk hitung rata-rata per hari (approx.)
 if tahun_pilihan:
@@ -111,43 +75,28 @@ else:
     days_period = 365
 
 # -------------------------
-# 🔹 APPLY FILTER TAHUN KE SEMUA DF
+# 🔹 APPLY FILTER TAHUN, SITE & PERUSAHAAN KE SEMUA DF
 # -------------------------
-if tahun_pilihan:
-    if "Tahun" in dt_timbulan.columns:
-        dt_timbulan = dt_timbulan[dt_timbulan["Tahun"].isin(tahun_pilihan)]
-
-    if "Tahun" in dt_program.columns:
-        dt_program = dt_program[dt_program["Tahun"].isin(tahun_pilihan)]
-
-    if not df_ketidaksesuaian.empty and "Tahun" in df_ketidaksesuaian.columns:
-        df_ketidaksesuaian = df_ketidaksesuaian[df_ketidaksesuaian["Tahun"].isin(tahun_pilihan)]
-
-    if not dt_online.empty and "Tanggal" in dt_online.columns:
-        dt_online["Tanggal"] = pd.to_datetime(dt_online["Tanggal"], dayfirst=True, errors="coerce")
-        dt_online["Tahun"] = dt_online["Tanggal"].dt.year
-        dt_online = dt_online[dt_online["Tahun"].isin(tahun_pilihan)]
-
-# -------------------------
-# 🔹 FILTER SITE & PERUSAHAAN
-# -------------------------
-df_timbulan_filtered = dt_timbulan.copy()
-if site_sel:
-    df_timbulan_filtered = df_timbulan_filtered[df_timbulan_filtered["Site"].isin(site_sel)]
-if perusahaan_sel:
-    df_timbulan_filtered = df_timbulan_filtered[df_timbulan_filtered["Perusahaan"].isin(perusahaan_sel)]
-
-df_program_filtered = dt_program.copy()
-if site_sel and "Site" in df_program_filtered.columns:
-    df_program_filtered = df_program_filtered[df_program_filtered["Site"].isin(site_sel)]
-if perusahaan_sel and "Perusahaan" in df_program_filtered.columns:
-    df_program_filtered = df_program_filtered[df_program_filtered["Perusahaan"].isin(perusahaan_sel)]
-
-df_ket_filtered = df_ketidaksesuaian.copy()
-if site_sel and "Site" in df_ket_filtered.columns:
-    df_ket_filtered = df_ket_filtered[df_ket_filtered["Site"].isin(site_sel)]
-if perusahaan_sel and "Perusahaan" in df_ket_filtered.columns:
-    df_ket_filtered = df_ket_filtered[df_ket_filtered["Perusahaan"].isin(perusahaan_sel)]
+# bitmap per nilai + cache hasil per kombinasi filter (gbst.filters/gbst.results);
+# pilihan kosong = tidak difilter, kolom yang tidak ada di sheet diabaikan
+data_version = data.versions()
+
+def apply_filter(sheet, df):
+    return filters.apply(f"{sheet}:raw", df, data_version.get(sheet),
+                         Tahun=tahun_pilihan, Site=site_sel, Perusahaan=perusahaan_sel)
+
+df_timbulan_filtered = apply_filter("Timbulan", dt_timbulan)
+df_program_filtered = apply_filter("Program", dt_program)
+df_ket_filtered = apply_filter("Ketidaksesuaian", df_ketidaksesuaian)
+
+# man power unik, kg/hari dan kg/hari/orang untuk semua grain (total, site,
+# perusahaan-site, tahun, jenis) dari satu kernel (gbst.manpower), di-cache per filter
+sni = results.memo(
+    "timbulan:manpower", data_version.get("Timbulan"),
+    lambda: manpower.kernel(df_timbulan_filtered, site="Site", perusahaan="Perusahaan", tahun="Tahun",
+                            jenis="jenis_timbulan", timbulan="Timbulan", man_power="Man Power"),
+    Tahun=tahun_pilihan, Site=site_sel, Perusahaan=perusahaan_sel,
+)
 
 # =============================
 # METRIC UTAMA (atas)
@@ -159,18 +108,11 @@ try:
 
     # --- Total Timbulan ---
     if "Timbulan" in df_timbulan.columns:
-        df_timbulan["Timbulan"] = pd.to_numeric(
-            df_timbulan["Timbulan"].astype(str).str.replace(",", "."),
-            errors="coerce"
-        )
-
         total_timbulan = df_timbulan["Timbulan"].sum()
 
         # kalau ada kolom data_input_total dipakai, kalau tidak pakai total_timbulan
         if "data_input_total" in df_timbulan.columns:
-            total_timbulan_all = pd.to_numeric(
-                df_timbulan["data_input_total"], errors="coerce"
-            ).sum()
+            total_timbulan_all = df_timbulan["data_input_total"].sum()
         else:
             total_timbulan_all = total_timbulan
     else:
@@ -179,27 +121,8 @@ try:
 
     # --- Man Power unik & jumlah unit perusahaan-site (LOGIKA SAMA DENGAN SNI) ---
     if not df_timbulan.empty and {"Site", "Perusahaan", "Man Power"}.issubset(df_timbulan.columns):
-        subset_cols = ["Site", "Perusahaan"]
-        if "Tahun" in df_timbulan.columns:
-            subset_cols.append("Tahun")
-
-        df_mp_unik_metric = (
-            df_timbulan
-            .drop_duplicates(subset=subset_cols, keep="last")
-            [subset_cols + ["Man Power"]]
-            .copy()
-        )
-
-        df_mp_unik_metric["Man Power"] = pd.to_numeric(
-            df_mp_unik_metric["Man Power"], errors="coerce"
-        ).fillna(0)
-
-        total_manpower = df_mp_unik_metric["Man Power"].sum()
-        jumlah_unit = (
-                df_mp_unik_metric[["Site", "Perusahaan"]]
-                .drop_duplicates()
-                .shape[0]
-        )
+        total_manpower = sni["total"]["man_power"]
+        jumlah_unit = int(sni["total"]["jumlah_unit"])
     else:
         total_manpower = 0
         jumlah_unit = 0
@@ -208,10 +131,6 @@ try:
 
     # --- Jumlah Program ---
     if "Nama program" in df_program.columns:
-        df_program["Total_calc"] = pd.to_numeric(
-            df_program["Total_calc"].astype(str).str.replace(",", "."),
-            errors="coerce"
-        )
         jumlah_program = df_program["Nama program"].dropna().shape[0]
         total_program = df_program["Total_calc"].sum()
     else:
@@ -289,29 +208,8 @@ except Exception as e:
 st.markdown("### ♻️ Rata-rata Timbulan Sesuai SNI (kg/hari/orang)")
 
 if not df_timbulan.empty and {"Site", "Perusahaan", "Timbulan", "Man Power"}.issubset(df_timbulan.columns):
-    df_timbulan_sni = df_timbulan.copy()
-    df_timbulan_sni["Timbulan"] = pd.to_numeric(df_timbulan_sni["Timbulan"], errors="coerce").fillna(0)
-    df_timbulan_sni["Man Power"] = pd.to_numeric(df_timbulan_sni["Man Power"], errors="coerce").fillna(0)
-
-    # kombinasi unik site-perusahaan-tahun (kalau kolom Tahun ada)
-    subset_cols_sni = ["Site", "Perusahaan"]
-    if "Tahun" in df_timbulan_sni.columns:
-        subset_cols_sni.append("Tahun")
-
-    df_mp_unik_sni = (
-        df_timbulan_sni
-        .drop_duplicates(subset=subset_cols_sni, keep="last")
-        [subset_cols_sni + ["Man Power"]]
-        .copy()
-    )
-
-    df_mp_unik_sni["Man Power"] = pd.to_numeric(
-        df_mp_unik_sni["Man Power"], errors="coerce"
-    ).fillna(0)
-
-    total_timbulan_all_sni = df_timbulan_sni["Timbulan"].sum()
-    total_mp_unik = df_mp_unik_sni["Man Power"].sum()   # → harusnya jadi 3.498
-
+    total_timbulan_all_sni = sni["total"]["timbulan"]
+    total_mp_unik = sni["total"]["man_power"]
 
     rata_sni = total_timbulan_all_sni / total_mp_unik if total_mp_unik > 0 else 0
 
@@ -326,17 +224,9 @@ if not df_timbulan.empty and {"Site", "Perusahaan", "Timbulan", "Man Power"}.iss
     """, unsafe_allow_html=True)
 
     st.markdown("#### 📋 Rincian per Site")
-    df_site_sni = (
-        df_timbulan_sni.groupby("Site", as_index=False)
-        .agg(total_timbulan=("Timbulan", "sum"))
-        .merge(
-            df_mp_unik_sni.groupby("Site", as_index=False)["Man Power"].sum(),
-            on="Site", how="left"
-        )
-    )
-    df_site_sni["kg/hari/orang"] = (
-        df_site_sni["total_timbulan"] / df_site_sni["Man Power"]
-    ).round(3)
+    df_site_sni = sni["site"].rename(columns={"timbulan": "total_timbulan", "man_power": "Man Power"})
+    df_site_sni["kg/hari/orang"] = df_site_sni["kg_hari_orang"].round(3)
+    df_site_sni = df_site_sni[["Site", "total_timbulan", "Man Power", "kg/hari/orang"]]
     df_site_sni = df_site_sni.sort_values("kg/hari/orang", ascending=False)
     st.dataframe(df_site_sni, hide_index=True)
 else:
@@ -367,14 +257,10 @@ else:
     df_base = df_timbulan_filtered.copy()
 
     # Pastikan numeric
-    df_base["Tahun"] = pd.to_numeric(df_base["Tahun"], errors="coerce").astype("Int64")
-    df_base["Timbulan"] = pd.to_numeric(df_base["Timbulan"], errors="coerce").fillna(0)
-    df_base["Man Power"] = pd.to_numeric(df_base["Man Power"], errors="coerce").fillna(0)
+    df_base["Tahun"] = df_base["Tahun"].astype("Int64")
 
     # data_input_total optional (kalau ada)
     has_totalcol = "data_input_total" in df_base.columns
-    if has_totalcol:
-        df_base["data_input_total"] = pd.to_numeric(df_base["data_input_total"], errors="coerce").fillna(0)
 
     import plotly.graph_objects as go
 
@@ -402,15 +288,15 @@ else:
 
                 year_colors = {2024: "red", 2025: "green"}
 
-                # ambil data 2024 & 2025
-                df_c = df_base[df_base["Tahun"].isin(years_target)].copy()
-                df_c["Tahun"] = pd.to_numeric(df_c["Tahun"], errors="coerce").astype(int)
-                df_c["Timbulan"] = pd.to_numeric(df_c["Timbulan"], errors="coerce").fillna(0)
-                df_c["Man Power"] = pd.to_numeric(df_c["Man Power"], errors="coerce").fillna(0)
+                # ambil data 2024 & 2025 dari kernel man power (gbst.manpower)
+                comp_cols = {"timbulan": "KGDAY", "man_power": "MP", "data_input_total": "KG",
+                             "kg_hari_orang": "KGDAY_per_MP"}
 
-                # data_input_total optional
-                if has_totalcol:
-                    df_c["data_input_total"] = pd.to_numeric(df_c["data_input_total"], errors="coerce").fillna(0)
+                def comp_table(grain):
+                    out = sni[grain]
+                    # kernel memberi NaN bila man power 0; grafik tetap memakai 0 seperti semula
+                    out = out[out["Tahun"].isin(years_target)].rename(columns=comp_cols).fillna({"KGDAY_per_MP": 0})
+                    return out.assign(Tahun=out["Tahun"].astype(int))
 
                 # tentukan metrik sesuai metric_mode
                 if metric_mode == "data_input_total (kg)":
@@ -429,35 +315,10 @@ else:
                     x_title = "kg/hari/manpower"
                     decimals = 4
 
-                uniq_cols = ["Site", "Perusahaan", "Tahun"]
-
                 # =========================
                 # A) PERBANDINGAN PER SITE
                 # =========================
-                site_kgday_y = (
-                    df_c.groupby(["Site", "Tahun"], as_index=False)["Timbulan"]
-                    .sum().rename(columns={"Timbulan": "KGDAY"})
-                )
-                site_mp_y = (
-                    df_c[uniq_cols + ["Man Power"]]
-                    .drop_duplicates(subset=uniq_cols, keep="last")
-                    .groupby(["Site", "Tahun"], as_index=False)["Man Power"]
-                    .sum().rename(columns={"Man Power": "MP"})
-                )
-
-                site_comp = site_kgday_y.merge(site_mp_y, on=["Site", "Tahun"], how="left")
-                site_comp["MP"] = site_comp["MP"].fillna(0)
-
-                if has_totalcol:
-                    site_kg_y = (
-                        df_c.groupby(["Site", "Tahun"], as_index=False)["data_input_total"]
-                        .sum().rename(columns={"data_input_total": "KG"})
-                    )
-                    site_comp = site_comp.merge(site_kg_y, on=["Site", "Tahun"], how="left")
-                else:
-                    site_comp["KG"] = 0
-
-                site_comp["KGDAY_per_MP"] = np.where(site_comp["MP"] > 0, site_comp["KGDAY"] / site_comp["MP"], 0)
+                site_comp = comp_table("site_tahun")
                 site_comp["Value"] = site_comp[value_kind]
 
                 cat_order_site = (
@@ -496,30 +357,7 @@ else:
                 # ======================================
                 # B) PERBANDINGAN PER PERUSAHAAN - SITE
                 # ======================================
-                ps_kgday_y = (
-                    df_c.groupby(["Perusahaan", "Site", "Tahun"], as_index=False)["Timbulan"]
-                    .sum().rename(columns={"Timbulan": "KGDAY"})
-                )
-                ps_mp_y = (
-                    df_c[uniq_cols + ["Man Power"]]
-                    .drop_duplicates(subset=uniq_cols, keep="last")
-                    .groupby(["Perusahaan", "Site", "Tahun"], as_index=False)["Man Power"]
-                    .sum().rename(columns={"Man Power": "MP"})
-                )
-
-                ps_comp = ps_kgday_y.merge(ps_mp_y, on=["Perusahaan", "Site", "Tahun"], how="left")
-                ps_comp["MP"] = ps_comp["MP"].fillna(0)
-
-                if has_totalcol:
-                    ps_kg_y = (
-                        df_c.groupby(["Perusahaan", "Site", "Tahun"], as_index=False)["data_input_total"]
-                        .sum().rename(columns={"data_input_total": "KG"})
-                    )
-                    ps_comp = ps_comp.merge(ps_kg_y, on=["Perusahaan", "Site", "Tahun"], how="left")
-                else:
-                    ps_comp["KG"] = 0
-
-                ps_comp["KGDAY_per_MP"] = np.where(ps_comp["MP"] > 0, ps_comp["KGDAY"] / ps_comp["MP"], 0)
+                ps_comp = comp_table("perusahaan_site_tahun")
                 ps_comp["Value"] = ps_comp[value_kind]
                 ps_comp["Perusahaan_Site"] = ps_comp["Perusahaan"].astype(str) + " - " + ps_comp["Site"].astype(str)
 
@@ -577,49 +415,20 @@ else:
         # ======================================================
         else:
             tahun_chart = int(tahun_pilihan_ui)
-            df_y = df_base[df_base["Tahun"] == tahun_chart].copy()
 
             # ======================================================
-            # 1) Manpower UNIK (anti double count)
+            # 1) Manpower UNIK (anti double count) + metrik dasar dari kernel
             # ======================================================
-            uniq_cols = ["Site", "Perusahaan", "Tahun"]
-            mp_uniq = (
-                df_y[uniq_cols + ["Man Power"]]
-                .drop_duplicates(subset=uniq_cols, keep="last")
-                .groupby(["Site"], as_index=False)["Man Power"].sum()
-                .rename(columns={"Man Power": "MP_Site"})
-            )
-
-            mp_uniq_ps = (
-                df_y[uniq_cols + ["Man Power"]]
-                .drop_duplicates(subset=uniq_cols, keep="last")
-                .groupby(["Perusahaan", "Site"], as_index=False)["Man Power"].sum()
-                .rename(columns={"Man Power": "MP_PS"})
-            )
-
-            # ======================================================
-            # 2) Agregasi metrik dasar
-            # ======================================================
-            site_kgday = df_y.groupby("Site", as_index=False)["Timbulan"].sum().rename(columns={"Timbulan": "KGDAY_Site"})
-            ps_kgday = df_y.groupby(["Perusahaan", "Site"], as_index=False)["Timbulan"].sum().rename(columns={"Timbulan": "KGDAY_PS"})
-
-            if has_totalcol:
-                site_kg = df_y.groupby("Site", as_index=False)["data_input_total"].sum().rename(columns={"data_input_total": "KG_Site"})
-                ps_kg = df_y.groupby(["Perusahaan", "Site"], as_index=False)["data_input_total"].sum().rename(columns={"data_input_total": "KG_PS"})
-            else:
-                site_kg = site_kgday[["Site"]].copy()
-                site_kg["KG_Site"] = 0
-                ps_kg = ps_kgday[["Perusahaan", "Site"]].copy()
-                ps_kg["KG_PS"] = 0
-
-            site_plot = site_kgday.merge(site_kg, on="Site", how="left").merge(mp_uniq, on="Site", how="left")
-            site_plot["MP_Site"] = site_plot["MP_Site"].fillna(0)
-            site_plot["KGDAY_per_MP"] = np.where(site_plot["MP_Site"] > 0, site_plot["KGDAY_Site"] / site_plot["MP_Site"], 0)
-
-            ps_plot = ps_kgday.merge(ps_kg, on=["Perusahaan", "Site"], how="left").merge(mp_uniq_ps, on=["Perusahaan", "Site"], how="left")
-            ps_plot["MP_PS"] = ps_plot["MP_PS"].fillna(0)
+            site_plot = sni["site_tahun"]
+            site_plot = site_plot[site_plot["Tahun"] == tahun_chart].rename(columns={
+                "timbulan": "KGDAY_Site", "data_input_total": "KG_Site", "man_power": "MP_Site",
+                "kg_hari_orang": "KGDAY_per_MP"}).fillna({"KGDAY_per_MP": 0})
+
+            ps_plot = sni["perusahaan_site_tahun"]
+            ps_plot = ps_plot[ps_plot["Tahun"] == tahun_chart].rename(columns={
+                "timbulan": "KGDAY_PS", "data_input_total": "KG_PS", "man_power": "MP_PS",
+                "kg_hari_orang": "KGDAY_per_MP"}).fillna({"KGDAY_per_MP": 0})
             ps_plot["Perusahaan_Site"] = ps_plot["Perusahaan"].astype(str) + " - " + ps_plot["Site"].astype(str)
-            ps_plot["KGDAY_per_MP"] = np.where(ps_plot["MP_PS"] > 0, ps_plot["KGDAY_PS"] / ps_plot["MP_PS"], 0)
 
             # ======================================================
             # 3) Pilih Y sesuai metric_mode
@@ -842,7 +651,7 @@ df_tren = df_filterjensampah.copy()
 if "Tahun" not in df_tren.columns:
     st.warning("Kolom 'Tahun' tidak ditemukan di data timbulan, jadi tren tahunan tidak bisa dibuat.")
 else:
-    df_tren["Timbulan"] = pd.to_numeric(df_tren["Timbulan"], errors="coerce").fillna(0)
+    df_tren["Timbulan"] = df_tren["Timbulan"].fillna(0)
 
     # pilih semua jenis by default
     jenis_opsi = sorted(df_tren["jenis_timbulan"].dropna().unique().tolist())
@@ -897,9 +706,7 @@ else:
     )
 
     dfj = df_timbulan_filtered.copy()
-    dfj["Tahun"] = pd.to_numeric(dfj["Tahun"], errors="coerce").astype("Int64")
-    dfj["Timbulan"] = pd.to_numeric(dfj["Timbulan"], errors="coerce").fillna(0)
-    dfj["Man Power"] = pd.to_numeric(dfj["Man Power"], errors="coerce").fillna(0)
+    dfj["Tahun"] = dfj["Tahun"].astype("Int64")
 
     tahun_opsi = sorted([int(x) for x in dfj["Tahun"].dropna().unique().tolist()])
     tahun_pilih = st.selectbox(
@@ -909,37 +716,14 @@ else:
     )
 
     # -----------------------------------------
-    # Helper: hitung agregat per Tahun x Jenis
-    # -----------------------------------------
-    def build_jenis_by_year(dfin: pd.DataFrame) -> pd.DataFrame:
-        # manpower unik: Site-Perusahaan-Tahun (agar tidak double count)
-        mp_uniq = (
-            dfin[["Site", "Perusahaan", "Tahun", "Man Power"]]
-            .drop_duplicates(subset=["Site", "Perusahaan", "Tahun"], keep="last")
-            .groupby("Tahun", as_index=False)["Man Power"].sum()
-            .rename(columns={"Man Power": "MP_Tahun"})
-        )
-
-        jenis_kgday = (
-            dfin.groupby(["Tahun", "jenis_timbulan"], as_index=False)["Timbulan"]
-            .sum()
-            .rename(columns={"Timbulan": "KGDAY"})
-        )
-
-        out = jenis_kgday.merge(mp_uniq, on="Tahun", how="left")
-        out["MP_Tahun"] = out["MP_Tahun"].fillna(0)
-        out["KGDAY_per_MP"] = np.where(out["MP_Tahun"] > 0, out["KGDAY"] / out["MP_Tahun"], 0)
-        return out
-
-    # -----------------------------------------
-    # Data sesuai pilihan tahun
+    # Agregat per Tahun x Jenis dari kernel man power (gbst.manpower):
+    # manpower unik Site-Perusahaan-Tahun (agar tidak double count)
     # -----------------------------------------
+    agg = sni["tahun_jenis"].rename(columns={"timbulan": "KGDAY", "man_power": "MP_Tahun",
+                                             "kg_hari_orang": "KGDAY_per_MP"}).fillna({"KGDAY_per_MP": 0})
+    agg["Tahun"] = agg["Tahun"].astype("Int64")
     if tahun_pilih != "All":
-        df_plot = dfj[dfj["Tahun"] == int(tahun_pilih)].copy()
-        agg = build_jenis_by_year(df_plot)
         agg = agg[agg["Tahun"] == int(tahun_pilih)].copy()
-    else:
-        agg = build_jenis_by_year(dfj)
 
     # pilih metrik
     if metric_mode == "Timbulan (kg/hari)":
@@ -1053,9 +837,7 @@ else:
     import numpy as np
 
     dfps = df_timbulan_filtered.copy()
-    dfps["Tahun"] = pd.to_numeric(dfps["Tahun"], errors="coerce").astype("Int64")
-    dfps["Timbulan"] = pd.to_numeric(dfps["Timbulan"], errors="coerce").fillna(0)
-    dfps["Man Power"] = pd.to_numeric(dfps["Man Power"], errors="coerce").fillna(0)
+    dfps["Tahun"] = dfps["Tahun"].astype("Int64")
     dfps["Perusahaan_Site"] = dfps["Perusahaan"].astype(str) + " - " + dfps["Site"].astype(str)
 
     metric_mode_ps = st.radio(
@@ -1071,34 +853,16 @@ else:
     ps_list = sorted(dfps["Perusahaan_Site"].dropna().unique().tolist())
     ps_pick = st.selectbox("Perusahaan–Site:", ["All"] + ps_list, key="ps_pick")
 
-    # -------- helper: agregasi per PS x Tahun x Jenis ----------
-    def build_ps_agg(dfin: pd.DataFrame) -> pd.DataFrame:
-        # manpower unik per Perusahaan-Site-Tahun (penting!)
-        mp_uniq = (
-            dfin[["Perusahaan_Site", "Site", "Perusahaan", "Tahun", "Man Power"]]
-            .drop_duplicates(subset=["Perusahaan_Site", "Tahun"], keep="last")
-            .groupby(["Perusahaan_Site", "Tahun"], as_index=False)["Man Power"].sum()
-            .rename(columns={"Man Power": "MP_PS"})
-        )
-
-        kgday = (
-            dfin.groupby(["Perusahaan_Site", "Tahun", "jenis_timbulan"], as_index=False)["Timbulan"]
-            .sum()
-            .rename(columns={"Timbulan": "KGDAY"})
-        )
-
-        out = kgday.merge(mp_uniq, on=["Perusahaan_Site", "Tahun"], how="left")
-        out["MP_PS"] = out["MP_PS"].fillna(0)
-        out["KGDAY_per_MP"] = np.where(out["MP_PS"] > 0, out["KGDAY"] / out["MP_PS"], 0)
-        return out
-
-    base = dfps.copy()
+    # -------- agregasi per PS x Tahun x Jenis (kernel gbst.manpower) ----------
+    # manpower unik per Perusahaan-Site-Tahun (penting!)
+    agg_ps = sni["perusahaan_site_tahun_jenis"].rename(columns={"timbulan": "KGDAY", "man_power": "MP_PS",
+                                                                "kg_hari_orang": "KGDAY_per_MP"}).fillna({"KGDAY_per_MP": 0})
+    agg_ps["Tahun"] = agg_ps["Tahun"].astype("Int64")
+    agg_ps["Perusahaan_Site"] = agg_ps["Perusahaan"].astype(str) + " - " + agg_ps["Site"].astype(str)
     if tahun_ps != "All":
-        base = base[base["Tahun"] == int(tahun_ps)]
+        agg_ps = agg_ps[agg_ps["Tahun"] == int(tahun_ps)]
     if ps_pick != "All":
-        base = base[base["Perusahaan_Site"] == ps_pick]
-
-    agg_ps = build_ps_agg(base)
+        agg_ps = agg_ps[agg_ps["Perusahaan_Site"] == ps_pick]
 
     # pilih metrik
     if metric_mode_ps == "Timbulan (kg/hari)":
@@ -1506,11 +1270,8 @@ if not df_filtered.empty:
     # ----- CCTV per Perusahaan-Site -----
     if not df_cctv.empty and {"Site", "Perusahaan", "Coverage 24jam",
                               "Coverage non 24jam", "Tidak tercover", "Total CCTV"}.issubset(df_cctv.columns):
-        df_cctv_filtered = df_cctv.copy()
-        if site_sel:
-            df_cctv_filtered = df_cctv_filtered[df_cctv_filtered["Site"].isin(site_sel)]
-        if perusahaan_sel:
-            df_cctv_filtered = df_cctv_filtered[df_cctv_filtered["Perusahaan"].isin(perusahaan_sel)]
+        df_cctv_filtered = filters.apply("Jml_CCTV:raw", df_cctv, data_version.get("Jml_CCTV"),
+                                         Site=site_sel, Perusahaan=perusahaan_sel)
 
         df_cctv_filtered["Perusahaan_Site"] = df_cctv_filtered["Perusahaan"] + "-" + df_cctv_filtered["Site"]
 
@@ -7,46 +7,24 @@ import plotly.express as px
 import plotly.graph_objects as go
 import calendar, re
 
+from gbst import companies, dimensions, filters, periods, results
+from gbst.datasets import PageData
+from gbst.ui import filter_panel, sidebar_data_age
+
 st.markdown('<p style="text-align: left;font-weight: bold;">♻️ Program Pengurangan & Pengolahan</p>', unsafe_allow_html=True)
 
 # =============================
 # LOAD DATA GOOGLE SHEETS
 # =============================
-sheet_url = "https://docs.google.com/spreadsheets/d/1cw3xMomuMOaprs8mkmj_qnib-Zp_9n68rYMgiRZZqBE/edit?usp=sharing"
-sheet_id = sheet_url.split("/")[5]
-sheet_name = ["Timbulan","Program","Survei_Online","Ketidaksesuaian","Survei_Offline","CCTV","Koordinat_UTM"]
-
-all_df = {}
-for sheet in sheet_name:
-    try:
-        url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet}"
-        df = pd.read_csv(url)
-        all_df[sheet] = df
-    except Exception as e:
-        st.error(f"Gagal load sheet {sheet}: {e}")
+# hanya sheet yang benar-benar dipakai halaman ini (survei/CCTV tidak diunduh)
+data = PageData(["Timbulan", "Program"], on_error=st.error).prefetch()
+sidebar_data_age(data.loaded)
 
 # =============================
 # AMBIL DATAFRAME
 # =============================
-df_timbulan = all_df.get("Timbulan", pd.DataFrame()).copy()
-df_program = all_df.get("Program", pd.DataFrame()).copy()
-df_ketidaksesuaian = all_df.get("Ketidaksesuaian", pd.DataFrame()).copy()
-
-# =============================
-# NORMALISASI NAMA KOLOM
-# =============================
-def norm_cols(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = (df.columns.astype(str)
-                  .str.strip()
-                  .str.lower()
-                  .str.replace(" ", "_")
-                  .str.replace("/", "_"))
-    return df
-
-df_timbulan = norm_cols(df_timbulan)
-df_program = norm_cols(df_program)
-df_ketidaksesuaian = norm_cols(df_ketidaksesuaian)
+df_timbulan = data["Timbulan"]
+df_program = data["Program"]
 
 # =============================
 # NORMALISASI NAMA PROGRAM (dibesarkan cakupannya)
@@ -71,8 +49,10 @@ def normalize_name(text: str):
 
     return txt.title()
 
+# normalisasi/cluster dihitung per nama unik lalu disebar ke baris (gbst.dimensions.relabel);
+# label hasilnya hanya untuk halaman ini, tabel dimensi bersama tidak ikut bertambah
 if "nama_program" in df_program.columns:
-    df_program["nama_program"] = df_program["nama_program"].map(normalize_name)
+    df_program["nama_program"] = dimensions.relabel(df_program["nama_program"], normalize_name, na="")
 
 # =============================
 # CLUSTER PROGRAM (diperluas)
@@ -98,7 +78,7 @@ def cluster_program(name: str):
 
     return "Lainnya"
 
-df_program["cluster"] = df_program["nama_program"].map(cluster_program)
+df_program["cluster"] = dimensions.relabel(df_program["nama_program"], cluster_program)
 
 # =============================
 # JENIS SAMPAH (AMBIL DARI DATA ASLI)
@@ -116,20 +96,22 @@ if "jenis_sampah" not in df_program.columns:
     df_program["jenis_sampah"] = df_program["cluster"].map(map_timbulan)
 
 # Normalisasi ejaan
-df_program["jenis_sampah"] = (
-    df_program["jenis_sampah"]
-    .astype(str).str.strip().str.lower()
-    .replace({
-        "organik lainnya": "organik",
-        "sisa makanan & sayur": "organik",
-        "non organik": "anorganik",
-        "non-organik": "anorganik",
-        "an-organik": "anorganik",
-        "plastik": "plastik",
-        "campuran": "campuran"
-    })
-    .map({"organik":"Organik","anorganik":"Anorganik","plastik":"Plastik","campuran":"Campuran"})
-)
+JENIS_ALIAS = {
+    "organik lainnya": "organik",
+    "sisa makanan & sayur": "organik",
+    "non organik": "anorganik",
+    "non-organik": "anorganik",
+    "an-organik": "anorganik",
+    "plastik": "plastik",
+    "campuran": "campuran"
+}
+JENIS_LABEL = {"organik":"Organik","anorganik":"Anorganik","plastik":"Plastik","campuran":"Campuran"}
+
+def normalize_jenis(v):
+    txt = str(v).strip().lower()
+    return JENIS_LABEL.get(JENIS_ALIAS.get(txt, txt))
+
+df_program["jenis_sampah"] = dimensions.relabel(df_program["jenis_sampah"], normalize_jenis)
 
 # =============================
 # PALET WARNA ECO
@@ -163,68 +145,57 @@ def unique_program_df(df: pd.DataFrame) -> pd.DataFrame:
 st.sidebar.subheader("Filter Data")
 
 site_list = sorted(df_program["site"].dropna().unique()) if "site" in df_program.columns else []
-site_sel = st.sidebar.multiselect("Pilih Site", site_list, default=site_list)
-
 perusahaan_list = sorted(df_program["perusahaan"].dropna().unique()) if "perusahaan" in df_program.columns else []
-perusahaan_sel = st.sidebar.multiselect("Pilih Perusahaan", perusahaan_list, default=perusahaan_list)
 
 # --- FILTER TAMBAHAN: Jenis Sampah (asli dari data) ---
 jenis_list = sorted(df_program["jenis_sampah"].dropna().unique()) if "jenis_sampah" in df_program.columns else []
-jenis_sel = st.sidebar.multiselect("Pilih Jenis Sampah", jenis_list, default=jenis_list)
 
 # ==== Tahun & Bulan dari HEADER kolom (agar 2024 selalu muncul bila ada kolomnya) ====
-pattern = r"^(januari|februari|maret|april|mei|juni|juli|agustus|september|oktober|november|desember)_\d{4}$"
-bulan_tahun_cols = [col for col in df_program.columns if re.match(pattern, str(col))]
+period_lookup = periods.period_columns(df_program.columns)
+data_version = data.versions()
 
 # Peta bulan Indonesia
-bulan_map = {
-    "Januari":1,"Februari":2,"Maret":3,"April":4,"Mei":5,"Juni":6,
-    "Juli":7,"Agustus":8,"September":9,"Oktober":10,"November":11,"Desember":12
-}
+bulan_map = periods.BULAN_NO
 bulan_list_ui = list(bulan_map.keys())
 
-if bulan_tahun_cols:
+if not period_lookup.empty:
     # Tahun dari header kolom -> memastikan 2024 muncul apabila ada "xxx_2024"
-    tahun_from_header = sorted({int(str(c).split("_")[1]) for c in bulan_tahun_cols})
-
-    # Bentuk long table
-    df_prog_long = df_program.melt(
-        id_vars=[c for c in df_program.columns if c not in bulan_tahun_cols],
-        value_vars=bulan_tahun_cols,
-        var_name="bulan_tahun",
-        value_name="value"
-    )
-
-    # Ekstrak tahun-bulan dari nama kolom
-    df_prog_long["tahun"] = df_prog_long["bulan_tahun"].apply(lambda x: int(str(x).split("_")[1]))
-    df_prog_long["bulan"] = df_prog_long["bulan_tahun"].apply(lambda x: str(x).split("_")[0].capitalize())
-    df_prog_long["periode"] = pd.to_datetime(
-        df_prog_long["tahun"].astype(str) + "-" + df_prog_long["bulan"].map(bulan_map).astype(str) + "-01",
-        errors="coerce"
-    )
+    tahun_from_header = sorted(int(t) for t in period_lookup["tahun"].unique())
 
-    # === Sidebar pilihan (pakai tahun_from_header supaya 2024 ada) ===
-    tahun_pilihan = st.sidebar.multiselect("Pilih Tahun:", tahun_from_header, default=tahun_from_header)
-    bulan_pilihan = st.sidebar.multiselect("Pilih Bulan:", bulan_list_ui, default=bulan_list_ui)
+    # Bentuk long table (tahun/bulan/periode dipetakan per kolom, bukan per baris);
+    # sekali per versi data Program (gbst.results), bukan tiap rerun
+    df_prog_long = results.memo("program:long", data_version.get("Program"),
+                                lambda: periods.to_long(df_program, lookup=period_lookup))
 
-    # Terapkan filter Tahun/Bulan
-    df_prog_filtered = df_prog_long[
-        (df_prog_long["tahun"].isin(tahun_pilihan)) &
-        (df_prog_long["bulan"].isin(bulan_pilihan))
-    ].copy()
 else:
-    df_prog_filtered = df_program.copy()
-    tahun_pilihan, bulan_pilihan = [], []
+    df_prog_long = df_program
+
+# filter global (gbst.filter_state) + jenis sampah khusus halaman ini;
+# Tahun/Bulan hanya ada bila header periode ada (pakai tahun_from_header supaya 2024 ada)
+panel_fields = {
+    "site": ("Pilih Site", site_list),
+    "perusahaan": ("Pilih Perusahaan", perusahaan_list),
+    "jenis_sampah": ("Pilih Jenis Sampah", jenis_list),
+}
+if not period_lookup.empty:
+    panel_fields["tahun"] = ("Pilih Tahun:", tahun_from_header)
+    panel_fields["bulan"] = ("Pilih Bulan:", bulan_list_ui)
+pilihan = filter_panel(panel_fields, key="program")
+site_sel, perusahaan_sel, jenis_sel = pilihan["site"], pilihan["perusahaan"], pilihan["jenis_sampah"]
+tahun_pilihan, bulan_pilihan = pilihan.get("tahun", []), pilihan.get("bulan", [])
 
 # =============================
 # APPLY FILTERS
 # =============================
-if site_sel and "site" in df_prog_filtered.columns:
-    df_prog_filtered = df_prog_filtered[df_prog_filtered["site"].isin(site_sel)]
-if perusahaan_sel and "perusahaan" in df_prog_filtered.columns:
-    df_prog_filtered = df_prog_filtered[df_prog_filtered["perusahaan"].isin(perusahaan_sel)]
-if jenis_sel and "jenis_sampah" in df_prog_filtered.columns:
-    df_prog_filtered = df_prog_filtered[df_prog_filtered["jenis_sampah"].isin(jenis_sel)]
+# bitmap per nilai + cache hasil per kombinasi filter (gbst.filters/gbst.results);
+# pilihan site/perusahaan/jenis kosong = tidak difilter
+if not period_lookup.empty and not (tahun_pilihan and bulan_pilihan):
+    # Tahun/Bulan tetap wajib dipilih: pilihan kosong berarti tidak ada periode
+    df_prog_filtered = df_prog_long.iloc[0:0]
+else:
+    df_prog_filtered = filters.apply("Program:long:program", df_prog_long, data_version.get("Program"),
+                                     tahun=tahun_pilihan, bulan=bulan_pilihan, site=site_sel,
+                                     perusahaan=perusahaan_sel, jenis_sampah=jenis_sel)
 
 aktif = ", ".join(jenis_sel) if jenis_sel else "Semua"
 st.caption(f"🗑️ Filter Jenis Sampah aktif: **{aktif}**")
@@ -233,7 +204,7 @@ st.caption(f"🗑️ Filter Jenis Sampah aktif: **{aktif}**")
 # HITUNG JUMLAH HARI (berdasar pilihan sidebar)
 # =============================
 days_period = 0
-if bulan_tahun_cols and tahun_pilihan and bulan_pilihan:
+if not period_lookup.empty and tahun_pilihan and bulan_pilihan:
     for y in tahun_pilihan:
         for b in bulan_pilihan:
             days_period += calendar.monthrange(y, bulan_map[b])[1]
@@ -346,7 +317,7 @@ for col, cluster in zip([col1, col2, col3, col4, col5], cluster_colors.keys()):
 # Pie (program unik)
 st.markdown("### 🥧 Proporsi Program (Kategori & Jenis Sampah)")
 if not df_prog_unique.empty and {"kategori","jenis_sampah"}.issubset(df_prog_unique.columns):
-    df_prop = df_prog_unique.groupby(["kategori","jenis_sampah"], as_index=False).size()
+    df_prop = df_prog_unique.groupby(["kategori","jenis_sampah"], as_index=False, observed=True).size()
     df_prop.rename(columns={"size":"jumlah_program"}, inplace=True)
     fig_prop = px.pie(
         df_prop, values="jumlah_program", names="jenis_sampah",
@@ -375,7 +346,7 @@ if "sub_jenis_sampah" not in df_prog_unique.columns:
 # Buat agregasi jumlah program per jenis_sampah dan sub_jenis_sampah
 if {"jenis_sampah","sub_jenis_sampah"}.issubset(df_prog_unique.columns):
     df_sub = (
-        df_prog_unique.groupby(["jenis_sampah","sub_jenis_sampah"], as_index=False)
+        df_prog_unique.groupby(["jenis_sampah","sub_jenis_sampah"], as_index=False, observed=True)
         .agg(jumlah_program=("nama_program","count"))
     )
 
@@ -428,7 +399,7 @@ if "sub_jenis_sampah" not in df_prog_filtered.columns:
 
 # pastikan numeric
 if "total_calc" in df_prog_filtered.columns:
-    df_prog_filtered["total_calc"] = pd.to_numeric(df_prog_filtered["total_calc"], errors="coerce").fillna(0)
+    df_prog_filtered["total_calc"] = df_prog_filtered["total_calc"].fillna(0)
 else:
     df_prog_filtered["total_calc"] = 0
 
@@ -437,7 +408,7 @@ need_cols = {"kategori", "sub_jenis_sampah", "total_calc"}
 if need_cols.issubset(df_prog_filtered.columns):
     df_kat_sub = (
         df_prog_filtered
-        .groupby(["kategori", "sub_jenis_sampah"], as_index=False)["total_calc"]
+        .groupby(["kategori", "sub_jenis_sampah"], as_index=False, observed=True)["total_calc"]
         .sum()
         .rename(columns={"total_calc": "total_kg"})
     ).sort_values(["kategori", "total_kg"], ascending=[True, False])
@@ -459,7 +430,7 @@ if need_cols.issubset(df_prog_filtered.columns):
         st.markdown("#### 📊 Perbandingan per Sub-Jenis")
         # pastikan urutan sub-jenis descending by total
         order_sub = (
-            df_kat_sub.groupby("sub_jenis_sampah", as_index=False)["total_kg"].sum()
+            df_kat_sub.groupby("sub_jenis_sampah", as_index=False, observed=True)["total_kg"].sum()
             .sort_values("total_kg", ascending=False)["sub_jenis_sampah"]
             .tolist()
         )
@@ -504,7 +475,7 @@ if need_cols.issubset(df_prog_filtered.columns):
     # ---- TABEL RINGKASAN
     with st.expander("📋 Tabel Ringkasan Kategori × Sub-Jenis (kg)"):
         st.dataframe(
-            df_kat_sub.pivot_table(index="sub_jenis_sampah", columns="kategori", values="total_kg", aggfunc="sum")
+            df_kat_sub.pivot_table(index="sub_jenis_sampah", columns="kategori", values="total_kg", aggfunc="sum", observed=True)
             .fillna(0)
             .sort_values(by=list(df_kat_sub["kategori"].unique()), ascending=False)
             .style.format("{:,.2f}"),
@@ -517,7 +488,7 @@ else:
 # Sunburst (program unik)
 st.markdown("### 📊 Proporsi Program & Jenis Sampah (Cluster)")
 if not df_prog_unique.empty and {"cluster","jenis_sampah"}.issubset(df_prog_unique.columns):
-    df_sun = df_prog_unique.groupby(["cluster","jenis_sampah"], as_index=False).size()
+    df_sun = df_prog_unique.groupby(["cluster","jenis_sampah"], as_index=False, observed=True).size()
     df_sun.rename(columns={"size":"jumlah_program"}, inplace=True)
     fig_sunburst = px.sunburst(
         df_sun, path=["cluster","jenis_sampah"], values="jumlah_program",
@@ -528,7 +499,7 @@ if not df_prog_unique.empty and {"cluster","jenis_sampah"}.issubset(df_prog_uniq
 # Line Trend Cluster (pakai nilai bulanan)
 st.markdown("### 📈 Tren Sampah per Cluster")
 if {"periode","value","cluster"}.issubset(df_prog_filtered.columns):
-    trend_cluster = df_prog_filtered.groupby(["periode","cluster"], as_index=False)["value"].sum()
+    trend_cluster = df_prog_filtered.groupby(["periode","cluster"], as_index=False, observed=True)["value"].sum()
     fig_line = px.line(trend_cluster, x="periode", y="value", color="cluster", markers=True,
                        color_discrete_map=color_map)
     st.plotly_chart(fig_line, use_container_width=True)
@@ -536,7 +507,7 @@ if {"periode","value","cluster"}.issubset(df_prog_filtered.columns):
 # Sankey (program unik)
 st.markdown("### 🔗 Sankey Diagram: Timbulan → Cluster")
 if not df_prog_unique.empty and {"jenis_sampah","cluster"}.issubset(df_prog_unique.columns):
-    df_sankey = df_prog_unique.groupby(["jenis_sampah","cluster"], as_index=False).size()
+    df_sankey = df_prog_unique.groupby(["jenis_sampah","cluster"], as_index=False, observed=True).size()
     df_sankey.rename(columns={"size":"jumlah_program"}, inplace=True)
     sources = list(df_sankey["jenis_sampah"].unique()) + list(df_sankey["cluster"].unique())
     mapping = {name:i for i,name in enumerate(sources)}
@@ -555,7 +526,7 @@ if not df_prog_unique.empty and {"jenis_sampah","cluster"}.issubset(df_prog_uniq
 st.markdown("### 🏢 Distribusi Cluster Program per Perusahaan & Site")
 if not df_prog_unique.empty and {"perusahaan","site","cluster","nama_program"}.issubset(df_prog_unique.columns):
     df_dist = (df_prog_unique
-               .groupby(["perusahaan","site","cluster"])["nama_program"]
+               .groupby(["perusahaan","site","cluster"], observed=True)["nama_program"]
                .nunique()
                .reset_index(name="jumlah_program"))
     fig_bar = px.bar(
@@ -567,7 +538,7 @@ if not df_prog_unique.empty and {"perusahaan","site","cluster","nama_program"}.i
 # Line Trend Kategori (nilai bulanan)
 st.markdown("### 📈 Tren Sampah Terkelola & Ter Kurangi (Kategori)")
 if {"periode","kategori","value"}.issubset(df_prog_filtered.columns):
-    trend_kat = df_prog_filtered.groupby(["periode","kategori"], as_index=False)["value"].sum()
+    trend_kat = df_prog_filtered.groupby(["periode","kategori"], as_index=False, observed=True)["value"].sum()
     fig_trend = px.line(trend_kat, x="periode", y="value", color="kategori", markers=True,
                         color_discrete_map=color_map)
     st.plotly_chart(fig_trend, use_container_width=True)
@@ -578,27 +549,13 @@ if {"periode","kategori","value"}.issubset(df_prog_filtered.columns):
 # ===============================
 st.markdown("### 🏢 Timbulan vs Terkelola vs Reduce (Perusahaan-Site)")
 
-def company_to_code(s: pd.Series) -> pd.Series:
-    return (
-        s.astype(str)
-         .str.upper()
-         .str.replace(r"[^A-Z ]", "", regex=True)
-         .str.split()
-         .apply(lambda t: t[-1] if len(t) else "")
-    )
-
 # --- 1) TIMBULAN
 if not df_timbulan.empty:
-    df_tim = df_timbulan.copy()
-    df_tim["timbulan"] = pd.to_numeric(df_tim["timbulan"], errors="coerce")
-    df_tim["company_code"] = company_to_code(df_tim.get("perusahaan", ""))
-
-    if site_sel:
-        df_tim = df_tim[df_tim["site"].isin(site_sel)]
-    if perusahaan_sel:
-        df_tim = df_tim[df_tim["perusahaan"].isin(perusahaan_sel)]
+    df_tim = filters.apply("Timbulan", df_timbulan, data_version.get("Timbulan"),
+                           site=site_sel, perusahaan=perusahaan_sel)
+    df_tim["company_code"] = companies.resolve(df_tim["perusahaan"])
 
-    agg_timbulan = (df_tim.groupby(["site","company_code"], as_index=False)
+    agg_timbulan = (df_tim.groupby(["site","company_code"], as_index=False, observed=True)
                          .agg(total_timbulan=("timbulan","sum")))
 else:
     agg_timbulan = pd.DataFrame(columns=["site","company_code","total_timbulan"])
@@ -609,7 +566,7 @@ agg_reduce     = pd.DataFrame(columns=["site","perusahaan","company_code","reduc
 
 if {"value","kategori","perusahaan","site"}.issubset(df_prog_filtered.columns) and not df_prog_filtered.empty:
     base = df_prog_filtered.copy()
-    base["value"] = pd.to_numeric(base["value"], errors="coerce").fillna(0)
+    base["value"] = base["value"].fillna(0)
 
     if site_sel:
         base = base[base["site"].isin(site_sel)]
@@ -619,17 +576,17 @@ if {"value","kategori","perusahaan","site"}.issubset(df_prog_filtered.columns) a
     # TERKELOLA
     peng = base[base["kategori"] == "Program Pengelolaan"].copy()
     if not peng.empty:
-        agg_pengolahan = (peng.groupby(["site","perusahaan"], as_index=False)
+        agg_pengolahan = (peng.groupby(["site","perusahaan"], as_index=False, observed=True)
                                .agg(total_pengolahan=("value","sum")))
-        agg_pengolahan["company_code"] = company_to_code(agg_pengolahan["perusahaan"])
+        agg_pengolahan["company_code"] = companies.resolve(agg_pengolahan["perusahaan"])
         agg_pengolahan["sampah_terkelola"] = agg_pengolahan["total_pengolahan"] / max(days_period, 1)
 
     # REDUCE
     red = base[base["kategori"] == "Program Pengurangan"].copy()
     if not red.empty:
-        agg_reduce = (red.groupby(["site","perusahaan"], as_index=False)
+        agg_reduce = (red.groupby(["site","perusahaan"], as_index=False, observed=True)
                           .agg(total_reduce=("value","sum")))
-        agg_reduce["company_code"] = company_to_code(agg_reduce["perusahaan"])
+        agg_reduce["company_code"] = companies.resolve(agg_reduce["perusahaan"])
         agg_reduce["reduce_perhari"] = agg_reduce["total_reduce"] / max(days_period, 1)
 
 # --- 4) MERGE ala peta
@@ -741,10 +698,10 @@ st.dataframe(
 # =============================
 st.markdown("### 📌 Insight Otomatis")
 if not df_prog_unique.empty and "cluster" in df_prog_unique.columns:
-    df_dist_u = df_prog_unique.groupby(["perusahaan","site","cluster"], as_index=False).size()
-    top_cluster = df_dist_u.groupby("cluster")["size"].sum().idxmax()
-    top_company = df_dist_u.groupby("perusahaan")["size"].sum().idxmax()
-    top_site = df_dist_u.groupby("site")["size"].sum().idxmax()
+    df_dist_u = df_prog_unique.groupby(["perusahaan","site","cluster"], as_index=False, observed=True).size()
+    top_cluster = df_dist_u.groupby("cluster", observed=True)["size"].sum().idxmax()
+    top_company = df_dist_u.groupby("perusahaan", observed=True)["size"].sum().idxmax()
+    top_site = df_dist_u.groupby("site", observed=True)["size"].sum().idxmax()
     st.info(f"📍 Program dominan: **{top_cluster}** | Perusahaan terbanyak: **{top_company}** | Site paling aktif: **{top_site}**")
 else:
     st.warning("Tidak ada data yang sesuai dengan filter.")
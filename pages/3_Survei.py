@@ -8,19 +8,15 @@ import plotly.express as px
 import plotly.graph_objects as go
 import plotly.subplots as sp
 
-from wordcloud import WordCloud
-from sklearn.feature_extraction.text import CountVectorizer
+from gbst import filters
+from gbst.datasets import PageData
+from gbst.ui import filter_panel, sidebar_data_age
 
 st.title("📝 Survei GBST (Offline & Online)")
 
 # ===============================
 # UTILITIES
 # ===============================
-def norm_cols(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = df.columns.astype(str).str.strip().str.replace(" ", "_").str.lower()
-    return df
-
 STOPWORDS_ID = {
     "yang","yg","dan","dengan","untuk","atau","serta","pada","dari","di","ke",
     "agar","karena","juga","adalah","akan","dalam","itu","sudah","belum",
@@ -35,6 +31,8 @@ def show_wordcloud(texts: pd.Series, title: str, cmap: str = "viridis"):
     if not all_text:
         st.warning(f"Tidak ada kata yang bisa ditampilkan untuk: {title}")
         return
+    from wordcloud import WordCloud   # berat: diimpor hanya saat WordCloud dibuat
+
     try:
         wc = WordCloud(
             width=800, height=400,
@@ -59,6 +57,8 @@ def get_top_phrases(texts: pd.Series, ngram_range=(2,2), top_n=10) -> pd.DataFra
     texts = texts.dropna().astype(str)
     if texts.empty:
         return pd.DataFrame(columns=["Frasa", "Frekuensi"])
+    from sklearn.feature_extraction.text import CountVectorizer
+
     try:
         vec = CountVectorizer(ngram_range=ngram_range, stop_words=list(STOPWORDS_ID)).fit(texts)
         bag = vec.transform(texts)
@@ -99,22 +99,11 @@ def gauge_figure(value: float, title: str, color_bar: str = "teal", w=350, h=320
 # ===============================
 # LOAD DATA GOOGLE SHEETS
 # ===============================
-sheet_url = "https://docs.google.com/spreadsheets/d/1cw3xMomuMOaprs8mkmj_qnib-Zp_9n68rYMgiRZZqBE/edit?usp=sharing"
-sheet_id = sheet_url.split("/")[5]
-sheet_names = ["Survei_Online", "Survei_Offline"]
+data = PageData(["Survei_Online", "Survei_Offline"], on_error=st.warning).prefetch()
 
-all_df = {}
-for sheet in sheet_names:
-    try:
-        url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet}"
-        df = pd.read_csv(url)
-        all_df[sheet] = df
-    except Exception as e:
-        st.warning(f"Gagal load sheet {sheet}: {e}")
-        all_df[sheet] = pd.DataFrame()
-
-df_online = norm_cols(all_df.get("Survei_Online", pd.DataFrame()).copy())
-df_offline = norm_cols(all_df.get("Survei_Offline", pd.DataFrame()).copy())
+df_online = data["Survei_Online"]
+df_offline = data["Survei_Offline"]
+sidebar_data_age(data.loaded)
 
 # ===============================
 # PILIH TAB
@@ -124,7 +113,7 @@ tab_choice = st.radio("Pilih Survei:", ["📋 Survei Offline", "🌐 Survei Onli
 # ===============================
 # FUNCTION ANALISIS
 # ===============================
-def analisis_survei(df: pd.DataFrame, label: str, key_prefix: str):
+def analisis_survei(df: pd.DataFrame, label: str, key_prefix: str, sheet: str):
     if df.empty:
         st.warning(f"Tidak ada data untuk {label}")
         return
@@ -133,10 +122,10 @@ def analisis_survei(df: pd.DataFrame, label: str, key_prefix: str):
     st.dataframe(df, use_container_width=True)
 
     id_cols = [
-        "kode_sid","perusahaan_area_kerja_tambang","site_/_lokasi_kerja",
+        "kode_sid","perusahaan_area_kerja_tambang","site___lokasi_kerja",
         "jabatan","kategori_jabatan","level_jabatan","masa_kerja","masa_kerja_(bulan)"
     ]
-    site_col, corp_col = "site_/_lokasi_kerja", "perusahaan_area_kerja_tambang"
+    site_col, corp_col = "site___lokasi_kerja", "perusahaan_area_kerja_tambang"
 
     question_cols = [c for c in df.columns if c not in id_cols]
     if len(question_cols) == 0:
@@ -145,20 +134,16 @@ def analisis_survei(df: pd.DataFrame, label: str, key_prefix: str):
 
     question_cols_general = question_cols[:-5] if len(question_cols) > 5 else question_cols
 
-    # Filter
-    fcol = st.columns(2)
-    with fcol[0]:
-        sites = sorted(df[site_col].dropna().unique()) if site_col in df.columns else []
-        sel_sites = st.multiselect("Filter Site", sites, default=sites[:3] if sites else [], key=f"{key_prefix}_sites")
-    with fcol[1]:
-        corps = sorted(df[corp_col].dropna().unique()) if corp_col in df.columns else []
-        sel_corps = st.multiselect("Filter Perusahaan", corps, default=[], key=f"{key_prefix}_corps")
+    # Filter global (gbst.filter_state): pilihan site/perusahaan sama dengan halaman lain
+    sites = sorted(df[site_col].dropna().unique()) if site_col in df.columns else []
+    corps = sorted(df[corp_col].dropna().unique()) if corp_col in df.columns else []
+    pilihan = filter_panel({
+        "site": ("Filter Site", sites),
+        "perusahaan": ("Filter Perusahaan", corps),
+    }, key=f"{key_prefix}_filter")
 
-    df_f = df.copy()
-    if sel_sites and site_col in df_f.columns:
-        df_f = df_f[df_f[site_col].isin(sel_sites)]
-    if sel_corps and corp_col in df_f.columns:
-        df_f = df_f[df_f[corp_col].isin(sel_corps)]
+    df_f = filters.apply(sheet, df, data.versions().get(sheet),
+                         **{site_col: pilihan["site"], corp_col: pilihan["perusahaan"]})
     st.caption(f"Total respon (setelah filter): **{len(df_f)}**")
 
     # Distribusi umum
@@ -226,6 +211,9 @@ def analisis_survei(df: pd.DataFrame, label: str, key_prefix: str):
 
     # Open-ended
     st.markdown("---"); st.header(f"📊 Analisis Pertanyaan Terbuka ({label})")
+    # WordCloud + n-gram sklearn berat -> dimuat hanya bila bagian ini dibuka
+    if not st.checkbox("Tampilkan WordCloud & frasa populer", key=f"{key_prefix}_open_qs"):
+        return
     OPEN_QS = {
         "1._apa_hambatan_yang_dialami_dalam_melaksanakan_program_gbst?": "viridis",
         "3._menurut_anda,_bagaimana_cara_membuat_pekerja_lebih_disiplin_dalam_menjalankan_gbst?": "cividis",
@@ -251,6 +239,6 @@ def analisis_survei(df: pd.DataFrame, label: str, key_prefix: str):
 # CALL
 # ===============================
 if tab_choice == "📋 Survei Offline":
-    analisis_survei(df_offline, "Survei Offline", "offline")
+    analisis_survei(df_offline, "Survei Offline", "offline", "Survei_Offline")
 elif tab_choice == "🌐 Survei Online":
-    analisis_survei(df_online, "Survei Online", "online")
+    analisis_survei(df_online, "Survei Online", "online", "Survei_Online")
@@ -3,10 +3,14 @@ import pandas as pd
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-from sklearn.preprocessing import MinMaxScaler
 import calendar, re
 from collections import Counter 
 
+from gbst import dimensions, filters
+from gbst.ketidaksesuaian import has_real_issue, norm_text, repetitive_score
+from gbst.datasets import PageData
+from gbst.ui import filter_panel, sidebar_data_age
+
 # ===============================
 # LOGO + HEADER
 # ===============================
@@ -25,39 +29,16 @@ st.markdown(
 # ===============================
 # LOAD DATA GOOGLE SHEETS
 # ===============================
-sheet_url = "https://docs.google.com/spreadsheets/d/1cw3xMomuMOaprs8mkmj_qnib-Zp_9n68rYMgiRZZqBE/edit?usp=sharing"
-sheet_id = sheet_url.split("/")[5]
-
-def norm_cols(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = (
-        df.columns.astype(str)
-        .str.strip()
-        .str.replace(" ", "_")
-        .str.replace("/", "_")
-        .str.lower()
-    )
-    return df
-
-if "data" not in st.session_state:
-    sheet_names = ["Ketidaksesuaian", "Survei_Online", "Survei_Offline","Level_Jabatan"]
-    data_dict = {}
-    for sheet in sheet_names:
-        try:
-            url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet}"
-            df = pd.read_csv(url)
-            df = norm_cols(df)
-            data_dict[sheet] = df
-        except Exception as e:
-            st.error(f"Gagal load sheet {sheet}: {e}")
-            data_dict[sheet] = pd.DataFrame()
-    st.session_state["data"] = data_dict
+# frame kanonik dibagi semua sesi (gbst.datasets), tidak disalin ke session_state
+data = PageData(["Ketidaksesuaian", "Survei_Online", "Survei_Offline", "Level_Jabatan"],
+                on_error=st.error).prefetch()
+sidebar_data_age(data.loaded)
 
 # ✅ perbaikan case-sensitive
-df = st.session_state["data"].get("Ketidaksesuaian", pd.DataFrame())
-df_online = st.session_state["data"].get("Survei_Online", pd.DataFrame())
-df_offline = st.session_state["data"].get("Survei_Offline", pd.DataFrame())
-df_level = st.session_state["data"].get("Level_Jabatan", pd.DataFrame())
+df = data["Ketidaksesuaian"]
+df_online = data["Survei_Online"]
+df_offline = data["Survei_Offline"]
+df_level = data["Level_Jabatan"]
 df_survey = pd.concat([df_online, df_offline], ignore_index=True)
 
 if not df_survey.empty and not df_level.empty:
@@ -89,19 +70,12 @@ if not df_survey.empty and not df_level.empty:
 st.sidebar.subheader("Filter Ketidaksesuaian")
 
 if not df.empty:
-    # Pastikan kolom tanggal ada
+    # tanggallapor sudah datetime (gbst.schema) dan dimensi tanggalnya
+    # (tahun/bulan/period_month/...) sudah diturunkan saat sheet dimuat
     if "tanggallapor" in df.columns:
-        df["tanggallapor"] = pd.to_datetime(df["tanggallapor"], errors="coerce")
-        df["tahun"] = df["tanggallapor"].dt.year
-        df["bulan"] = df["tanggallapor"].dt.month
-
-    # Filter perusahaan
-    perusahaan_list = sorted(df["perusahaan"].dropna().unique()) if "perusahaan" in df.columns else []
-    perusahaan_sel = st.sidebar.multiselect("Pilih Perusahaan", perusahaan_list, default=perusahaan_list)
-
-    # Filter site
-    site_list = sorted(df["site"].dropna().unique()) if "site" in df.columns else []
-    site_sel = st.sidebar.multiselect("Pilih Site", site_list, default=site_list)
+        if "tahun" not in df.columns or "bulan" not in df.columns:
+            df["tahun"] = df["tanggallapor"].dt.year
+            df["bulan"] = df["tanggallapor"].dt.month
 
     # mapping bulan
     bulan_map = {
@@ -109,30 +83,25 @@ if not df.empty:
         "Juli": 7, "Agustus": 8, "September": 9, "Oktober": 10, "November": 11, "Desember": 12
     }
 
-    # tahun
+    # filter global (gbst.filter_state): pilihan ikut dari/ke halaman lain dan URL
+    panel_fields = {
+        "perusahaan": ("Pilih Perusahaan", sorted(df["perusahaan"].dropna().unique()) if "perusahaan" in df.columns else []),
+        "site": ("Pilih Site", sorted(df["site"].dropna().unique()) if "site" in df.columns else []),
+    }
     if "tahun" in df.columns:
-        tahun_list = sorted(df["tahun"].dropna().unique())
-        tahun_sel = st.sidebar.multiselect("Pilih Tahun", tahun_list, default=tahun_list)
-    else:
-        tahun_sel = []
-
-    # bulan
+        panel_fields["tahun"] = ("Pilih Tahun", [int(t) for t in sorted(df["tahun"].dropna().unique())])
     if "bulan" in df.columns:
-        bulan_list = list(bulan_map.keys())
-        bulan_sel = st.sidebar.multiselect("Pilih Bulan", bulan_list, default=bulan_list)
-        bulan_sel_num = [bulan_map[b] for b in bulan_sel]  # ubah ke angka 1–12
-    else:
-        bulan_sel, bulan_sel_num = [], []
-
-    # Terapkan filter
-    if perusahaan_sel:
-        df = df[df["perusahaan"].isin(perusahaan_sel)]
-    if site_sel:
-        df = df[df["site"].isin(site_sel)]
-    if tahun_sel:
-        df = df[df["tahun"].isin(tahun_sel)]
-    if bulan_sel_num:
-        df = df[df["bulan"].isin(bulan_sel_num)]
+        panel_fields["bulan"] = ("Pilih Bulan", list(bulan_map.keys()))
+    pilihan = filter_panel(panel_fields, key="ketidaksesuaian")
+    perusahaan_sel, site_sel = pilihan["perusahaan"], pilihan["site"]
+    tahun_sel = pilihan.get("tahun", [])
+    bulan_sel = pilihan.get("bulan", [])
+    bulan_sel_num = [bulan_map[b] for b in bulan_sel]  # ubah ke angka 1–12
+
+    # Terapkan filter (bitmap per nilai + cache per kombinasi filter, gbst.filters);
+    # pilihan kosong = kolom itu tidak difilter
+    df = filters.apply("Ketidaksesuaian", df, data.versions().get("Ketidaksesuaian"),
+                       perusahaan=perusahaan_sel, site=site_sel, tahun=tahun_sel, bulan=bulan_sel_num)
 
     if df.empty:
         st.warning("⚠️ Data ketidaksesuaian kosong setelah filter. Silakan ubah filter.")
@@ -144,16 +113,17 @@ else:
 # ===============================
 # NORMALISASI KOLOM KETIDAKSESUAIAN
 # ===============================
+# label dinormalisasi per label unik, bukan per baris; hasilnya kategori lokal
+# (tabel dimensi bersama tidak ikut bertambah)
+def title_label(v) -> str:
+    return str(v).strip().title()
+
 if "status_temuan" in df.columns:
-    df["status_temuan"] = df["status_temuan"].astype(str).str.strip().str.title()
+    df["status_temuan"] = dimensions.relabel(df["status_temuan"], title_label)
 
 if "kategori_subketidaksesuaian" in df.columns:
-    df["kategori_subketidaksesuaian"] = (
-        df["kategori_subketidaksesuaian"]
-        .fillna("Unknown")
-        .astype(str)
-        .str.strip()
-        .str.title()
+    df["kategori_subketidaksesuaian"] = dimensions.relabel(
+        df["kategori_subketidaksesuaian"], title_label, na="Unknown"
     )
 # ===============================
 # METRICS
@@ -190,21 +160,17 @@ st.markdown("---")
 st.subheader("📈 Tren Jumlah Laporan per Bulan (Fraud + Valid)")
 
 if "tanggallapor" in df.columns:
-    df_plot = df.copy()
-    df_plot["tanggallapor"] = pd.to_datetime(df_plot["tanggallapor"], errors="coerce")
-    df_plot = df_plot.dropna(subset=["tanggallapor"])
+    df_plot = df.dropna(subset=["tanggallapor"])
 
     # normalisasi status biar aman
     if "status_temuan" in df_plot.columns:
-        df_plot["status_temuan"] = df_plot["status_temuan"].astype(str).str.strip().str.title()
+        df_plot["status_temuan"] = dimensions.relabel(df_plot["status_temuan"], title_label)
     else:
         df_plot["status_temuan"] = "Unknown"
 
-    df_plot["period_month"] = df_plot["tanggallapor"].dt.to_period("M").dt.to_timestamp()
-
     # agregasi jumlah laporan per bulan & status
     monthly = (
-        df_plot.groupby(["period_month", "status_temuan"])
+        df_plot.groupby(["period_month", "status_temuan"], observed=True)
         .size()
         .reset_index(name="jumlah")
         .sort_values("period_month")
@@ -271,11 +237,9 @@ needed_cols = {"tanggallapor", "perusahaan", "site", "status_temuan"}
 if not needed_cols.issubset(df.columns):
     st.warning("Kolom wajib tidak lengkap (butuh: tanggallapor, perusahaan, site, status_temuan).")
 else:
-    df_comp = df.copy()
-    df_comp["tanggallapor"] = pd.to_datetime(df_comp["tanggallapor"], errors="coerce")
-    df_comp = df_comp.dropna(subset=["tanggallapor"])
+    df_comp = df.dropna(subset=["tanggallapor"])
 
-    df_comp["status_temuan"] = df_comp["status_temuan"].astype(str).str.strip().str.title()
+    df_comp["status_temuan"] = dimensions.relabel(df_comp["status_temuan"], title_label)
     df_comp = df_comp[df_comp["status_temuan"].isin(["Valid", "Fraud"])]
 
     if df_comp.empty:
@@ -286,11 +250,10 @@ else:
             df_comp["perusahaan"].astype(str).str.strip() + " - " +
             df_comp["site"].astype(str).str.strip()
         )
-        df_comp["period_month"] = df_comp["tanggallapor"].dt.to_period("M").dt.to_timestamp()
 
         # agregasi jumlah laporan per company_site per bulan per status
         agg = (
-            df_comp.groupby(["company_site", "period_month", "status_temuan"])
+            df_comp.groupby(["company_site", "period_month", "status_temuan"], observed=True)
             .size()
             .reset_index(name="jumlah")
             .sort_values(["company_site", "period_month"])
@@ -317,7 +280,7 @@ else:
                 )
 
                 agg_all = (
-                    df_comp.groupby(["period_month", "status_temuan"])
+                    df_comp.groupby(["period_month", "status_temuan"], observed=True)
                     .size()
                     .reset_index(name="jumlah")
                     .sort_values("period_month")
@@ -345,7 +308,7 @@ else:
                 )
 
                 agg_cs = (
-                    df_comp.groupby(["company_site", "status_temuan"])
+                    df_comp.groupby(["company_site", "status_temuan"], observed=True)
                     .size()
                     .reset_index(name="jumlah")
                     .sort_values("jumlah", ascending=False)
@@ -376,7 +339,8 @@ else:
                     columns="status_temuan",
                     values="jumlah",
                     aggfunc="sum",
-                    fill_value=0
+                    fill_value=0,
+                    observed=True,
                 )
                 .reset_index()
                 .sort_values("period_month")
@@ -409,11 +373,9 @@ else:
 # ===============================
 st.subheader("📈 Tren: Perilaku vs Non-Perilaku (Valid)")
 if "tanggallapor" in df_valid.columns:
-    df_valid["period_month"] = df_valid["tanggallapor"].dt.to_period("M")
-    trend = df_valid.groupby(["period_month", "kategori_subketidaksesuaian"]).size().reset_index(name="count")
+    trend = df_valid.groupby(["period_month", "kategori_subketidaksesuaian"], observed=True).size().reset_index(name="count")
     if not trend.empty:
         pivot = trend.pivot(index="period_month", columns="kategori_subketidaksesuaian", values="count").fillna(0)
-        pivot.index = pivot.index.to_timestamp()
         fig = go.Figure()
         for col in pivot.columns:
             fig.add_trace(go.Scatter(x=pivot.index, y=pivot[col], mode="lines+markers", name=col))
@@ -440,6 +402,7 @@ if "sub_ketidaksesuaian" in df_valid.columns:
 
     sub_counts = (
         df_valid["sub_ketidaksesuaian"]
+        .astype(object)   # kembali ke label teks untuk tampilan
         .fillna("Unknown")
         .value_counts()
         .reset_index()
@@ -520,7 +483,7 @@ st.markdown("---")
 st.subheader("🔍 Jumlah Sub-Ketidaksesuaian per Site - Perusahaan (Valid)")
 if "perusahaan" in df_valid.columns and "site" in df_valid.columns and "sub_ketidaksesuaian" in df_valid.columns:
     df_valid["company_site"] = df_valid["perusahaan"].astype(str).str.strip() + " - " + df_valid["site"].astype(str).str.strip()
-    grp = df_valid.groupby(["company_site", "sub_ketidaksesuaian"]).size().reset_index(name="count")
+    grp = df_valid.groupby(["company_site", "sub_ketidaksesuaian"], observed=True).size().reset_index(name="count")
     pivot_cs = grp.pivot(index="company_site", columns="sub_ketidaksesuaian", values="count").fillna(0)
 
     fig = go.Figure()
@@ -539,7 +502,7 @@ st.markdown("---")
 # ===============================
 st.subheader("🏆 Top 3 Site dengan Ketidaksesuaian Valid")
 if "perusahaan" in df_valid.columns and "site" in df_valid.columns:
-    top3 = df_valid.groupby(["perusahaan", "site"]).size().reset_index(name="count").sort_values("count", ascending=False).head(3)
+    top3 = df_valid.groupby(["perusahaan", "site"], observed=True).size().reset_index(name="count").sort_values("count", ascending=False).head(3)
     for _, row in top3.iterrows():
         st.markdown(f"**{row['count']}** — {row['perusahaan']} · {row['site']}")
     st.dataframe(top3)
@@ -555,8 +518,6 @@ st.header("🚩 Analisis Menyeluruh Fraud & Validasi Bukti")
 
 import numpy as np
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 # ---------- 0) Kolom penting & normalisasi ----------
 COL_DESC = "deskripsi" if "deskripsi" in df.columns else None
@@ -572,27 +533,18 @@ needed = [COL_DESC, COL_TGL, COL_PERU, COL_SITE, COL_SUB, COL_STAT]
 if any(c is None for c in needed):
     st.warning("Beberapa kolom kunci hilang. Pastikan ada: deskripsi, tanggallapor, perusahaan, site, sub_ketidaksesuaian, status_temuan.")
 else:
-    # jamankan tanggal ke date saja (agar duplicate harian akurat)
-    df["_tanggal"] = pd.to_datetime(df[COL_TGL], errors="coerce").dt.date
-
-    def norm_text(s: str) -> str:
-        s = str(s).lower().strip()
-        # standarkan istilah umum yang sering salah ketik
-        rep = {
-            "sampaj":"sampah", "sampag":"sampah", "sm":"sampah",
-            "limba":"limbah", "majung":"majun", "greas":"grease",
-            "trush":"trash", "temapt":"tempat", "temaptnya":"tempatnya",
-            "belom":"belum", "tdk":"tidak", "tkn":"tidak",
-        }
-        for k,v in rep.items(): s = re.sub(rf"\b{k}\b", v, s)
-        s = re.sub(r"[^\w\s]", " ", s)   # buang tanda baca
-        s = re.sub(r"\s+", " ", s)
-        return s
-
-    df["desc_clean"] = df[COL_DESC].fillna("").map(norm_text)
-    df["sub_clean"]  = df[COL_SUB].fillna("").map(norm_text)
-    df["status_lc"]  = df[COL_STAT].astype(str).str.lower().str.strip()
-    df["pelapor_lc"] = df[COL_USER].astype(str).str.lower().str.strip() if COL_USER else ""
+    # tanggal tanpa jam (agar duplicate harian akurat), dari dimensi tanggal
+    df["_tanggal"] = df["tanggal"]
+
+    # fitur teks per baris sudah dihitung saat sheet dimuat; hitung hanya bila belum ada
+    if "desc_clean" not in df.columns:
+        df["desc_clean"] = df[COL_DESC].fillna("").map(norm_text)
+    if "sub_clean" not in df.columns:
+        df["sub_clean"] = df[COL_SUB].astype(object).fillna("").map(norm_text)
+    if "status_lc" not in df.columns:
+        df["status_lc"] = df[COL_STAT].astype(str).str.lower().str.strip()
+    if "pelapor_lc" not in df.columns:
+        df["pelapor_lc"] = df[COL_USER].astype(str).str.lower().str.strip() if COL_USER else ""
 
     # ---------- 1) Deteksi duplikat eksak ----------
     exact_key_cols = [COL_PERU, COL_SITE, "_tanggal", "sub_clean", "desc_clean"]
@@ -604,6 +556,10 @@ else:
     # batasi per perusahaan-site-tanggal agar komputasi efisien
     df["dup_group"] = df[[COL_PERU, COL_SITE, "_tanggal"]].astype(str).agg("|".join, axis=1)
 
+    # sklearn diimpor di sini (bukan di atas) supaya bagian sebelumnya sudah tampil duluan
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
     near_flags = np.zeros(len(df), dtype=bool)
     near_scores = np.zeros(len(df), dtype=float)
     SIM_TH = 0.90  # ambang kemiripan TF-IDF
@@ -634,34 +590,21 @@ else:
     # ---------- 3) Anomali waktu (spam/double submit) ----------
     # urutkan per pelapor & lokasi; flag jika jeda antar input sangat singkat & konten sangat mirip
     df = df.sort_values([COL_PERU, COL_SITE, COL_TGL], na_position="last")
-    df["_ts"] = pd.to_datetime(df[COL_TGL], errors="coerce")
-    df["dt_prev"] = df.groupby(["pelapor_lc", COL_PERU, COL_SITE])["_ts"].shift(1)
+    df["_ts"] = df[COL_TGL]
+    df["dt_prev"] = df.groupby(["pelapor_lc", COL_PERU, COL_SITE], observed=True)["_ts"].shift(1)
     df["delta_min"] = (df["_ts"] - df["dt_prev"]).dt.total_seconds() / 60
     # spam bila < 10 menit DAN near-duplicate
     df["is_time_spam"] = df["delta_min"].le(10) & df["is_dup_near"].fillna(False)
 
     # ---------- 4) Ketidakselarasan status (status mismatch) ----------
-    def has_real_issue(t):
-        t = str(t).lower()
-        # kata kunci “benar-benar masalah”
-        return bool(re.search(
-            r"penuh|menumpuk|meluap|overflow|tercampur|tidak\s*terpilah|b3|kontaminasi|berceceran|bau|lalat|tidak\s*dibuang|belum\s*(di)?angkut|tidak\s*pada\s*tempatnya|housekeep",
-            t
-        ))
-
-    df["indikasi_masalah"] = df["desc_clean"].map(has_real_issue)
+    if "indikasi_masalah" not in df.columns:
+        df["indikasi_masalah"] = df["desc_clean"].map(has_real_issue)
     # status_temuan = fraud tapi tanpa indikator masalah → mismatch
     df["is_status_mismatch"] = (df["status_lc"] == "fraud") & (~df["indikasi_masalah"])
 
     # ---------- 5) Pola pelapor (copy–paste n-gram) ----------
-    def repetitive_score(t):
-        tokens = str(t).split()
-        if len(tokens) < 6: return 0.0
-        # hitung rasio token unik
-        uniq_ratio = len(set(tokens)) / max(len(tokens),1)
-        return 1.0 - uniq_ratio  # makin tinggi → makin repetitif
-
-    df["repet_score"] = (df["desc_clean"] + " " + df["sub_clean"]).map(repetitive_score)
+    if "repet_score" not in df.columns:
+        df["repet_score"] = (df["desc_clean"] + " " + df["sub_clean"]).map(repetitive_score)
     # anomali bila repetitif & sering muncul oleh pelapor sama dalam 1 hari-lokasi
     df["is_reporter_pattern"] = (df["repet_score"] >= 0.5) & df["is_dup_near"]
 
@@ -794,14 +737,14 @@ if not df_fraud.empty:
 
     # Ringkas jumlah fraud per pelapor per lokasi
     fraud_matrix = (
-        df_fraud.groupby(["pelapor_lc", level_col])
+        df_fraud.groupby(["pelapor_lc", level_col], observed=True)
         .size()
         .reset_index(name="jumlah")
     )
 
     # Pivot tabel untuk heatmap
     pivot_fraud = fraud_matrix.pivot_table(
-        index="pelapor_lc", columns=level_col, values="jumlah", fill_value=0
+        index="pelapor_lc", columns=level_col, values="jumlah", fill_value=0, observed=True
     )
 
     # Plotly heatmap
@@ -875,18 +818,18 @@ if not df_survey.empty and not df.empty:
 
         # Hitung total ketidaksesuaian valid
         df_valid = df[df["status_temuan"] == "Valid"].copy()
-        df_count = df_valid.groupby(["perusahaan", "site"]).size().reset_index(name="jumlah_ketidaksesuaian")
+        df_count = df_valid.groupby(["perusahaan", "site"], observed=True).size().reset_index(name="jumlah_ketidaksesuaian")
 
         # Hitung kategori perilaku dan non-perilaku
         perilaku_count = (
             df_valid[df_valid["kategori_subketidaksesuaian"] == "Perilaku"]
-            .groupby(["perusahaan", "site"])
+            .groupby(["perusahaan", "site"], observed=True)
             .size()
             .reset_index(name="jumlah_perilaku")
         )
         nonperilaku_count = (
             df_valid[df_valid["kategori_subketidaksesuaian"] == "Non Perilaku"]
-            .groupby(["perusahaan", "site"])
+            .groupby(["perusahaan", "site"], observed=True)
             .size()
             .reset_index(name="jumlah_nonperilaku")
         )
@@ -900,134 +843,144 @@ if not df_survey.empty and not df.empty:
             .fillna(0)
         )
 
-        # =========================================================
-        # 🧪 UJI NORMALITAS (Smirnov, Lilliefors, Shapiro, dll)
-        # =========================================================
-        import numpy as np
-        import pandas as pd
-        import scipy.stats as stats
-        import seaborn as sns
-        import matplotlib.pyplot as plt
-        from statsmodels.stats.diagnostic import lilliefors
+        # uji normalitas & distribusi memuat statsmodels dan plot matplotlib (berat):
+        # hanya dijalankan (dan diimpor) bila bagian ini dibuka
+        if st.checkbox("🧪 Tampilkan uji normalitas & distribusi", key="ket_uji_statistik"):
+            # =========================================================
+            # 🧪 UJI NORMALITAS (Smirnov, Lilliefors, Shapiro, dll)
+            # =========================================================
+            import numpy as np
+            import pandas as pd
+            import scipy.stats as stats
+            import seaborn as sns
+            import matplotlib.pyplot as plt
+            from statsmodels.stats.diagnostic import lilliefors
+
+            def run_normality_tests(series, label=""):
+                s = pd.Series(series).dropna().astype(float)
+                n = len(s)
+                out = {"label": label, "n": n}
+                if n == 0:
+                    return out, s
+                mean, std = np.mean(s), np.std(s, ddof=1)
+                out.update({"mean": mean, "std": std})
+
+                # Kolmogorov-Smirnov (Smirnov Test)
+                try:
+                    D, p_ks = stats.kstest(s, 'norm', args=(mean, std))
+                    out.update({"Smirnov stat": D, "Smirnov p": p_ks})
+                except Exception:
+                    out.update({"Smirnov stat": np.nan, "Smirnov p": np.nan})
+
+                # Lilliefors
+                try:
+                    lillie_stat, lillie_p = lilliefors(s, dist='norm')
+                    out.update({"Lilliefors stat": lillie_stat, "Lilliefors p": lillie_p})
+                except Exception:
+                    out.update({"Lilliefors stat": np.nan, "Lilliefors p": np.nan})
+
+                # Shapiro–Wilk
+                try:
+                    sh_stat, sh_p = stats.shapiro(s)
+                    out.update({"Shapiro stat": sh_stat, "Shapiro p": sh_p})
+                except Exception:
+                    out.update({"Shapiro stat": np.nan, "Shapiro p": np.nan})
+
+                # D’Agostino
+                try:
+                    dag_stat, dag_p = stats.normaltest(s)
+                    out.update({"D’Agostino stat": dag_stat, "D’Agostino p": dag_p})
+                except Exception:
+                    out.update({"D’Agostino stat": np.nan, "D’Agostino p": np.nan})
 
-        def run_normality_tests(series, label=""):
-            s = pd.Series(series).dropna().astype(float)
-            n = len(s)
-            out = {"label": label, "n": n}
-            if n == 0:
                 return out, s
-            mean, std = np.mean(s), np.std(s, ddof=1)
-            out.update({"mean": mean, "std": std})
 
-            # Kolmogorov-Smirnov (Smirnov Test)
-            try:
-                D, p_ks = stats.kstest(s, 'norm', args=(mean, std))
-                out.update({"Smirnov stat": D, "Smirnov p": p_ks})
-            except Exception:
-                out.update({"Smirnov stat": np.nan, "Smirnov p": np.nan})
+            res_base, s_base = run_normality_tests(df_corr["feedback_q2"], "Baseline (Perusahaan–Site)")
+            res_ind, s_ind = run_normality_tests(df_survey[col_q2], "Responden Individu (Online+Offline)")
+            res_df = pd.DataFrame([res_base, res_ind])
+        
+            # =========================================================
+            # 📈 VISUALISASI DISTRIBUSI Survei Feedback Q2
+            # =========================================================
+            def plot_distribution(data, title):
+                fig, ax = plt.subplots(1, 3, figsize=(16, 4))
+                sns.histplot(data, kde=True, stat="density", color="#4C84FF", ax=ax[0])
+                x = np.linspace(min(data), max(data), 200)
+                y = stats.norm.pdf(x, np.mean(data), np.std(data))
+                ax[0].plot(x, y, "r--", label="Kurva Normal")
+                ax[0].legend()
+                ax[0].set_title(f"{title}\n(Histogram + Kurva Normal)")
+
+                stats.probplot(data, dist="norm", plot=ax[1])
+                ax[1].set_title("QQ Plot")
+
+                sorted_data = np.sort(data)
+                theoretical = stats.norm.cdf(sorted_data, np.mean(data), np.std(data))
+                empirical = np.arange(1, len(sorted_data)+1) / len(sorted_data)
+                ax[2].plot(theoretical, empirical, "o", color="#4C84FF")
+                ax[2].plot([0, 1], [0, 1], "r--")
+                ax[2].set_title("PP Plot")
+                plt.tight_layout()
+                return fig
+
+            st.markdown("### 📈 Visualisasi Distribusi Survei Feedback Q2")
+            st.pyplot(plot_distribution(s_base, "Distribusi Feedback Q2 – Baseline"))
+            st.pyplot(plot_distribution(s_ind, "Distribusi Feedback Q2 – Individu"))
+            # =========================================================
+            # 📊 ANALISIS KESTABILAN & REPRESENTATIVITAS BASELINE
+            # =========================================================
+            st.subheader("📏 Analisis Kestabilan Baseline (Feedback Q2)")
+
+            # Hitung statistik deskriptif baseline & individu
+            desc_stats = pd.DataFrame({
+                "Statistik": ["Mean", "Median", "Std Dev", "Min", "Max", "IQR"],
+                "Baseline (Perusahaan–Site)": [
+                    s_base.mean(), s_base.median(), s_base.std(), s_base.min(), s_base.max(),
+                    np.percentile(s_base, 75) - np.percentile(s_base, 25)
+                ],
+                "Individu (Online+Offline)": [
+                    s_ind.mean(), s_ind.median(), s_ind.std(), s_ind.min(), s_ind.max(),
+                    np.percentile(s_ind, 75) - np.percentile(s_ind, 25)
+                ]
+            }).set_index("Statistik")
 
-            # Lilliefors
-            try:
-                lillie_stat, lillie_p = lilliefors(s, dist='norm')
-                out.update({"Lilliefors stat": lillie_stat, "Lilliefors p": lillie_p})
-            except Exception:
-                out.update({"Lilliefors stat": np.nan, "Lilliefors p": np.nan})
+            st.dataframe(desc_stats.style.format(precision=3), use_container_width=True)
 
-            # Shapiro–Wilk
-            try:
-                sh_stat, sh_p = stats.shapiro(s)
-                out.update({"Shapiro stat": sh_stat, "Shapiro p": sh_p})
-            except Exception:
-                out.update({"Shapiro stat": np.nan, "Shapiro p": np.nan})
+            # Visualisasi perbandingan boxplot
+            fig, ax = plt.subplots(figsize=(8,4))
+            sns.boxplot(data=[s_base, s_ind], orient="v", palette=["#4C84FF","#50C878"])
+            ax.set_xticklabels(["Baseline (Perusahaan–Site)", "Individu"])
+            ax.set_ylabel("Skor Feedback Q2")
+            ax.set_title("Perbandingan Distribusi Baseline vs Individu")
+            st.pyplot(fig)
 
-            # D’Agostino
+            # Uji kesamaan distribusi antara baseline dan individu (Mann–Whitney / KS)
             try:
-                dag_stat, dag_p = stats.normaltest(s)
-                out.update({"D’Agostino stat": dag_stat, "D’Agostino p": dag_p})
-            except Exception:
-                out.update({"D’Agostino stat": np.nan, "D’Agostino p": np.nan})
+                stat_mw, p_mw = stats.mannwhitneyu(s_base, s_ind, alternative="two-sided")
+                stat_ks, p_ks = stats.ks_2samp(s_base, s_ind)
+                st.markdown(f"**Mann–Whitney U test:** p = {p_mw:.4f}")
+                st.markdown(f"**Kolmogorov–Smirnov 2-sample test:** p = {p_ks:.4f}")
 
-            return out, s
-
-        res_base, s_base = run_normality_tests(df_corr["feedback_q2"], "Baseline (Perusahaan–Site)")
-        res_ind, s_ind = run_normality_tests(df_survey[col_q2], "Responden Individu (Online+Offline)")
-        res_df = pd.DataFrame([res_base, res_ind])
-        
-        # =========================================================
-        # 📈 VISUALISASI DISTRIBUSI Survei Feedback Q2
-        # =========================================================
-        def plot_distribution(data, title):
-            fig, ax = plt.subplots(1, 3, figsize=(16, 4))
-            sns.histplot(data, kde=True, stat="density", color="#4C84FF", ax=ax[0])
-            x = np.linspace(min(data), max(data), 200)
-            y = stats.norm.pdf(x, np.mean(data), np.std(data))
-            ax[0].plot(x, y, "r--", label="Kurva Normal")
-            ax[0].legend()
-            ax[0].set_title(f"{title}\n(Histogram + Kurva Normal)")
-
-            stats.probplot(data, dist="norm", plot=ax[1])
-            ax[1].set_title("QQ Plot")
-
-            sorted_data = np.sort(data)
-            theoretical = stats.norm.cdf(sorted_data, np.mean(data), np.std(data))
-            empirical = np.arange(1, len(sorted_data)+1) / len(sorted_data)
-            ax[2].plot(theoretical, empirical, "o", color="#4C84FF")
-            ax[2].plot([0, 1], [0, 1], "r--")
-            ax[2].set_title("PP Plot")
-            plt.tight_layout()
-            return fig
-
-        st.markdown("### 📈 Visualisasi Distribusi Survei Feedback Q2")
-        st.pyplot(plot_distribution(s_base, "Distribusi Feedback Q2 – Baseline"))
-        st.pyplot(plot_distribution(s_ind, "Distribusi Feedback Q2 – Individu"))
-        # =========================================================
-        # 📊 ANALISIS KESTABILAN & REPRESENTATIVITAS BASELINE
-        # =========================================================
-        st.subheader("📏 Analisis Kestabilan Baseline (Feedback Q2)")
-
-        # Hitung statistik deskriptif baseline & individu
-        desc_stats = pd.DataFrame({
-            "Statistik": ["Mean", "Median", "Std Dev", "Min", "Max", "IQR"],
-            "Baseline (Perusahaan–Site)": [
-                s_base.mean(), s_base.median(), s_base.std(), s_base.min(), s_base.max(),
-                np.percentile(s_base, 75) - np.percentile(s_base, 25)
-            ],
-            "Individu (Online+Offline)": [
-                s_ind.mean(), s_ind.median(), s_ind.std(), s_ind.min(), s_ind.max(),
-                np.percentile(s_ind, 75) - np.percentile(s_ind, 25)
-            ]
-        }).set_index("Statistik")
-
-        st.dataframe(desc_stats.style.format(precision=3), use_container_width=True)
-
-        # Visualisasi perbandingan boxplot
-        fig, ax = plt.subplots(figsize=(8,4))
-        sns.boxplot(data=[s_base, s_ind], orient="v", palette=["#4C84FF","#50C878"])
-        ax.set_xticklabels(["Baseline (Perusahaan–Site)", "Individu"])
-        ax.set_ylabel("Skor Feedback Q2")
-        ax.set_title("Perbandingan Distribusi Baseline vs Individu")
-        st.pyplot(fig)
-
-        # Uji kesamaan distribusi antara baseline dan individu (Mann–Whitney / KS)
-        try:
-            stat_mw, p_mw = stats.mannwhitneyu(s_base, s_ind, alternative="two-sided")
-            stat_ks, p_ks = stats.ks_2samp(s_base, s_ind)
-            st.markdown(f"**Mann–Whitney U test:** p = {p_mw:.4f}")
-            st.markdown(f"**Kolmogorov–Smirnov 2-sample test:** p = {p_ks:.4f}")
+                if p_mw > 0.05 and p_ks > 0.05:
+                    st.success("✅ Tidak ada perbedaan signifikan → baseline representatif terhadap populasi individu.")
+                else:
+                    st.warning("⚠️ Ada perbedaan signifikan antara baseline dan individu → baseline mungkin belum stabil sebagai acuan.")
+            except Exception as e:
+                st.error(f"Gagal menjalankan uji kesamaan distribusi: {e}")
 
-            if p_mw > 0.05 and p_ks > 0.05:
-                st.success("✅ Tidak ada perbedaan signifikan → baseline representatif terhadap populasi individu.")
-            else:
-                st.warning("⚠️ Ada perbedaan signifikan antara baseline dan individu → baseline mungkin belum stabil sebagai acuan.")
-        except Exception as e:
-            st.error(f"Gagal menjalankan uji kesamaan distribusi: {e}")
+            st.caption("""
+            **Interpretasi:**
+            - Jika kedua p-value > 0.05 → distribusi baseline ≈ distribusi individu → baseline valid sebagai ukuran umum.
+            - Jika salah satu p < 0.05 → baseline mungkin bias (misalnya hanya mewakili site tertentu).
+            - IQR dan Std Dev membantu melihat seberapa homogen persepsi antar-site.
+            """)
 
-        st.caption("""
-        **Interpretasi:**
-        - Jika kedua p-value > 0.05 → distribusi baseline ≈ distribusi individu → baseline valid sebagai ukuran umum.
-        - Jika salah satu p < 0.05 → baseline mungkin bias (misalnya hanya mewakili site tertentu).
-        - IQR dan Std Dev membantu melihat seberapa homogen persepsi antar-site.
-        """)
+        # korelasi tetap tampil seperti semula; scipy/seaborn/matplotlib baru diimpor di sini,
+        # setelah bagian-bagian di atas sudah dirender
+        import numpy as np
+        import scipy.stats as stats
+        import seaborn as sns
+        import matplotlib.pyplot as plt
 
         # =========================================================
         # 🔗 UJI KORELASI ANTAR-VARIABEL
@@ -1169,7 +1122,7 @@ if not df_survey.empty and not df.empty:
             if "ketidaksesuaian_scored" in st.session_state:
                 df_fraud_all = st.session_state["ketidaksesuaian_scored"]
                 fraud_summary = (
-                    df_fraud_all.groupby(["perusahaan", "site"])
+                    df_fraud_all.groupby(["perusahaan", "site"], observed=True)
                     .agg(
                         jumlah_valid=('status_temuan', lambda x: (x=="Valid").sum()),
                         jumlah_fraud=('status_temuan', lambda x: (x=="Fraud").sum()),
@@ -1256,7 +1209,7 @@ if not df_survey.empty and not df.empty:
                 st.success("Hubungan signifikan (p < 0.05).")
             else:
                 st.info("Tidak ada hubungan signifikan (p ≥ 0.05).")
-            
+        
             st.markdown("""
             - Motode Korelasi **Pearson** digunakan pada data yang berdistribusi normal.
             - Metode Korelasi **Spearman** digunakan pada data yang **tidak** berdistribusi normal. 
@@ -1347,20 +1300,20 @@ if not df_survey.empty and not df.empty:
 
                 # normalisasi dulu label agar gak error ejaan
                 if "kategori_subketidaksesuaian" in df_fraud.columns:
-                    df_fraud["kategori_subketidaksesuaian"] = (
-                        df_fraud["kategori_subketidaksesuaian"]
-                        .astype(str).str.strip().str.lower()
-                        .replace({
-                            "non-perilaku": "non perilaku",
-                            "non_perilaku": "non perilaku",
-                            "non  perilaku": "non perilaku"
-                        })
+                    alias_kategori = {
+                        "non-perilaku": "non perilaku",
+                        "non_perilaku": "non perilaku",
+                        "non  perilaku": "non perilaku"
+                    }
+                    df_fraud["kategori_subketidaksesuaian"] = dimensions.relabel(
+                        df_fraud["kategori_subketidaksesuaian"],
+                        lambda v: alias_kategori.get(str(v).strip().lower(), str(v).strip().lower())
                     )
                 if "status_temuan" in df_fraud.columns:
-                    df_fraud["status_temuan"] = df_fraud["status_temuan"].astype(str).str.strip().str.title()
+                    df_fraud["status_temuan"] = dimensions.relabel(df_fraud["status_temuan"], title_label)
 
                 fraud_summary = (
-                    df_fraud.groupby(["perusahaan","site"])
+                    df_fraud.groupby(["perusahaan","site"], observed=True)
                     .agg(
                         jumlah_ketidaksesuaian_site=('status_temuan', 'size'),
                         jumlah_perilaku_site=('kategori_subketidaksesuaian', lambda x: (x=="perilaku").sum()),
@@ -1460,7 +1413,7 @@ if not df_survey.empty and not df.empty:
                 st.success("Hubungan signifikan (p < 0.05).")
             else:
                 st.info("Tidak ada hubungan signifikan (p ≥ 0.05).")
-            
+        
             st.markdown("""
                         - Motode Korelasi **Pearson** digunakan pada data yang berdistribusi normal. 
                         - Metode Korelasi **Spearman** digunakan pada data yang **tidak** berdistribusi normal. """)
@@ -1474,7 +1427,7 @@ if not df_survey.empty and not df.empty:
             # Tren
             st.markdown("### 📊 Tren Variabel per Site/Perusahaan")
             plot_tren_korelasi(df_for_corr, var_x, var_y, mode="Individu", scale_method="minmax")
-                
+            
         # =========================================================
         # 🔥 HEATMAP KORELASI ANTAR SEMUA VARIABEL (otomatis) – VERSI UMUM
         # =========================================================
@@ -0,0 +1,34 @@
+import csv
+
+import pytest
+
+from gbst import gviz_stub, sheets
+
+
+class StubSheets:
+    """Folder CSV yang disajikan ``gbst.gviz_stub``; ``write`` mengganti isi satu sheet."""
+
+    def __init__(self, directory, server):
+        self.directory = directory
+        self.server = server
+
+    def write(self, sheet: str, rows: list):
+        with open(self.directory / f"{sheet}.csv", "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+
+    def requests(self, sheet: str) -> list:
+        with self.server.lock:
+            return [r["tq"] for r in self.server.requests if r["sheet"] == sheet]
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    """Server gviz lokal + cache sheet baru (tanpa snapshot) yang diarahkan ke server itu."""
+    server, url = gviz_stub.serve(str(tmp_path))
+    monkeypatch.setattr(sheets, "GVIZ_URL", url)
+    cache = sheets.SheetCache(ttl=None)
+    cache.use_snapshot = False
+    monkeypatch.setattr(sheets, "_cache", cache)
+    yield StubSheets(tmp_path, server)
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from gbst import aggregates
+
+
+@pytest.mark.parametrize("tahun, prev, label", [
+    ([2024], [2023], "2023"),
+    ([2025, 2024], [2022, 2023], "2022–2023"),
+    ([2022, 2025], [2018, 2021], "2018, 2021"),
+    ([], [], "-"),
+])
+def test_previous_period_and_label(tahun, prev, label):
+    assert aggregates.previous_period(tahun) == prev
+    assert aggregates.period_label(prev) == label
+
+
+def test_comparison_rows():
+    timbulan = pd.DataFrame({"site": ["A", "A"], "perusahaan": ["P", "P"], "tahun": [2024, 2025],
+                             "timbulan": [10.0, 12.0], "man_power": [2, 3]})
+    program = pd.DataFrame({"site": ["A"], "perusahaan": ["P"], "tahun": [2025], "bulan": [1],
+                            "kategori": ["Program Pengelolaan"], "value": [5.0]})
+    table = aggregates.period_table(timbulan, program)
+
+    prev = aggregates.totals(table, tahun=aggregates.previous_period([2025]))
+    assert prev["baris_timbulan"] == 1 and prev["baris_program"] == 0
+    # pilihan semua tahun -> periode pembanding tanpa data
+    prev_all = aggregates.totals(table, tahun=aggregates.previous_period([2024, 2025]))
+    assert prev_all.get("baris_timbulan", 0) == 0
@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+from gbst import delta, sheets
+
+HEADER = ["No", "Site", "Laporan"]
+
+
+def rows(n: int, changed: dict = None) -> list:
+    out = [HEADER] + [[str(i), "BMO", f"laporan {i}"] for i in range(1, n + 1)]
+    for i, row in (changed or {}).items():
+        out[i] = row
+    return out
+
+
+def full_sync(stub, n: int):
+    stub.write("Log", rows(n))
+    df, version, state, n_new = sheets.fetch_append("Log")
+    assert n_new is None and len(df) == n
+    return df, version, state
+
+
+def test_tail_appends_new_rows(stub):
+    df, version, state = full_sync(stub, 3)
+    stub.write("Log", rows(5))
+
+    df2, version2, state2, n_new = sheets.fetch_append("Log", (df, version), state)
+
+    assert n_new == 2
+    assert list(df2["No"]) == [1, 2, 3, 4, 5]
+    assert state2["rows"] == 5 and state2["deltas"] == 1 and state2["anchor"] == rows(5)[-1]
+    assert version2 != version
+    assert stub.requests("Log")[-1] == "offset 2"
+
+
+def test_changed_anchor_forces_full_sync(stub):
+    df, version, state = full_sync(stub, 3)
+    stub.write("Log", rows(5, changed={3: ["3", "LMO", "diedit"]}))
+
+    df2, _, state2, n_new = sheets.fetch_append("Log", (df, version), state)
+
+    assert n_new is None
+    assert df2.loc[2, "Site"] == "LMO" and len(df2) == 5
+    assert state2 == delta.state_from_raw(sheets.fetch_raw("Log"))
+
+
+def test_shorter_sheet_forces_full_sync(stub):
+    df, version, state = full_sync(stub, 4)
+    stub.write("Log", rows(2))
+
+    df2, _, state2, n_new = sheets.fetch_append("Log", (df, version), state)
+
+    assert n_new is None
+    assert len(df2) == 2 and state2["rows"] == 2 and state2["deltas"] == 0
+
+
+def test_full_resync_every_full_every_deltas(stub, monkeypatch):
+    monkeypatch.setattr(delta, "FULL_EVERY", 2)
+    df, version, state = full_sync(stub, 1)
+    for n in (2, 3):
+        stub.write("Log", rows(n))
+        df, version, state, n_new = sheets.fetch_append("Log", (df, version), state)
+        assert n_new == 1
+    assert state["deltas"] == 2 and delta.tail_query(state) is None
+
+    stub.write("Log", rows(4))
+    df, _, state, n_new = sheets.fetch_append("Log", (df, version), state)
+
+    assert n_new is None and len(df) == 4 and state["deltas"] == 0
+    assert stub.requests("Log")[-1] == ""
+
+
+@pytest.mark.parametrize("sheet", [None, "Ketidaksesuaian"])
+def test_invalidate_drops_delta_state(sheet):
+    cache = sheets.SheetCache(ttl=None)
+    cache._store("Ketidaksesuaian", pd.DataFrame({"a": [1]}), "v1", "google", 0.0)
+    cache._delta["Ketidaksesuaian"] = {"anchor": ["1"], "rows": 1, "deltas": 0, "header": ["a"]}
+
+    cache.invalidate(sheet)
+
+    assert "Ketidaksesuaian" not in cache._seen
+    assert "Ketidaksesuaian" not in cache._delta
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from gbst import dimensions
+
+
+@pytest.fixture(autouse=True)
+def fresh(monkeypatch):
+    monkeypatch.setattr(dimensions, "_dtypes", {})
+    monkeypatch.setattr(dimensions, "_observed", set())
+
+
+def test_versions_per_dimension():
+    dimensions.observe("site", ["A", "B"])
+    dimensions.observe("perusahaan", ["PT X"])
+    site = dimensions.encode_frame(pd.DataFrame({"site": ["A", "B"], "nilai": [1, 2]}))
+    assert dimensions.frame_versions(site) == (("site", 2),)
+
+    dimensions.observe("perusahaan", ["PT Y"])
+    assert dimensions.versions(["site"]) == dimensions.frame_versions(site)
+
+    dimensions.observe("site", ["C"])
+    assert dimensions.versions(["site"]) != dimensions.frame_versions(site)
+
+
+def test_relabel_local_categorical():
+    s = dimensions.encode("status_temuan", pd.Series(["valid", "fraud", None], name="status_temuan"))
+    before = dimensions.table()
+
+    out = dimensions.relabel(s, str.title)
+    assert out.tolist()[:2] == ["Valid", "Fraud"] and pd.isna(out.iloc[2])
+    assert list(out.cat.categories) == ["Fraud", "Valid"]
+    pd.testing.assert_frame_equal(dimensions.table(), before)
+
+
+def test_relabel_text_stays_text():
+    out = dimensions.relabel(pd.Series(["a", "b", None]), str.upper, na="x")
+    assert out.tolist() == ["A", "B", "X"]
+    assert not isinstance(out.dtype, pd.CategoricalDtype)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gbst import filters
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "site": rng.choice(["A", "B", "C", "D", None], 1003),
+        "tahun": rng.choice([2023, 2024, 2025], 1003),
+    })
+
+
+@pytest.mark.parametrize("selections", [
+    {"site": ["A"]},
+    {"site": ["A", "B", "C"]},
+    {"site": ["A", "B", "C", "D"]},
+    {"site": ["X"]},
+    {"site": ["B", "D"], "tahun": [2024]},
+    {"site": [], "tahun": None},
+])
+def test_apply_matches_isin(frame, selections):
+    expected = frame
+    for c, selected in selections.items():
+        if selected:
+            expected = expected[expected[c].isin(selected)]
+    got = filters.FilterIndex(frame, list(selections)).apply(frame, **selections)
+    assert got.index.equals(expected.index)
+
+
+def test_index_rebuilt_when_columns_change(frame, monkeypatch):
+    monkeypatch.setattr(filters, "_indexes", {})
+    idx = filters.index("uji", frame, "v1", ["site"])
+    assert filters.index("uji", frame, "v1", ["site"]) is idx
+
+    wider = frame.assign(bulan=1)
+    assert filters.index("uji", wider, "v1", ["site"]) is not idx
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from gbst import gviz_stub, sheets
+from gbst.gviz import Query
+
+ROWS = [
+    ["Site", "Perusahaan", "Tahun", "Nilai", "Catatan"],
+    ["BMO", "PT A", "2024", "10", "ok"],
+    ["LMO", "PT B", "2024", "20", "it's"],
+    ["BMO", "PT B", "2025", "30", 'kata "x" it\'s'],
+    ["SMO", "PT A", "2025", "40", ""],
+    ["BMO", "PT A", "2025", "50", "ok"],
+]
+
+QUERIES = [
+    Query(select=["Site", "Nilai"]),
+    Query(where={"Site": "BMO"}),
+    Query(where={"Site": ["BMO", "LMO"], "Tahun": 2025}),
+    Query(select=["Perusahaan", "Tahun"], where={"Perusahaan": "PT A"}, limit=2),
+    Query(where={"Site": "BMO"}, offset=1),
+    Query(offset=2, limit=2),
+    Query(where={"Nilai": [20, 40]}),
+    Query(where={"Site": "tidak ada"}),
+]
+
+
+@pytest.mark.parametrize("query", QUERIES, ids=repr)
+def test_fetch_query_matches_local_apply(stub, query):
+    stub.write("Uji", ROWS)
+    full, _ = sheets.fetch_sheet("Uji")
+    sheets._cache.invalidate()
+
+    got, _ = sheets.fetch_sheet("Uji", query=query)
+
+    # subset diminta lewat tq ke server, bukan disaring dari sheet penuh
+    assert any(tq and tq != "limit 0" for tq in stub.requests("Uji"))
+    want = query.apply(full)
+    pd.testing.assert_frame_equal(got.reset_index(drop=True), want, check_dtype=False)
+
+
+def test_query_with_both_quote_kinds_falls_back_to_apply(stub):
+    stub.write("Uji", ROWS)
+    # nilai berisi kutip tunggal dan ganda tidak bisa ditulis sebagai literal gviz
+    query = Query(where={"Catatan": ["it's", 'kata "x" it\'s']}, select=["Site", "Catatan"])
+    assert query.to_tq(ROWS[0]) is None
+
+    got, _ = sheets.fetch_sheet("Uji", query=query)
+
+    full, _ = sheets.fetch_sheet("Uji")
+    pd.testing.assert_frame_equal(got, query.apply(full))
+    assert list(got["Site"]) == ["LMO", "BMO"]
+    # tidak ada query bersyarat yang dikirim: sheet diunduh penuh lalu disaring lokal
+    assert all(tq in ("", "limit 0") for tq in stub.requests("Uji"))
+
+
+def test_to_tq_letters_and_clauses():
+    header = ["Site", "Perusahaan", "Tahun"]
+    q = Query(select=["Tahun", "Site"], where={"Site": ["BMO", "LMO"], "Tahun": 2024},
+              offset=3, limit=5)
+    assert q.to_tq(header) == "select C, A where (A = 'BMO' or A = 'LMO') and C = 2024 limit 5 offset 3"
+    assert Query(where={"Lain": 1}).to_tq(header) is None
+    assert Query(select=["Lain"]).to_tq(header) is None
+
+
+def test_stub_filter_offset_limit():
+    text = "\n".join(",".join(r) for r in ROWS)
+    out = gviz_stub.run_query(text, "select A, D where A = 'BMO' and not D < 20 limit 1 offset 1")
+    assert out.splitlines() == ['"Site","Nilai"', '"BMO","50"']
+    with pytest.raises(gviz_stub.QueryError):
+        gviz_stub.run_query(text, "select Z")
+
+
+def test_header_ignores_pruned_full_frame(stub):
+    # kolom "no"/"kode" tidak ada di skema CCTV -> frame penuh di cache dipangkas
+    stub.write("CCTV", [
+        ["no", "kode", "easting", "northing", "perusahaan", "site"],
+        ["1", "K1", "117.5", "-1.2", "PT A", "BMO"],
+        ["2", "K2", "500100", "9860000", "PT B", "LMO"],
+    ])
+    sheets._cache.get("CCTV")
+    # header diminta (mis. revalidasi background) selagi sheet penuh masih di cache
+    assert sheets.sheet_columns("CCTV")[:4] == ["no", "kode", "easting", "northing"]
+    # frame penuh dibuang (mis. batas memori), header tetap di cache
+    sheets._cache._frames.pop("CCTV")
+
+    got, _ = sheets.fetch_sheet("CCTV", query=Query(select=["easting", "northing"]))
+
+    assert "select C, D" in stub.requests("CCTV")
+    assert list(got.columns) == ["easting", "northing"]
+    assert list(got["easting"].astype(str)) == ["117.5", "500100"]
@@ -0,0 +1,20 @@
+import json
+
+from gbst import presets
+
+
+def test_save_writes_user_file_only(tmp_path, monkeypatch):
+    shipped = tmp_path / "filter_presets.json"
+    shipped.write_text(json.dumps({"Semua 2025": {"tahun": [2025]}, "BMO": {"site": ["BMO"]}}))
+    user = tmp_path / "user" / "filter_presets.json"
+    monkeypatch.setattr(presets, "PRESETS_PATH", str(shipped))
+    monkeypatch.setattr(presets, "USER_PRESETS_PATH", str(user))
+    before = shipped.read_text()
+
+    options = {"site": ["BMO", "LMO"], "tahun": [2024, 2025]}
+    out = presets.save("BMO", {"site": ["BMO", "LMO"], "tahun": [2024]}, options)
+
+    assert shipped.read_text() == before
+    assert json.loads(user.read_text()) == {"BMO": {"tahun": [2024]}}
+    assert out == {"Semua 2025": {"tahun": [2025]}, "BMO": {"tahun": [2024]}}
+    assert presets.load() == out
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gbst.schema import parse_date, parse_number
+
+NAN = np.nan
+
+
+@pytest.mark.parametrize("text, decimal, expected", [
+    # satu titik = desimal (format angka asli gviz), bukan ribuan
+    ("1.234", ",", 1.234),
+    ("1.234", ".", 1.234),
+    # pemisah berulang = ribuan
+    ("1.234.567", ",", 1234567.0),
+    ("1,234,567", ",", 1234567.0),
+    # dua jenis pemisah: yang terakhir desimal
+    ("1.234,5", ",", 1234.5),
+    ("1,234.5", ",", 1234.5),
+    ("1.234,5", ".", 1234.5),
+    # koma tunggal: desimal bila decimal=",", ribuan bila decimal="."
+    ("1,5", ",", 1.5),
+    ("1,234", ",", 1.234),
+    ("1,234", ".", 1234.0),
+    ("-3,5", ",", -3.5),
+    # spasi (termasuk pemisah ribuan berspasi) dibuang
+    ("1 234", ",", 1234.0),
+    (" 12 ", ",", 12.0),
+    # kosong, strip dan teks bukan angka -> NaN
+    ("", ",", NAN),
+    (" ", ",", NAN),
+    ("-", ",", NAN),
+    (None, ",", NAN),
+    ("abc", ",", NAN),
+])
+def test_parse_number(text, decimal, expected):
+    got = parse_number(pd.Series([text], dtype=object), decimal=decimal)
+    assert got.dtype == "float64"
+    np.testing.assert_equal(got.iloc[0], expected)
+
+
+def test_parse_number_keeps_numeric_columns():
+    got = parse_number(pd.Series([1, 2, 3]))
+    assert got.dtype == "float64" and got.tolist() == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.filterwarnings("ignore:Could not infer format", "ignore:Parsing dates in")
+@pytest.mark.parametrize("text, expected", [
+    # export gviz: hari lebih dulu
+    ("03/04/2024", "2024-04-03"),
+    ("13/01/2024", "2024-01-13"),
+    ("03/04/2024 08:15:00", "2024-04-03 08:15:00"),
+    ("03/04/2024 08:15", "2024-04-03 08:15:00"),
+    ("2024-04-03", "2024-04-03"),
+    ("2024-04-03 10:00:00", "2024-04-03 10:00:00"),
+    # bukan hari-bulan yang valid -> inferensi, jadi bulan/hari
+    ("12/31/2024", "2024-12-31"),
+    ("3 April 2024", "2024-04-03"),
+    ("", None),
+    ("-", None),
+    (None, None),
+])
+def test_parse_date_day_first(text, expected):
+    got = parse_date(pd.Series([text, "01/02/2024"], dtype=object))
+    want = pd.NaT if expected is None else pd.Timestamp(expected)
+    assert (pd.isna(got.iloc[0]) and want is pd.NaT) or got.iloc[0] == want
+    # baris lain di kolom yang sama tetap hari lebih dulu
+    assert got.iloc[1] == pd.Timestamp("2024-02-01")